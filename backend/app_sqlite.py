@@ -7,13 +7,33 @@
 # Description: Complete working system using SQLite
 # =====================================================
 
-from flask import Flask, request, jsonify, session
+from flask import Flask, Response, g, request, jsonify, session
 from flask_cors import CORS
 import sqlite3
 import hashlib
 import logging
 from datetime import datetime
 import os
+import time
+
+from catalog import catalog_store, read_versions
+from co_enrollment import co_enrollment_store
+from ranking import candidate_cache, recommend_for_student, student_profile
+from skill_gap import SkillGapEngine
+from prerequisites import PrerequisiteGraph, completed_course_ids
+from planner import DEFAULT_HORIZON_WEEKS, MAX_HORIZON_WEEKS, MAX_WEEKLY_HOURS, plan_cache, plan_for_student
+from trending import compact_trending, record_enrollment, record_feedback, trending_cache
+from cohort import popular_with_cohort, record_cohort_enrollment, record_cohort_feedback
+from migrations import LATEST_VERSION, check_schema, migrate
+from warmup import Warmup, WarmupStep, simple_step
+from cache_backend import shared_cache, shared_tier_from_env
+from http_cache import conditional_json
+from course_cache import COURSE_FIELDS, course_cache, parse_ids, version_names
+from serializers import (Projection, RawJSON, RowsJSON, STREAM_BATCH, cursor_batches, json_response,
+                         ndjson_response, wants_ndjson)
+from sql_metrics import instrumented_connect
+from metrics import (ENGINE_LATENCY, HTTP_ERRORS, HTTP_IN_FLIGHT, HTTP_LATENCY, HTTP_REQUESTS,
+                     render as render_metrics)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -24,100 +44,43 @@ app = Flask(__name__)
 app.secret_key = 'your-secret-key-here'
 CORS(app, supports_credentials=True)
 
-# Database file path
-DB_PATH = 'course_recommendation.db'
+# Database file path (COURSE_DB_PATH points tools and benchmarks at another file)
+DB_PATH = os.environ.get('COURSE_DB_PATH', 'course_recommendation.db')
+
+# Skill-gap engine with cached student skill levels
+skill_gap_engine = SkillGapEngine()
+
+# Prerequisite DAG with cached transitive closure
+prerequisite_graph = PrerequisiteGraph()
+
+# Skill vectors preloaded for this many recently active students, per batch
+WARMUP_STUDENTS = int(os.environ.get('WARMUP_STUDENTS', '2000'))
+WARMUP_BATCH = 250
+
+# Columns each endpoint can return (?fields=a,b narrows them); list views leave out long text by default
+COURSE_LIST_FIELDS = Projection(COURSE_FIELDS.columns, default=(
+    'course_id', 'course_name', 'category', 'duration_hours', 'difficulty_level',
+    'average_rating', 'total_enrollments'))
+SKILL_FIELDS = Projection({'skill_id': 'skill_id', 'skill_name': 'skill_name', 'category': 'category'})
+ENROLLMENT_FIELDS = Projection({
+    'enrollment_id': 'e.enrollment_id', 'student_id': 'e.student_id', 'course_id': 'e.course_id',
+    'enrollment_date': 'e.enrollment_date', 'completion_status': 'e.completion_status',
+    'completion_date': 'e.completion_date', 'course_name': 'c.course_name', 'description': 'c.description',
+    'category': 'c.category', 'duration_hours': 'c.duration_hours', 'difficulty_level': 'c.difficulty_level',
+    'average_rating': 'c.average_rating', 'total_enrollments': 'c.total_enrollments'},
+    default=('enrollment_id', 'student_id', 'course_id', 'enrollment_date', 'completion_status',
+             'completion_date', 'course_name', 'category', 'duration_hours', 'difficulty_level',
+             'average_rating', 'total_enrollments'))
+FEEDBACK_FIELDS = Projection({
+    'feedback_id': 'f.feedback_id', 'student_id': 'f.student_id', 'course_id': 'f.course_id',
+    'rating': 'f.rating', 'review_text': 'f.review_text', 'feedback_date': 'f.feedback_date',
+    'student_name': 's.name', 'department': 's.department'})
 
 def init_database():
-    """Initialize SQLite database with tables"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    # Create tables
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS students (
-            student_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            email TEXT UNIQUE NOT NULL,
-            password TEXT NOT NULL,
-            phone TEXT,
-            department TEXT,
-            year TEXT,
-            registration_date DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS courses (
-            course_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            course_name TEXT NOT NULL,
-            description TEXT,
-            category TEXT,
-            duration_hours INTEGER,
-            difficulty_level TEXT CHECK(difficulty_level IN ('Beginner', 'Intermediate', 'Advanced')),
-            average_rating REAL DEFAULT 0.0,
-            total_enrollments INTEGER DEFAULT 0,
-            created_date DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS skills (
-            skill_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            skill_name TEXT UNIQUE NOT NULL,
-            category TEXT
-        )
-    ''')
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS student_skills (
-            student_id INTEGER,
-            skill_id INTEGER,
-            proficiency_level TEXT CHECK(proficiency_level IN ('Beginner', 'Intermediate', 'Advanced')),
-            added_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-            PRIMARY KEY (student_id, skill_id),
-            FOREIGN KEY (student_id) REFERENCES students(student_id),
-            FOREIGN KEY (skill_id) REFERENCES skills(skill_id)
-        )
-    ''')
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS course_skills (
-            course_id INTEGER,
-            skill_id INTEGER,
-            PRIMARY KEY (course_id, skill_id),
-            FOREIGN KEY (course_id) REFERENCES courses(course_id),
-            FOREIGN KEY (skill_id) REFERENCES skills(skill_id)
-        )
-    ''')
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS enrollments (
-            enrollment_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            student_id INTEGER,
-            course_id INTEGER,
-            enrollment_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-            completion_status TEXT DEFAULT 'Enrolled' CHECK(completion_status IN ('Enrolled', 'In Progress', 'Completed', 'Dropped')),
-            completion_date DATETIME,
-            FOREIGN KEY (student_id) REFERENCES students(student_id),
-            FOREIGN KEY (course_id) REFERENCES courses(course_id)
-        )
-    ''')
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS feedback (
-            feedback_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            student_id INTEGER,
-            course_id INTEGER,
-            rating INTEGER CHECK(rating >= 1 AND rating <= 5),
-            review_text TEXT,
-            feedback_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (student_id) REFERENCES students(student_id),
-            FOREIGN KEY (course_id) REFERENCES courses(course_id)
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
+    """Apply pending schema migrations (deployments run `python migrations.py upgrade` instead)"""
+    applied = migrate(DB_PATH)
+    if applied:
+        logger.info(f"Applied schema migrations {applied}")
 
 def hash_password(password):
     """Hash password using SHA-256"""
@@ -125,163 +88,88 @@ def hash_password(password):
 
 def get_db_connection():
     """Get database connection"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = instrumented_connect(DB_PATH)
     conn.row_factory = sqlite3.Row
     return conn
 
-def populate_sample_data():
-    """Populate database with sample data"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # Check if data already exists
-    cursor.execute('SELECT COUNT(*) FROM students')
-    if cursor.fetchone()[0] > 0:
-        conn.close()
-        return
-    
-    # Insert sample students
-    students = [
-        ('Arjun Sharma', 'arjun.sharma@college.edu', hash_password('password123'), '9876543210', 'Computer Science', '3rd Year'),
-        ('Priya Patel', 'priya.patel@college.edu', hash_password('password123'), '9876543211', 'Information Technology', '2nd Year'),
-        ('Rajesh Kumar', 'rajesh.kumar@college.edu', hash_password('password123'), '9876543212', 'Electronics', '4th Year'),
-        ('Sneha Singh', 'sneha.singh@college.edu', hash_password('password123'), '9876543213', 'Computer Science', '1st Year'),
-        ('Amit Verma', 'amit.verma@college.edu', hash_password('password123'), '9876543214', 'Information Technology', '3rd Year')
-    ]
-    
-    cursor.executemany('''
-        INSERT INTO students (name, email, password, phone, department, year)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', students)
-    
-    # Insert sample skills
-    skills = [
-        ('Python Programming', 'Programming'),
-        ('JavaScript', 'Programming'),
-        ('SQL', 'Database'),
-        ('React', 'Web Development'),
-        ('Machine Learning', 'AI/ML'),
-        ('Data Analysis', 'Data Science'),
-        ('HTML/CSS', 'Web Development'),
-        ('Docker', 'DevOps'),
-        ('UI Design', 'Design'),
-        ('Node.js', 'Programming')
-    ]
-    
-    cursor.executemany('''
-        INSERT INTO skills (skill_name, category)
-        VALUES (?, ?)
-    ''', skills)
-    
-    # Insert sample courses
-    courses = [
-        ('Complete Python Bootcamp', 'Learn Python from scratch to advanced level', 'Programming', 40, 'Beginner'),
-        ('React Development Course', 'Build modern web applications with React', 'Web Development', 30, 'Intermediate'),
-        ('Machine Learning Fundamentals', 'Introduction to ML algorithms and techniques', 'AI/ML', 50, 'Advanced'),
-        ('SQL Mastery', 'Database design and query optimization', 'Database', 25, 'Intermediate'),
-        ('Data Science with Python', 'Analyze data using Python libraries', 'Data Science', 45, 'Intermediate'),
-        ('Docker for Developers', 'Containerization and deployment strategies', 'DevOps', 20, 'Intermediate'),
-        ('UI/UX Design Principles', 'Create beautiful and functional interfaces', 'Design', 35, 'Beginner'),
-        ('Node.js Backend Development', 'Build scalable server applications', 'Programming', 40, 'Advanced')
-    ]
-    
-    cursor.executemany('''
-        INSERT INTO courses (course_name, description, category, duration_hours, difficulty_level)
-        VALUES (?, ?, ?, ?, ?)
-    ''', courses)
-    
-    # Insert student skills
-    student_skills = [
-        (1, 1, 'Advanced'),  # Arjun - Python Advanced
-        (1, 3, 'Intermediate'),  # Arjun - SQL Intermediate
-        (1, 5, 'Beginner'),  # Arjun - ML Beginner
-        (2, 2, 'Intermediate'),  # Priya - JavaScript Intermediate
-        (2, 4, 'Intermediate'),  # Priya - React Intermediate
-        (2, 7, 'Advanced'),  # Priya - HTML/CSS Advanced
-        (3, 1, 'Intermediate'),  # Rajesh - Python Intermediate
-        (3, 6, 'Advanced'),  # Rajesh - Data Analysis Advanced
-        (4, 1, 'Beginner'),  # Sneha - Python Beginner
-        (4, 7, 'Intermediate'),  # Sneha - HTML/CSS Intermediate
-        (5, 2, 'Advanced'),  # Amit - JavaScript Advanced
-        (5, 8, 'Intermediate'),  # Amit - Docker Intermediate
-    ]
-    
-    cursor.executemany('''
-        INSERT INTO student_skills (student_id, skill_id, proficiency_level)
-        VALUES (?, ?, ?)
-    ''', student_skills)
-    
-    # Insert course skills
-    course_skills = [
-        (1, 1),  # Python Course - Python skill
-        (2, 2),  # React Course - JavaScript skill
-        (2, 4),  # React Course - React skill
-        (3, 1),  # ML Course - Python skill
-        (3, 5),  # ML Course - ML skill
-        (4, 3),  # SQL Course - SQL skill
-        (5, 1),  # Data Science - Python skill
-        (5, 6),  # Data Science - Data Analysis skill
-        (6, 8),  # Docker Course - Docker skill
-        (7, 7),  # UI Design - HTML/CSS skill
-        (7, 9),  # UI Design - UI Design skill
-        (8, 2),  # Node.js - JavaScript skill
-    ]
-    
-    cursor.executemany('''
-        INSERT INTO course_skills (course_id, skill_id)
-        VALUES (?, ?)
-    ''', course_skills)
-    
-    # Insert sample enrollments
-    enrollments = [
-        (1, 1, 'Completed', '2024-01-15'),
-        (1, 3, 'In Progress', None),
-        (2, 2, 'Completed', '2024-02-10'),
-        (2, 7, 'Enrolled', None),
-        (3, 4, 'Completed', '2024-01-20'),
-        (3, 5, 'In Progress', None),
-        (4, 1, 'Enrolled', None),
-        (5, 2, 'Completed', '2024-02-05'),
-        (5, 8, 'Enrolled', None)
-    ]
-    
-    cursor.executemany('''
-        INSERT INTO enrollments (student_id, course_id, completion_status, completion_date)
-        VALUES (?, ?, ?, ?)
-    ''', enrollments)
-    
-    # Insert sample feedback
-    feedback = [
-        (1, 1, 5, 'Excellent course! Very well structured and easy to follow.'),
-        (2, 2, 4, 'Great content, learned a lot about React development.'),
-        (3, 4, 5, 'Perfect for learning SQL fundamentals.'),
-        (5, 2, 4, 'Good course, would recommend to others.')
-    ]
-    
-    cursor.executemany('''
-        INSERT INTO feedback (student_id, course_id, rating, review_text)
-        VALUES (?, ?, ?, ?)
-    ''', feedback)
-    
-    # Update course ratings and enrollment counts
-    cursor.execute('''
-        UPDATE courses SET average_rating = (
-            SELECT AVG(rating) FROM feedback WHERE course_id = courses.course_id
-        )
-    ''')
-    
-    cursor.execute('''
-        UPDATE courses SET total_enrollments = (
-            SELECT COUNT(*) FROM enrollments WHERE course_id = courses.course_id
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
+# Workers only read the schema version at startup; creating tables, seeding
+# and building indexes is done once by `python migrations.py upgrade`.
+# COURSE_AUTO_MIGRATE=1 (or running this file directly) migrates first.
+if __name__ == '__main__' or os.environ.get('COURSE_AUTO_MIGRATE') == '1':
+    init_database()
+check_schema(DB_PATH)
+
+# Plans and trending lists are shared with the other workers (and Streamlit);
+# invalidations from any of them reach the in-process objects below
+shared_cache.configure(shared_tier_from_env(DB_PATH))
+
+def forget_student_levels(prefix):
+    """Drop the skill levels of 'student:<id>:' (or every student's) after another worker changed them"""
+    student_id = prefix.split(':')[1] if prefix.count(':') >= 2 else ''
+    if student_id.isdigit():
+        skill_gap_engine.invalidate_student(int(student_id))
+    else:
+        skill_gap_engine.clear_students()
+
+def reload_prerequisites(prefix):
+    prerequisite_graph.loaded = False
+
+shared_cache.subscribe('student:', forget_student_levels)
+shared_cache.subscribe('prerequisites', reload_prerequisites)
+
+def warm_student_levels(conn, cursor, data):
+    """Preload skill levels of the most recently active students, one batch per checkpoint"""
+    if data is None:
+        # Distinct students among the latest enrollments (a rowid range, not a table scan)
+        student_ids = [row[0] for row in conn.execute('''
+            SELECT DISTINCT student_id FROM (
+                SELECT student_id FROM enrollments ORDER BY enrollment_id DESC LIMIT ?
+            )
+        ''', (WARMUP_STUDENTS * 5,)).fetchall()][:WARMUP_STUDENTS]
+        data = {'student_ids': student_ids, 'levels': {}}
+    position = cursor or 0
+    while position < len(data['student_ids']):
+        batch = data['student_ids'][position:position + WARMUP_BATCH]
+        data['levels'].update(skill_gap_engine.preload_students(conn, batch))
+        position += len(batch)
+        yield position, data
+
+# Caches preloaded in the background after startup; /api/ready reports when they are done
+warmup = Warmup(DB_PATH, [
+    simple_step('course_catalog', candidate_cache.get),
+    simple_step('co_enrollment', co_enrollment_store.ensure_loaded),
+    simple_step('course_skill_matrix', skill_gap_engine.course_matrix),
+    simple_step('prerequisite_graph', prerequisite_graph.ensure_loaded),
+    WarmupStep('student_skill_levels', warm_student_levels,
+               restore=lambda data: skill_gap_engine.install_students(data['levels']),
+               versions=('student_skills', 'skills')),
+    simple_step('trending', trending_cache.get),
+], snapshot_key=LATEST_VERSION).start()
 
-# Initialize database on startup
-init_database()
-populate_sample_data()
+# =====================================================
+# REQUEST METRICS
+# =====================================================
+
+@app.before_request
+def start_request_timer():
+    """Mark the request start for the latency histogram"""
+    g.request_started = time.perf_counter()
+    HTTP_IN_FLIGHT.inc()
+    # Apply cache invalidations from other workers before serving
+    shared_cache.sync()
+
+@app.after_request
+def record_request_metrics(response):
+    """Count the request and record its latency under the route pattern"""
+    started = g.pop('request_started', None)
+    if started is not None:
+        HTTP_IN_FLIGHT.dec()
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        HTTP_LATENCY.observe(time.perf_counter() - started, (route, request.method))
+        HTTP_REQUESTS.inc((route, request.method, str(response.status_code)))
+        if response.status_code >= 500:
+            HTTP_ERRORS.inc((route, request.method))
+    return response
 
 # =====================================================
 # API ROUTES
@@ -305,6 +193,17 @@ def health_check():
         'timestamp': datetime.now().isoformat()
     })
 
+@app.route('/api/ready', methods=['GET'])
+def readiness_check():
+    """Readiness probe: 200 once the cache warm-up has finished, 503 with its progress before"""
+    status = warmup.status()
+    return jsonify({'success': status['ready'], 'data': status}), 200 if status['ready'] else 503
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Request, engine, cache, SQL and process metrics in Prometheus text format"""
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
 # Authentication routes
 @app.route('/api/auth/login', methods=['POST'])
 def login():
@@ -382,6 +281,9 @@ def register():
         conn.commit()
         conn.close()
         
+        # Student counts in the dashboard rollups
+        shared_cache.invalidate('analytics')
+        
         return jsonify({
             'success': True,
             'message': 'Registration successful',
@@ -410,78 +312,257 @@ def get_courses():
         category = request.args.get('category')
         difficulty = request.args.get('difficulty_level')
         search = request.args.get('search')
+        try:
+            fields = COURSE_LIST_FIELDS.fields(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
         
+        # Filter the shared catalog snapshot instead of querying and copying every row
         conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        query = 'SELECT * FROM courses WHERE 1=1'
-        params = []
-        
-        if category:
-            query += ' AND category = ?'
-            params.append(category)
+        catalog = catalog_store.get(conn)
+        conn.close()
         
-        if difficulty:
-            query += ' AND difficulty_level = ?'
-            params.append(difficulty)
+        if wants_ndjson():
+            # One line per course, encoded a batch of positions at a time
+            positions = catalog.select(category=category, difficulty=difficulty, search=search)
+            batches = (list(zip(*[catalog.column(field, positions[start:start + STREAM_BATCH]) for field in fields]))
+                       for start in range(0, len(positions), STREAM_BATCH))
+            return ndjson_response(fields, batches)
+        
+        def build():
+            positions = catalog.select(category=category, difficulty=difficulty, search=search)
+            columns = [catalog.column(field, positions) for field in fields]
+            return {
+                'success': True,
+                'data': {
+                    'courses': RowsJSON(fields, zip(*columns)),
+                    'categories': catalog.categories_in(positions)
+                }
+            }
         
-        if search:
-            query += ' AND (course_name LIKE ? OR description LIKE ?)'
-            params.extend([f'%{search}%', f'%{search}%'])
+        # The snapshot's own version, so a lagging snapshot never answers for newer data
+        return conditional_json(catalog.version or (catalog.built_at,), catalog.built_at, build)
         
-        query += ' ORDER BY average_rating DESC, total_enrollments DESC'
+    except Exception as e:
+        logger.error(f"Get courses error: {e}")
+        return jsonify({'success': False, 'message': 'Internal server error'}), 500
+
+@app.route('/api/courses/trending', methods=['GET'])
+def get_trending_courses():
+    """Get courses with the most recent enrollment and feedback activity"""
+    try:
+        limit = request.args.get('limit', 10, type=int)
+        if limit < 1:
+            return jsonify({'success': False, 'message': 'limit must be positive'}), 400
+        limit = min(limit, 100)
         
-        cursor.execute(query, params)
-        courses = cursor.fetchall()
+        conn = get_db_connection()
+        with ENGINE_LATENCY.time(('trending',)):
+            courses = trending_cache.get(conn, limit=limit)
         conn.close()
         
         return jsonify({
             'success': True,
             'data': {
-                'courses': [dict(course) for course in courses],
-                'categories': list(set([course['category'] for course in courses]))
+                'courses': courses
             }
         })
         
     except Exception as e:
-        logger.error(f"Get courses error: {e}")
+        logger.error(f"Get trending courses error: {e}")
         return jsonify({'success': False, 'message': 'Internal server error'}), 500
 
 @app.route('/api/courses/<int:course_id>', methods=['GET'])
 def get_course(course_id):
     """Get single course details"""
     try:
+        try:
+            fields = COURSE_FIELDS.fields(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
         conn = get_db_connection()
-        cursor = conn.cursor()
         
-        cursor.execute('SELECT * FROM courses WHERE course_id = ?', (course_id,))
-        course = cursor.fetchone()
+        # Bumped by writes to this course's row or skills, and to any skill name
+        try:
+            versions, changed_at = read_versions(conn, version_names((course_id,)))
+            
+            def build():
+                # Course row and required skills from the course cache (one query on a miss)
+                courses, _ = course_cache.get_many(conn, (course_id,), fields, versions)
+                if not courses:
+                    return jsonify({'success': False, 'message': 'Course not found'}), 404
+                return {
+                    'success': True,
+                    'data': RawJSON(courses[0])
+                }
+            
+            return conditional_json(versions, changed_at, build)
+        finally:
+            conn.close()
+        
+    except Exception as e:
+        logger.error(f"Get course error: {e}")
+        return jsonify({'success': False, 'message': 'Internal server error'}), 500
+
+@app.route('/api/courses/batch', methods=['GET'])
+def get_courses_batch():
+    """Get many courses with their required skills (?ids=1,2,3)"""
+    try:
+        try:
+            course_ids = parse_ids(request.args.get('ids'))
+            fields = COURSE_FIELDS.fields(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        conn = get_db_connection()
         
-        if not course:
+        # One versions read and, for the courses not cached yet, one query for all of them
+        try:
+            versions, changed_at = read_versions(conn, version_names(course_ids))
+            
+            def build():
+                courses, missing = course_cache.get_many(conn, course_ids, fields, versions)
+                return {
+                    'success': True,
+                    'data': {
+                        'courses': RawJSON('[' + ','.join(courses) + ']'),
+                        'missing': missing
+                    }
+                }
+            
+            return conditional_json(versions, changed_at, build)
+        finally:
             conn.close()
-            return jsonify({'success': False, 'message': 'Course not found'}), 404
         
-        # Get required skills
-        cursor.execute('''
-            SELECT s.skill_name, s.category
-            FROM skills s
-            JOIN course_skills cs ON s.skill_id = cs.skill_id
-            WHERE cs.course_id = ?
-        ''', (course_id,))
-        skills = cursor.fetchall()
+    except Exception as e:
+        logger.error(f"Get courses batch error: {e}")
+        return jsonify({'success': False, 'message': 'Internal server error'}), 500
+
+# Prerequisite routes
+@app.route('/api/courses/<int:course_id>/prerequisites', methods=['GET'])
+def get_course_prerequisites(course_id):
+    """Get course prerequisites and, optionally, a student's eligibility"""
+    try:
+        student_id = request.args.get('student_id', type=int)
+        
+        conn = get_db_connection()
+        graph = prerequisite_graph.ensure_loaded(conn)
+        
+        data = {
+            'course_id': course_id,
+            'prerequisites': sorted(graph.prerequisites_of(course_id)),
+            'all_prerequisites': graph.missing_prerequisites(course_id, ())
+        }
+        
+        if student_id:
+            completed = completed_course_ids(conn, student_id)
+            data['eligible'] = graph.is_eligible(course_id, graph.completed_mask(completed))
+            data['missing_prerequisites'] = graph.missing_prerequisites(course_id, completed)
+        
+        conn.close()
+        
+        return jsonify({
+            'success': True,
+            'data': data
+        })
+    
+    except Exception as e:
+        logger.error(f"Get prerequisites error: {e}")
+        return jsonify({'success': False, 'message': 'Internal server error'}), 500
+
+@app.route('/api/courses/<int:course_id>/prerequisites', methods=['POST'])
+def add_course_prerequisite(course_id):
+    """Add a prerequisite edge"""
+    try:
+        data = request.get_json()
+        prereq_id = data.get('prerequisite_course_id')
+        is_mandatory = data.get('is_mandatory', True)
+        
+        if not prereq_id:
+            return jsonify({'success': False, 'message': 'Prerequisite course ID required'}), 400
+        if not isinstance(prereq_id, int) or isinstance(prereq_id, bool):
+            return jsonify({'success': False, 'message': 'Prerequisite course ID must be an integer'}), 400
+        
+        conn = get_db_connection()
+        try:
+            prerequisite_graph.add_prerequisite(conn, course_id, prereq_id, bool(is_mandatory))
+        except LookupError as e:
+            conn.rollback()
+            conn.close()
+            return jsonify({'success': False, 'message': str(e)}), 404
+        except ValueError as e:
+            conn.rollback()
+            conn.close()
+            return jsonify({'success': False, 'message': str(e)}), 400
         
+        conn.commit()
         conn.close()
+        plan_cache.clear()
+        # This worker's graph is already updated; the others reload theirs
+        shared_cache.invalidate('prerequisites', local=False)
         
-        course_data = dict(course)
-        course_data['required_skills'] = [dict(skill) for skill in skills]
+        return jsonify({
+            'success': True,
+            'message': 'Prerequisite added successfully'
+        }), 201
+    
+    except Exception as e:
+        # The in-memory graph may be ahead of the rolled-back database
+        prerequisite_graph.loaded = False
+        logger.error(f"Add prerequisite error: {e}")
+        return jsonify({'success': False, 'message': 'Internal server error'}), 500
+
+@app.route('/api/courses/<int:course_id>/prerequisites/<int:prereq_id>', methods=['DELETE'])
+def remove_course_prerequisite(course_id, prereq_id):
+    """Remove a prerequisite edge"""
+    try:
+        conn = get_db_connection()
+        removed = prerequisite_graph.remove_prerequisite(conn, course_id, prereq_id)
+        conn.commit()
+        conn.close()
+        plan_cache.clear()
+        # This worker's graph is already updated; the others reload theirs
+        shared_cache.invalidate('prerequisites', local=False)
+        
+        if not removed:
+            return jsonify({'success': False, 'message': 'Prerequisite not found'}), 404
         
         return jsonify({
             'success': True,
-            'data': course_data
+            'message': 'Prerequisite removed successfully'
         })
+    
+    except Exception as e:
+        prerequisite_graph.loaded = False
+        logger.error(f"Remove prerequisite error: {e}")
+        return jsonify({'success': False, 'message': 'Internal server error'}), 500
+
+@app.route('/api/learning-path/<int:student_id>/<int:course_id>', methods=['GET'])
+def get_learning_path(student_id, course_id):
+    """Get the ordered list of courses a student needs to reach a course"""
+    try:
+        conn = get_db_connection()
+        graph = prerequisite_graph.ensure_loaded(conn)
+        path = graph.learning_path(course_id, completed_course_ids(conn, student_id))
+        
+        courses = {}
+        if path:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT course_id, course_name, difficulty_level, duration_hours
+                FROM courses WHERE course_id IN ({})
+            '''.format(','.join('?' * len(path))), path)
+            courses = {row['course_id']: dict(row) for row in cursor.fetchall()}
+        conn.close()
         
+        return jsonify({
+            'success': True,
+            'data': {
+                'learning_path': [courses.get(c, {'course_id': c}) for c in path]
+            }
+        })
+    
     except Exception as e:
-        logger.error(f"Get course error: {e}")
+        logger.error(f"Get learning path error: {e}")
         return jsonify({'success': False, 'message': 'Internal server error'}), 500
 
 # Recommendations route
@@ -504,50 +585,35 @@ def get_recommendations(student_id):
         student_skills = cursor.fetchall()
         
         if not student_skills:
+            # Cold start: fall back to what the student's department and year take
+            candidates = candidate_cache.get(conn)
+            _, enrolled = student_profile(conn, student_id)
+            with ENGINE_LATENCY.time(('cohort',)):
+                recommendations = popular_with_cohort(
+                    conn, student_id, candidates, k=limit, exclude_ids=enrolled,
+                    mask=prerequisite_graph.ensure_loaded(conn).student_mask(conn, student_id, candidates)
+                )
             conn.close()
             return jsonify({
                 'success': True,
                 'data': {
-                    'recommendations': [],
+                    'recommendations': recommendations,
                     'message': 'Add skills to your profile to get recommendations'
                 }
             })
         
-        student_skill_ids = [skill['skill_id'] for skill in student_skills]
-        
-        # Get courses with matching skills (excluding already enrolled)
-        cursor.execute('''
-            SELECT DISTINCT c.*, 
-                   COUNT(cs.skill_id) as matching_skills,
-                   (COUNT(cs.skill_id) * 1.0 / total_skills.total) as skill_match_ratio
-            FROM courses c
-            JOIN course_skills cs ON c.course_id = cs.course_id
-            JOIN (
-                SELECT course_id, COUNT(*) as total 
-                FROM course_skills 
-                GROUP BY course_id
-            ) total_skills ON c.course_id = total_skills.course_id
-            WHERE cs.skill_id IN ({})
-            AND c.course_id NOT IN (
-                SELECT course_id FROM enrollments WHERE student_id = ?
+        # Score every candidate course with the shared ranking engine
+        with ENGINE_LATENCY.time(('ranking',)):
+            recommendations = recommend_for_student(
+                conn, student_id, k=limit, require_skill_match=True,
+                prerequisites=prerequisite_graph.ensure_loaded(conn), candidates=candidate_cache.get(conn)
             )
-            GROUP BY c.course_id
-            ORDER BY skill_match_ratio DESC, c.average_rating DESC
-            LIMIT ?
-        '''.format(','.join('?' * len(student_skill_ids))), 
-        student_skill_ids + [student_id, limit])
-        
-        recommendations = cursor.fetchall()
         conn.close()
         
-        # Calculate match scores
-        for rec in recommendations:
-            rec['match_score'] = min(100, (rec['skill_match_ratio'] * 60) + (rec['average_rating'] * 8))
-        
         return jsonify({
             'success': True,
             'data': {
-                'recommendations': [dict(rec) for rec in recommendations]
+                'recommendations': recommendations
             }
         })
         
@@ -555,6 +621,66 @@ def get_recommendations(student_id):
         logger.error(f"Get recommendations error: {e}")
         return jsonify({'success': False, 'message': 'Internal server error'}), 500
 
+@app.route('/api/recommendations/<int:student_id>/cohort', methods=['GET'])
+def get_cohort_recommendations(student_id):
+    """Get courses popular with students in the same department and year"""
+    try:
+        limit = request.args.get('limit', 5, type=int)
+        
+        conn = get_db_connection()
+        candidates = candidate_cache.get(conn)
+        _, enrolled = student_profile(conn, student_id)
+        with ENGINE_LATENCY.time(('cohort',)):
+            recommendations = popular_with_cohort(conn, student_id, candidates, k=limit, exclude_ids=enrolled)
+        conn.close()
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'recommendations': recommendations
+            }
+        })
+        
+    except Exception as e:
+        logger.error(f"Get cohort recommendations error: {e}")
+        return jsonify({'success': False, 'message': 'Internal server error'}), 500
+
+# Learning plan route
+@app.route('/api/learning-plan/<int:student_id>', methods=['GET'])
+def get_learning_plan(student_id):
+    """Get a time-budgeted learning plan"""
+    try:
+        weekly_hours = request.args.get('weekly_hours', 5.0, type=float)
+        weeks = request.args.get('weeks', DEFAULT_HORIZON_WEEKS, type=int)
+        experience_level = request.args.get('experience_level')
+        categories = request.args.getlist('category')
+        
+        if weekly_hours <= 0 or weeks <= 0:
+            return jsonify({'success': False, 'message': 'weekly_hours and weeks must be positive'}), 400
+        if not (weekly_hours <= MAX_WEEKLY_HOURS and weeks <= MAX_HORIZON_WEEKS):
+            return jsonify({
+                'success': False,
+                'message': f'weekly_hours must be at most {MAX_WEEKLY_HOURS} and weeks at most {MAX_HORIZON_WEEKS}'
+            }), 400
+        
+        conn = get_db_connection()
+        with ENGINE_LATENCY.time(('learning_plan',)):
+            plan = plan_for_student(
+                conn, student_id, weekly_hours, weeks, experience_level=experience_level,
+                categories=categories, prerequisites=prerequisite_graph.ensure_loaded(conn),
+                candidates=candidate_cache.get(conn)
+            )
+        conn.close()
+        
+        return jsonify({
+            'success': True,
+            'data': plan
+        })
+        
+    except Exception as e:
+        logger.error(f"Get learning plan error: {e}")
+        return jsonify({'success': False, 'message': 'Internal server error'}), 500
+
 # Enrollments route
 @app.route('/api/enrollments', methods=['POST'])
 def create_enrollment():
@@ -595,9 +721,19 @@ def create_enrollment():
             WHERE course_id = ?
         ''', (course_id, course_id))
         
+        record_enrollment(conn, course_id)
+        compact_trending(conn)
+        record_cohort_enrollment(conn, student_id, course_id)
+        
         conn.commit()
         conn.close()
         
+        # Cached learning plans for this student, enrollment counts, trending and rollups are now stale
+        plan_cache.invalidate_student(student_id)
+        candidate_cache.invalidate()
+        trending_cache.invalidate()
+        shared_cache.invalidate('analytics')
+        
         return jsonify({
             'success': True,
             'message': 'Successfully enrolled in course'
@@ -611,31 +747,43 @@ def create_enrollment():
 def get_enrollments(student_id):
     """Get student enrollments"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT e.*, c.course_name, c.description, c.category, c.duration_hours,
-                   c.difficulty_level, c.average_rating, c.total_enrollments
+        try:
+            fields = ENROLLMENT_FIELDS.fields(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        query = '''
+            SELECT {}
             FROM enrollments e
             JOIN courses c ON e.course_id = c.course_id
             WHERE e.student_id = ?
             ORDER BY e.enrollment_date DESC
-        ''', (student_id,))
+        '''
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        
+        if wants_ndjson():
+            # Rows are written as they are read (no statistics in this mode)
+            cursor.execute(query.format(ENROLLMENT_FIELDS.select(fields)), (student_id,))
+            return ndjson_response(fields, cursor_batches(cursor), on_close=conn.close)
+        
+        # The statistics need completion_status, so it is selected last even when not projected
+        cursor.execute(query.format(ENROLLMENT_FIELDS.select(fields) + ', e.completion_status'), (student_id,))
         
         enrollments = cursor.fetchall()
         conn.close()
         
         # Calculate statistics
-        total = len(enrollments)
-        completed = len([e for e in enrollments if e['completion_status'] == 'Completed'])
-        in_progress = len([e for e in enrollments if e['completion_status'] == 'In Progress'])
-        enrolled = len([e for e in enrollments if e['completion_status'] == 'Enrolled'])
+        statuses = [e[-1] for e in enrollments]
+        total = len(statuses)
+        completed = statuses.count('Completed')
+        in_progress = statuses.count('In Progress')
+        enrolled = statuses.count('Enrolled')
         
-        return jsonify({
+        response = json_response({
             'success': True,
             'data': {
-                'enrollments': [dict(e) for e in enrollments],
+                'enrollments': RowsJSON(fields, (e[:-1] for e in enrollments)),
                 'statistics': {
                     'total_enrollments': total,
                     'completed_count': completed,
@@ -645,6 +793,8 @@ def get_enrollments(student_id):
                 }
             }
         })
+        response.vary.add('Accept')
+        return response
         
     except Exception as e:
         logger.error(f"Get enrollments error: {e}")
@@ -655,19 +805,28 @@ def get_enrollments(student_id):
 def get_skills():
     """Get all skills"""
     try:
+        try:
+            fields = SKILL_FIELDS.fields(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
         conn = get_db_connection()
-        cursor = conn.cursor()
         
-        cursor.execute('SELECT * FROM skills ORDER BY skill_name')
-        skills = cursor.fetchall()
-        conn.close()
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'skills': [dict(skill) for skill in skills]
+        def build():
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(f'SELECT {SKILL_FIELDS.select(fields)} FROM skills ORDER BY skill_name')
+            return {
+                'success': True,
+                'data': {
+                    'skills': RowsJSON(fields, cursor)
+                }
             }
-        })
+        
+        try:
+            versions, changed_at = read_versions(conn, ('skills', 'instance'))
+            return conditional_json(versions, changed_at, build)
+        finally:
+            conn.close()
         
     except Exception as e:
         logger.error(f"Get skills error: {e}")
@@ -702,6 +861,90 @@ def get_student_skills(student_id):
         logger.error(f"Get student skills error: {e}")
         return jsonify({'success': False, 'message': 'Internal server error'}), 500
 
+@app.route('/api/skills/student/<int:student_id>', methods=['PUT'])
+def update_student_skill(student_id):
+    """Add or update a student's skill proficiency"""
+    try:
+        data = request.get_json()
+        skill_id = data.get('skill_id')
+        proficiency_level = data.get('proficiency_level')
+        
+        if not skill_id or proficiency_level not in ('Beginner', 'Intermediate', 'Advanced'):
+            return jsonify({'success': False, 'message': 'Skill ID and a valid proficiency level required'}), 400
+        if not isinstance(skill_id, int) or isinstance(skill_id, bool):
+            return jsonify({'success': False, 'message': 'Skill ID must be an integer'}), 400
+        
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        # Only skills in the taxonomy (cached levels are indexed by skill id)
+        cursor.execute('SELECT 1 FROM skills WHERE skill_id = ?', (skill_id,))
+        if cursor.fetchone() is None:
+            conn.close()
+            return jsonify({'success': False, 'message': 'Skill not found'}), 404
+        
+        cursor.execute('''
+            INSERT INTO student_skills (student_id, skill_id, proficiency_level)
+            VALUES (?, ?, ?)
+            ON CONFLICT(student_id, skill_id) DO UPDATE SET proficiency_level = excluded.proficiency_level
+        ''', (student_id, skill_id, proficiency_level))
+        
+        conn.commit()
+        conn.close()
+        
+        # Keep the cached skill levels in step with the database (other workers reload theirs)
+        skill_gap_engine.update_student_skill(student_id, skill_id, proficiency_level)
+        shared_cache.invalidate(f"student:{student_id}:", local=False)
+        plan_cache.invalidate_student(student_id)
+        
+        return jsonify({
+            'success': True,
+            'message': 'Skill updated successfully'
+        })
+    
+    except Exception as e:
+        logger.error(f"Update student skill error: {e}")
+        return jsonify({'success': False, 'message': 'Internal server error'}), 500
+
+@app.route('/api/skills/gap/<int:student_id>', methods=['GET'])
+def get_skill_gap(student_id):
+    """Get next best courses ranked by skill readiness"""
+    try:
+        limit = request.args.get('limit', 5, type=int)
+        
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT course_id FROM enrollments WHERE student_id = ?', (student_id,))
+        enrolled = [row['course_id'] for row in cursor.fetchall()]
+        
+        with ENGINE_LATENCY.time(('skill_gap',)):
+            next_courses = skill_gap_engine.next_best_courses(conn, student_id, k=limit, exclude_ids=enrolled)
+        
+        # Attach course details
+        if next_courses:
+            ids = [course['course_id'] for course in next_courses]
+            cursor.execute('''
+                SELECT course_id, course_name, category, difficulty_level, duration_hours, average_rating
+                FROM courses WHERE course_id IN ({})
+            '''.format(','.join('?' * len(ids))), ids)
+            details = {row['course_id']: dict(row) for row in cursor.fetchall()}
+            for course in next_courses:
+                course.update(details.get(course['course_id'], {}))
+        
+        conn.close()
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'next_courses': next_courses
+            }
+        })
+    
+    except Exception as e:
+        logger.error(f"Get skill gap error: {e}")
+        return jsonify({'success': False, 'message': 'Internal server error'}), 500
+
 # Feedback routes
 @app.route('/api/feedback', methods=['POST'])
 def submit_feedback():
@@ -747,9 +990,18 @@ def submit_feedback():
             WHERE course_id = ?
         ''', (course_id, course_id))
         
+        record_feedback(conn, course_id, rating)
+        compact_trending(conn)
+        record_cohort_feedback(conn, student_id, course_id, rating)
+        
         conn.commit()
         conn.close()
         
+        # Ratings feed the catalog, trending and rollup caches
+        candidate_cache.invalidate()
+        trending_cache.invalidate()
+        shared_cache.invalidate('analytics')
+        
         return jsonify({
             'success': True,
             'message': 'Feedback submitted successfully'
@@ -763,26 +1015,42 @@ def submit_feedback():
 def get_course_feedback(course_id):
     """Get course feedback"""
     try:
+        try:
+            fields = FEEDBACK_FIELDS.fields(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
         conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT f.*, s.name as student_name, s.department
-            FROM feedback f
-            JOIN students s ON f.student_id = s.student_id
-            WHERE f.course_id = ?
-            ORDER BY f.feedback_date DESC
-        ''', (course_id,))
-        
-        feedback = cursor.fetchall()
-        conn.close()
         
-        return jsonify({
-            'success': True,
-            'data': {
-                'feedback': [dict(f) for f in feedback]
+        def feedback_rows():
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(f'''
+                SELECT {FEEDBACK_FIELDS.select(fields)}
+                FROM feedback f
+                JOIN students s ON f.student_id = s.student_id
+                WHERE f.course_id = ?
+                ORDER BY f.feedback_date DESC
+            ''', (course_id,))
+            return cursor
+        
+        if wants_ndjson():
+            # Popular courses have very many reviews: write them as they are read
+            return ndjson_response(fields, cursor_batches(feedback_rows()), on_close=conn.close)
+        
+        def build():
+            return {
+                'success': True,
+                'data': {
+                    'feedback': RowsJSON(fields, feedback_rows())
+                }
             }
-        })
+        
+        # Bumped by feedback on this course and by student name or department changes
+        try:
+            versions, changed_at = read_versions(conn, (f"feedback:{course_id}", 'students', 'instance'))
+            return conditional_json(versions, changed_at, build)
+        finally:
+            conn.close()
         
     except Exception as e:
         logger.error(f"Get course feedback error: {e}")
@@ -0,0 +1,407 @@
+# =====================================================
+# AI COURSE RECOMMENDATION SYSTEM - BENCHMARK SUITE
+# =====================================================
+# Latency benchmarks for every Flask route and the
+# Streamlit data functions at several dataset scales
+# Author: Student
+# Date: October 2025
+# Description: Generates (or reuses) seeded synthetic databases,
+#              times each endpoint/function, stores p50/p95/p99
+#              as JSON and flags regressions against a baseline
+# =====================================================
+#
+# Usage (from backend/):
+#   python benchmark.py run --scale small --scale medium --out results.json
+#   python benchmark.py run --db course_recommendation.db --out results.json --baseline baseline.json
+#   python benchmark.py compare baseline.json results.json --threshold 0.2
+#
+# Each scale runs in its own process against a scratch copy of the dataset,
+# so write routes never change the cached databases and module-level caches
+# start cold for every scale.
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from migrations import migrate
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BACKEND_DIR)
+
+# Dataset presets (arguments to generate_data.generate)
+SCALES = {
+    'small': {'students': 1000, 'courses': 200, 'skills': 100, 'enrollments': 10000},
+    'medium': {'students': 50000, 'courses': 5000, 'skills': 500, 'enrollments': 500000},
+    'large': {'students': 1000000, 'courses': 100000, 'skills': 2000, 'enrollments': 20000000},
+}
+
+# A p50 or p95 this much slower than the baseline (and at least MIN_REGRESSION_MS
+# slower, to ignore jitter on sub-millisecond calls) is a regression
+DEFAULT_THRESHOLD = 0.2
+MIN_REGRESSION_MS = 0.5
+
+def summarize(latencies_ms):
+    """Percentiles and spread of a list of latencies in milliseconds"""
+    values = np.asarray(latencies_ms, dtype=np.float64)
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        'count': int(values.size),
+        'p50_ms': round(float(p50), 3),
+        'p95_ms': round(float(p95), 3),
+        'p99_ms': round(float(p99), 3),
+        'mean_ms': round(float(values.mean()), 3),
+        'min_ms': round(float(values.min()), 3),
+        'max_ms': round(float(values.max()), 3),
+    }
+
+def time_case(call, iterations, warmup, max_seconds):
+    """Run call() warmup + up to iterations times (stopping early after max_seconds)"""
+    for _ in range(warmup):
+        call()
+    latencies, outcomes = [], {}
+    deadline = time.perf_counter() + max_seconds
+    for i in range(iterations):
+        started = time.perf_counter()
+        outcome = call()
+        latencies.append((time.perf_counter() - started) * 1000.0)
+        outcomes[str(outcome)] = outcomes.get(str(outcome), 0) + 1
+        if i >= 4 and time.perf_counter() > deadline:
+            break
+    result = summarize(latencies)
+    result['outcomes'] = outcomes
+    return result
+
+# ---- worker: runs inside a process whose COURSE_DB_PATH is the scratch database ----
+
+def sample_ids(conn, rng):
+    """Random existing ids to drive parameterized routes"""
+    def ids(sql):
+        return np.array([row[0] for row in conn.execute(sql)], dtype=np.int64)
+    students = ids('SELECT student_id FROM students')
+    courses = ids('SELECT course_id FROM courses')
+    skills = ids('SELECT skill_id FROM skills')
+    picked = rng.choice(students, size=min(100, students.size), replace=False).tolist()
+    emails = [row[0] for row in conn.execute(
+        f"SELECT email FROM students WHERE student_id IN ({','.join('?' * len(picked))})", picked)]
+    return students, courses, skills, emails
+
+def flask_cases(client, conn, rng):
+    """(name, call) for every route in app_sqlite, each call returning the status code"""
+    students, courses, skills, emails = sample_ids(conn, rng)
+    categories = [row[0] for row in conn.execute('SELECT DISTINCT category FROM courses LIMIT 20')]
+    student = lambda: int(rng.choice(students))
+    course = lambda: int(rng.choice(courses))
+    counter = {'register': 0}
+    added_edges = []
+
+    def register():
+        counter['register'] += 1
+        return client.post('/api/auth/register', json={
+            'name': 'Bench User', 'email': f"bench{os.getpid()}_{counter['register']}@example.edu",
+            'password': 'password123', 'phone': '9000000000', 'department': 'Computer Science',
+            'year': '2nd Year'}).status_code
+
+    def add_prerequisite():
+        # Later course ids only depend on earlier ones, so no cycles are attempted
+        a, b = sorted(rng.choice(courses, size=2, replace=False).tolist())
+        status = client.post(f'/api/courses/{b}/prerequisites', json={'prerequisite_course_id': a}).status_code
+        if status == 201:
+            added_edges.append((b, a))
+        return status
+
+    def remove_prerequisite():
+        if not added_edges:
+            return client.delete(f'/api/courses/{course()}/prerequisites/{course()}').status_code
+        b, a = added_edges.pop()
+        return client.delete(f'/api/courses/{b}/prerequisites/{a}').status_code
+
+    etags = {}
+
+    def revalidate(url):
+        # Repeat read by a client holding the last ETag (304 unless the data changed)
+        response = client.get(url, headers={'If-None-Match': etags.get(url, '')})
+        etags[url] = response.headers.get('ETag', etags.get(url, ''))
+        return response.status_code
+
+    def stream(url):
+        # Read a streamed NDJSON body to the end, as a client would
+        with client.get(url, headers={'Accept': 'application/x-ndjson'}) as response:
+            response.get_data()
+            return response.status_code
+
+    return [
+        ('GET /', lambda: client.get('/').status_code),
+        ('GET /api/health', lambda: client.get('/api/health').status_code),
+        ('GET /api/metrics', lambda: client.get('/api/metrics').status_code),
+        ('GET /api/ready', lambda: client.get('/api/ready').status_code),
+        ('POST /api/auth/login', lambda: client.post('/api/auth/login', json={
+            'email': emails[int(rng.integers(len(emails)))], 'password': 'password123'}).status_code),
+        ('POST /api/auth/register', register),
+        ('POST /api/auth/logout', lambda: client.post('/api/auth/logout').status_code),
+        ('GET /api/courses', lambda: client.get('/api/courses').status_code),
+        ('GET /api/courses?category=', lambda: client.get(
+            '/api/courses', query_string={'category': rng.choice(categories)}).status_code),
+        ('GET /api/courses?search=', lambda: client.get(
+            '/api/courses', query_string={'search': 'Python'}).status_code),
+        ('GET /api/courses?fields=', lambda: client.get(
+            '/api/courses', query_string={'fields': 'course_id,course_name,average_rating'}).status_code),
+        ('GET /api/courses (If-None-Match)', lambda: revalidate('/api/courses')),
+        ('GET /api/courses (gzip)', lambda: client.get(
+            '/api/courses', headers={'Accept-Encoding': 'gzip, br'}).status_code),
+        ('GET /api/courses/trending', lambda: client.get('/api/courses/trending').status_code),
+        ('GET /api/courses/<int:course_id>', lambda: client.get(f'/api/courses/{course()}').status_code),
+        ('GET /api/courses/batch?ids= (50)', lambda: client.get('/api/courses/batch', query_string={
+            'ids': ','.join(str(course()) for _ in range(50))}).status_code),
+        ('GET /api/courses/<int:course_id>/prerequisites', lambda: client.get(
+            f'/api/courses/{course()}/prerequisites').status_code),
+        ('POST /api/courses/<int:course_id>/prerequisites', add_prerequisite),
+        ('DELETE /api/courses/<int:course_id>/prerequisites/<int:prereq_id>', remove_prerequisite),
+        ('GET /api/learning-path/<int:student_id>/<int:course_id>', lambda: client.get(
+            f'/api/learning-path/{student()}/{course()}').status_code),
+        ('GET /api/recommendations/<int:student_id>', lambda: client.get(
+            f'/api/recommendations/{student()}').status_code),
+        ('GET /api/recommendations/<int:student_id>/cohort', lambda: client.get(
+            f'/api/recommendations/{student()}/cohort').status_code),
+        ('GET /api/learning-plan/<int:student_id>', lambda: client.get(
+            f'/api/learning-plan/{student()}', query_string={'weekly_hours': 5, 'weeks': 12}).status_code),
+        ('POST /api/enrollments', lambda: client.post('/api/enrollments', json={
+            'student_id': student(), 'course_id': course()}).status_code),
+        ('GET /api/enrollments/student/<int:student_id>', lambda: client.get(
+            f'/api/enrollments/student/{student()}').status_code),
+        ('GET /api/skills', lambda: client.get('/api/skills').status_code),
+        ('GET /api/skills (If-None-Match)', lambda: revalidate('/api/skills')),
+        ('GET /api/skills/student/<int:student_id>', lambda: client.get(
+            f'/api/skills/student/{student()}').status_code),
+        ('PUT /api/skills/student/<int:student_id>', lambda: client.put(
+            f'/api/skills/student/{student()}', json={
+            'skill_id': int(rng.choice(skills)),
+            'proficiency_level': rng.choice(['Beginner', 'Intermediate', 'Advanced'])}).status_code),
+        ('GET /api/skills/gap/<int:student_id>', lambda: client.get(f'/api/skills/gap/{student()}').status_code),
+        ('POST /api/feedback', lambda: client.post('/api/feedback', json={
+            'student_id': student(), 'course_id': course(), 'rating': int(rng.integers(1, 6))}).status_code),
+        ('GET /api/feedback/course/<int:course_id>', lambda: client.get(
+            f'/api/feedback/course/{course()}').status_code),
+        ('GET /api/feedback/course/<int:course_id> (NDJSON)', lambda: stream(f'/api/feedback/course/{course()}')),
+    ]
+
+def streamlit_cases(conn, rng):
+    """(name, call) for the Streamlit data functions, or [] when Streamlit is not installed"""
+    try:
+        sys.path.insert(0, REPO_DIR)
+        import streamlit_app
+    except ImportError as e:
+        print(f"  skipping Streamlit data functions ({e})")
+        return []
+    streamlit_app.DB_PATH = os.environ['COURSE_DB_PATH']
+
+    students, courses, skills, emails = sample_ids(conn, rng)
+    student = lambda: int(rng.choice(students))
+    rows = lambda frame: len(frame) if frame is not None else None
+    return [
+        ('streamlit get_dashboard_stats', lambda: len(streamlit_app.get_dashboard_stats())),
+        ('streamlit get_courses_data', lambda: rows(streamlit_app.get_courses_data())),
+        ('streamlit get_course_recommendations', lambda: rows(
+            streamlit_app.get_course_recommendations(student()))),
+        ('streamlit get_quiz_recommendations', lambda: rows(streamlit_app.get_quiz_recommendations(
+            ['Programming', 'Data Science'], 'Intermediate', student()))),
+        ('streamlit get_learning_plan', lambda: streamlit_app.get_learning_plan(
+            student(), 'medium', 'Beginner', ['Programming']) is not None),
+        ('streamlit get_trending_courses', lambda: rows(streamlit_app.get_trending_courses())),
+        ('streamlit get_cohort_recommendations', lambda: rows(
+            streamlit_app.get_cohort_recommendations(student()))),
+        ('streamlit get_enrollment_data', lambda: rows(streamlit_app.get_enrollment_data())),
+        ('streamlit get_admin_stats', lambda: rows(streamlit_app.get_admin_stats())),
+        ('streamlit get_all_students_data', lambda: rows(streamlit_app.get_all_students_data())),
+        ('streamlit get_all_courses_admin_data', lambda: rows(streamlit_app.get_all_courses_admin_data())),
+        ('streamlit get_all_enrollments_data', lambda: rows(streamlit_app.get_all_enrollments_data())),
+        ('streamlit get_system_analytics_data', lambda: rows(streamlit_app.get_system_analytics_data())),
+    ]
+
+def run_worker(args):
+    """Benchmark one database (COURSE_DB_PATH) and write the results as JSON"""
+    import logging
+    import app_sqlite
+
+    logging.getLogger('app_sqlite').setLevel(logging.WARNING)
+    rng = np.random.default_rng(args.seed)
+    conn = sqlite3.connect(os.environ['COURSE_DB_PATH'])
+    client = app_sqlite.app.test_client()
+
+    cases = flask_cases(client, conn, rng)
+    # Case names use the Flask rule syntax, so new routes without a case are reported
+    benchmarked = {name.split('?')[0] for name, _ in cases}
+    for rule in app_sqlite.app.url_map.iter_rules():
+        for method in sorted(rule.methods - {'HEAD', 'OPTIONS'}):
+            if rule.endpoint != 'static' and f"{method} {rule.rule}" not in benchmarked:
+                print(f"  warning: no benchmark for {method} {rule.rule}")
+    cases += streamlit_cases(conn, rng)
+
+    results = {}
+    for name, call in cases:
+        results[name] = time_case(call, args.iterations, args.warmup, args.max_seconds)
+        print(f"  {name:<68}p50 {results[name]['p50_ms']:>9.2f}  p95 {results[name]['p95_ms']:>9.2f}  "
+              f"p99 {results[name]['p99_ms']:>9.2f} ms")
+    conn.close()
+
+    with open(args.out, 'w') as f:
+        json.dump(results, f)
+
+# ---- driver ----
+
+def dataset_path(data_dir, scale, seed):
+    """Path of the cached dataset for a scale, generating it on first use"""
+    from generate_data import generate
+
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f"{scale}-seed{seed}.db")
+    if not os.path.exists(path):
+        print(f"Generating {scale} dataset ({path})")
+        partial = path + '.partial'
+        if os.path.exists(partial):
+            os.remove(partial)
+        generate(partial, seed=seed, **SCALES[scale])
+        os.replace(partial, path)
+    return path
+
+def table_counts(path):
+    conn = sqlite3.connect(path)
+    counts = {table: conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+              for table in ('students', 'courses', 'skills', 'enrollments', 'feedback')}
+    conn.close()
+    return counts
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(args):
+    targets = [(scale, dataset_path(args.data_dir, scale, args.seed)) for scale in args.scale or []]
+    targets += [(os.path.basename(db), db) for db in args.db or []]
+    if not targets:
+        targets = [('small', dataset_path(args.data_dir, 'small', args.seed))]
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'iterations': args.iterations,
+            'seed': args.seed,
+        },
+        'scales': {},
+    }
+    for name, source in targets:
+        print(f"Benchmarking {name}")
+        with tempfile.TemporaryDirectory() as scratch:
+            db_copy = os.path.join(scratch, 'bench.db')
+            shutil.copyfile(source, db_copy)
+            migrate(db_copy)
+            out = os.path.join(scratch, 'results.json')
+            # Caches start cold (no background warm-up) so first-hit costs stay visible
+            env = dict(os.environ, COURSE_DB_PATH=db_copy, WARMUP='0')
+            subprocess.run([sys.executable, os.path.abspath(__file__), 'worker', '--out', out,
+                            '--iterations', str(args.iterations), '--warmup', str(args.warmup),
+                            '--max-seconds', str(args.max_seconds), '--seed', str(args.seed)],
+                           cwd=BACKEND_DIR, env=env, check=True)
+            with open(out) as f:
+                results = json.load(f)
+        report['scales'][name] = {'dataset': table_counts(source), 'results': results}
+
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        return print_comparison(baseline, report, args.threshold)
+    return 0
+
+def compare_reports(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Rows of (scale, case, metric, before, after, ratio, regressed) for cases in both reports"""
+    rows = []
+    for scale, data in current['scales'].items():
+        before = baseline.get('scales', {}).get(scale, {}).get('results', {})
+        for case, stats in data['results'].items():
+            if case not in before:
+                continue
+            for metric in ('p50_ms', 'p95_ms'):
+                old, new = before[case][metric], stats[metric]
+                ratio = new / old if old > 0 else float('inf')
+                regressed = ratio > 1.0 + threshold and new - old > MIN_REGRESSION_MS
+                rows.append((scale, case, metric, old, new, ratio, regressed))
+    return rows
+
+def print_comparison(baseline, current, threshold):
+    """Print the comparison and return 1 if anything regressed"""
+    rows = compare_reports(baseline, current, threshold)
+    regressions = [row for row in rows if row[6]]
+    print(f"Compared {len(rows)} measurements against baseline "
+          f"{baseline.get('meta', {}).get('commit')} (threshold +{threshold:.0%})")
+    for scale, case, metric, old, new, ratio, regressed in rows:
+        if regressed or ratio < 1.0 / (1.0 + threshold):
+            label = 'REGRESSION' if regressed else 'improved'
+            print(f"  {label:<11}{scale:<10}{case:<68}{metric:<8}{old:>9.2f} -> {new:>9.2f} ms ({ratio:.2f}x)")
+    if regressions:
+        print(f"{len(regressions)} regression(s)")
+        return 1
+    print("No regressions")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Flask routes and Streamlit data functions')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='Run the benchmarks')
+    run.add_argument('--scale', action='append', choices=sorted(SCALES),
+                     help='Synthetic dataset scale (repeatable; default: small)')
+    run.add_argument('--db', action='append', help='Also benchmark an existing database (copied first)')
+    run.add_argument('--data-dir', default='benchmark_data', help='Where generated datasets are cached')
+    run.add_argument('--iterations', type=int, default=50)
+    run.add_argument('--warmup', type=int, default=3)
+    run.add_argument('--max-seconds', type=float, default=20.0, help='Time cap per case')
+    run.add_argument('--seed', type=int, default=42)
+    run.add_argument('--out', default='benchmark_results.json')
+    run.add_argument('--baseline', help='Compare against this earlier results file')
+    run.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+
+    compare = commands.add_parser('compare', help='Compare two results files')
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+    compare.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+
+    worker = commands.add_parser('worker', help=argparse.SUPPRESS)
+    worker.add_argument('--out', required=True)
+    worker.add_argument('--iterations', type=int, default=50)
+    worker.add_argument('--warmup', type=int, default=3)
+    worker.add_argument('--max-seconds', type=float, default=20.0)
+    worker.add_argument('--seed', type=int, default=42)
+
+    args = parser.parse_args()
+    if args.command == 'worker':
+        run_worker(args)
+    elif args.command == 'run':
+        sys.exit(run_benchmarks(args))
+    else:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        sys.exit(print_comparison(baseline, current, args.threshold))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,486 @@
+# =====================================================
+# AI COURSE RECOMMENDATION SYSTEM - CACHE BACKEND
+# =====================================================
+# Two-tier cache shared by Flask and Streamlit workers
+# Author: Student
+# Date: October 2025
+# Description: In-process LRU in front of a shared tier (a local
+#              SQLite file by default, or Redis), with invalidation
+#              events broadcast to every worker so a write in one
+#              process invalidates the same keys in all of them
+# =====================================================
+#
+# Settings (environment):
+#   CACHE_BACKEND=sqlite            sqlite | redis | local (no shared tier)
+#   CACHE_SQLITE_PATH=path          default: shared_cache-<instance>.db next to the course database
+#   CACHE_REDIS_URL=redis://localhost:6379/0
+#   CACHE_LOCAL_SIZE=2048           entries kept in each process
+#   CACHE_POLL_INTERVAL=0.25        seconds between checks for other workers' events
+#
+# Keys are strings grouped by prefix ('plan:12:', 'trending:', 'catalog').
+# invalidate(prefix) deletes matching keys here and in the shared tier and
+# appends the prefix to an event log. Every worker reads the log at most
+# every CACHE_POLL_INTERVAL seconds (on cache access, and at the start of
+# each request), drops matching local keys and runs the callbacks registered
+# with subscribe(), which is how in-process objects (catalog snapshot, skill
+# vectors, prerequisite graph, Streamlit rollups) are told about writes made
+# by another worker. An invalidation whose delete or event could not be
+# written (e.g. a lock timeout) stays queued and is retried on the next
+# poll; until then this process skips the shared tier for those keys.
+#
+# The default SQLite file and Redis namespace are per database: they carry
+# the 'instance' id from data_versions, which unlike the version counters
+# is not reused by a new or regenerated database in the same place.
+#
+# Values are pickled: only point the shared tier at a store this app owns.
+
+import logging
+import math
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+logger = logging.getLogger('cache_backend')
+
+BACKEND = os.environ.get('CACHE_BACKEND', 'sqlite')
+SQLITE_PATH = os.environ.get('CACHE_SQLITE_PATH')
+REDIS_URL = os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+LOCAL_SIZE = int(os.environ.get('CACHE_LOCAL_SIZE', '2048'))
+POLL_INTERVAL = float(os.environ.get('CACHE_POLL_INTERVAL', '0.25'))
+
+# Invalidation events are kept this long; a worker that falls further behind
+# drops its whole local tier instead of replaying them
+EVENT_RETENTION = 300.0
+
+MISSING = object()
+
+def database_instance(conn):
+    """The database's random 'instance' id from data_versions, or None if it has none yet"""
+    try:
+        row = conn.execute("SELECT version FROM data_versions WHERE name = 'instance'").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+def _prefix_end(prefix):
+    """Smallest string greater than every string starting with prefix"""
+    return prefix + '\U0010ffff'
+
+class LocalLRU:
+    """Thread-safe in-process LRU with per-entry expiry"""
+
+    def __init__(self, max_size=LOCAL_SIZE):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.time():
+                del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl if ttl else None)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class SQLiteTier:
+    """Shared tier in a local SQLite file (WAL), one connection per thread"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._writes = 0
+        conn = self._conn()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                expires_at REAL
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS cache_events (
+                event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                prefix TEXT NOT NULL,
+                origin TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        ''')
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        """(value, seconds left or None) or MISSING"""
+        row = self._conn().execute('SELECT value, expires_at FROM cache_entries WHERE key = ?', (key,)).fetchone()
+        now = time.time()
+        if row is None or (row[1] is not None and row[1] <= now):
+            return MISSING
+        return pickle.loads(row[0]), None if row[1] is None else row[1] - now
+
+    def get_many(self, keys):
+        """{key: (value, seconds left or None)} for the keys that are present"""
+        conn = self._conn()
+        now = time.time()
+        found = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = conn.execute(f'''
+                SELECT key, value, expires_at FROM cache_entries WHERE key IN ({','.join('?' * len(chunk))})
+            ''', chunk).fetchall()
+            for key, value, expires_at in rows:
+                if expires_at is None or expires_at > now:
+                    found[key] = pickle.loads(value), None if expires_at is None else expires_at - now
+        return found
+
+    def set(self, key, value, ttl=None):
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, items, ttl=None):
+        """Store every key -> value in items in one transaction"""
+        conn = self._conn()
+        now = time.time()
+        rows = [(key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), now + ttl if ttl else None)
+                for key, value in items.items()]
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany('INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)', rows)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        self._writes += len(rows)
+        if self._writes >= 500:
+            self._writes = 0
+            conn.execute('DELETE FROM cache_entries WHERE expires_at < ?', (now,))
+
+    def delete_prefix(self, prefix):
+        self._conn().execute('DELETE FROM cache_entries WHERE key >= ? AND key < ?', (prefix, _prefix_end(prefix)))
+
+    def publish(self, prefixes, origin):
+        conn = self._conn()
+        now = time.time()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany('INSERT INTO cache_events (prefix, origin, created_at) VALUES (?, ?, ?)',
+                             [(prefix, origin, now) for prefix in prefixes])
+            conn.execute('DELETE FROM cache_events WHERE created_at < ?', (now - EVENT_RETENTION,))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def last_event(self):
+        return self._conn().execute('SELECT COALESCE(MAX(event_id), 0) FROM cache_events').fetchone()[0]
+
+    def events_since(self, event_id):
+        """([(event_id, prefix, origin)], complete); complete is False if events after event_id were pruned"""
+        conn = self._conn()
+        events = conn.execute('''
+            SELECT event_id, prefix, origin FROM cache_events WHERE event_id > ? ORDER BY event_id
+        ''', (event_id,)).fetchall()
+        complete = not events or events[0][0] == event_id + 1 or conn.execute(
+            'SELECT COUNT(*) FROM cache_events WHERE event_id <= ?', (event_id,)).fetchone()[0] > 0
+        return events, complete
+
+class RedisTier:
+    """Shared tier on a Redis-compatible client (redis.Redis, or fakeredis for local testing)
+
+    Entries are plain keys with an expiry; invalidation events go to a
+    capped stream that workers read from their last seen id.
+    """
+
+    def __init__(self, client, namespace='course_cache:'):
+        self.client = client
+        self.namespace = namespace
+        self.stream = f"{namespace}events"
+
+    def get(self, key):
+        """(value, seconds left or None) or MISSING"""
+        pipe = self.client.pipeline()
+        pipe.get(self.namespace + key)
+        pipe.pttl(self.namespace + key)
+        value, ttl_ms = pipe.execute()
+        if value is None:
+            return MISSING
+        return pickle.loads(value), ttl_ms / 1000.0 if ttl_ms and ttl_ms > 0 else None
+
+    def get_many(self, keys):
+        """{key: (value, seconds left or None)} for the keys that are present, in one round trip"""
+        pipe = self.client.pipeline()
+        for key in keys:
+            pipe.get(self.namespace + key)
+            pipe.pttl(self.namespace + key)
+        results = pipe.execute()
+        found = {}
+        for key, value, ttl_ms in zip(keys, results[::2], results[1::2]):
+            if value is not None:
+                found[key] = pickle.loads(value), ttl_ms / 1000.0 if ttl_ms and ttl_ms > 0 else None
+        return found
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.namespace + key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                        ex=max(1, math.ceil(ttl)) if ttl else None)
+
+    def set_many(self, items, ttl=None):
+        pipe = self.client.pipeline()
+        for key, value in items.items():
+            pipe.set(self.namespace + key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                     ex=max(1, math.ceil(ttl)) if ttl else None)
+        pipe.execute()
+
+    def delete_prefix(self, prefix):
+        pattern = ''.join('\\' + c if c in '*?[]\\' else c for c in self.namespace + prefix) + '*'
+        keys = list(self.client.scan_iter(match=pattern, count=500))
+        if keys:
+            self.client.delete(*keys)
+
+    def publish(self, prefixes, origin):
+        for prefix in prefixes:
+            self.client.xadd(self.stream, {'prefix': prefix, 'origin': origin}, maxlen=10000, approximate=True)
+
+    def last_event(self):
+        latest = self.client.xrevrange(self.stream, count=1)
+        return _text(latest[0][0]) if latest else '0-0'
+
+    def events_since(self, event_id):
+        entries = self.client.xread({self.stream: event_id}, count=10000) or []
+        events = []
+        for _, messages in entries:
+            for message_id, fields in messages:
+                fields = {_text(k): _text(v) for k, v in fields.items()}
+                events.append((_text(message_id), fields['prefix'], fields['origin']))
+        # The stream is capped rather than aged; a reader that far behind has lost events
+        first = self.client.xrange(self.stream, count=1)
+        complete = event_id == '0-0' or not first or _stream_id(_text(first[0][0])) <= _stream_id(event_id)
+        return events, complete
+
+def _text(value):
+    return value.decode('utf-8') if isinstance(value, bytes) else value
+
+def _stream_id(event_id):
+    ms, _, seq = event_id.partition('-')
+    return int(ms), int(seq or 0)
+
+class SharedCache:
+    """LRU tier in this process plus an optional shared tier, with broadcast invalidation"""
+
+    def __init__(self, shared=None, local_size=LOCAL_SIZE, poll_interval=POLL_INTERVAL):
+        self.local = LocalLRU(local_size)
+        self.poll_interval = poll_interval
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._subscribers = []
+        self._sync_lock = threading.Lock()
+        self._polled_at = 0.0
+        self.shared = None
+        self._last_event = None
+        # Prefixes invalidated here whose shared delete or event has not been written yet
+        self._unsent = []
+        self._unsent_lock = threading.Lock()
+        self.configure(shared)
+
+    def configure(self, shared):
+        """Switch the shared tier (None for process-local only) and start reading its events from now"""
+        self.shared = shared
+        self.local.clear()
+        self._last_event = None
+        self._unsent = []
+        if shared is not None:
+            try:
+                self._last_event = shared.last_event()
+            except Exception as e:
+                logger.warning(f"Shared cache unavailable, continuing with the local tier only: {e}")
+
+    # ---- values ----
+
+    def get(self, key):
+        """Cached value or MISSING, checking this process first and then the shared tier"""
+        self.sync()
+        value = self.local.get(key)
+        if value is not MISSING or self.shared is None or self._unsent_for(key):
+            return value
+        try:
+            entry = self.shared.get(key)
+        except Exception as e:
+            logger.warning(f"Shared cache read failed for {key}: {e}")
+            return MISSING
+        if entry is MISSING:
+            return MISSING
+        value, ttl = entry
+        self.local.set(key, value, ttl)
+        return value
+
+    def get_many(self, keys):
+        """{key: value} for the cached keys; the local misses are read from the shared tier in one call"""
+        self.sync()
+        found = {}
+        for key in keys:
+            value = self.local.get(key)
+            if value is not MISSING:
+                found[key] = value
+        misses = [key for key in keys if key not in found and not self._unsent_for(key)]
+        if not misses or self.shared is None:
+            return found
+        try:
+            entries = self.shared.get_many(misses)
+        except Exception as e:
+            logger.warning(f"Shared cache read failed for {len(misses)} keys: {e}")
+            return found
+        for key, (value, ttl) in entries.items():
+            self.local.set(key, value, ttl)
+            found[key] = value
+        return found
+
+    def set(self, key, value, ttl=None):
+        self.local.set(key, value, ttl)
+        if self.shared is not None:
+            try:
+                self.shared.set(key, value, ttl)
+            except Exception as e:
+                logger.warning(f"Shared cache write failed for {key}: {e}")
+
+    def set_many(self, items, ttl=None):
+        """Store every key -> value in items, in one shared-tier call"""
+        for key, value in items.items():
+            self.local.set(key, value, ttl)
+        if self.shared is not None and items:
+            try:
+                self.shared.set_many(items, ttl)
+            except Exception as e:
+                logger.warning(f"Shared cache write failed for {len(items)} keys: {e}")
+
+    # ---- invalidation ----
+
+    def subscribe(self, prefix, callback):
+        """Call callback(event_prefix) whenever keys under or above prefix are invalidated, by any worker"""
+        self._subscribers.append((prefix, callback))
+
+    def invalidate(self, *prefixes, local=True):
+        """Drop keys starting with each prefix in every worker
+
+        local=False skips this process's subscribers, for callers that have
+        already updated their own copy (e.g. a patched skill vector).
+        """
+        for prefix in prefixes:
+            self.local.delete_prefix(prefix)
+            if local:
+                self._notify(prefix)
+        if self.shared is None:
+            return
+        with self._unsent_lock:
+            self._unsent.extend(prefix for prefix in prefixes if prefix not in self._unsent)
+        self._send_invalidations()
+
+    def _unsent_for(self, key):
+        return bool(self._unsent) and any(key.startswith(prefix) for prefix in self._unsent)
+
+    def _send_invalidations(self):
+        """Delete and broadcast the queued prefixes; on failure they stay queued for the next poll"""
+        with self._unsent_lock:
+            prefixes = tuple(self._unsent)
+            if not prefixes:
+                return
+            try:
+                for prefix in prefixes:
+                    self.shared.delete_prefix(prefix)
+                self.shared.publish(prefixes, self.origin)
+            except Exception as e:
+                logger.warning(f"Could not broadcast cache invalidation {prefixes}, will retry: {e}")
+                return
+            self._unsent.clear()
+
+    def sync(self, force=False):
+        """Apply invalidations published by other workers since the last check"""
+        if self.shared is None or self._last_event is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._polled_at < self.poll_interval:
+            return
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            self._polled_at = now
+            if self._unsent:
+                self._send_invalidations()
+            events, complete = self.shared.events_since(self._last_event)
+            if not complete:
+                logger.warning('Missed cache invalidation events; dropping the local cache tier')
+                self.local.clear()
+                self._notify('')
+            for event_id, prefix, origin in events:
+                self._last_event = event_id
+                if origin != self.origin and complete:
+                    self.local.delete_prefix(prefix)
+                    self._notify(prefix)
+        except Exception as e:
+            logger.warning(f"Could not read cache invalidation events: {e}")
+        finally:
+            self._sync_lock.release()
+
+    def _notify(self, prefix):
+        for subscribed, callback in self._subscribers:
+            if prefix.startswith(subscribed) or subscribed.startswith(prefix):
+                try:
+                    callback(prefix)
+                except Exception as e:
+                    logger.warning(f"Cache invalidation callback for {subscribed} failed: {e}")
+
+def _file_instance(db_path):
+    if not os.path.exists(db_path):
+        return None
+    conn = sqlite3.connect(db_path)
+    try:
+        return database_instance(conn)
+    finally:
+        conn.close()
+
+def shared_tier_from_env(db_path):
+    """Shared tier selected by CACHE_BACKEND for the course database at db_path"""
+    if BACKEND == 'local':
+        return None
+    instance = _file_instance(db_path)
+    if BACKEND == 'redis':
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('CACHE_BACKEND=redis needs the redis package (pip install redis)')
+        namespace = 'course_cache:' if instance is None else f"course_cache:{instance}:"
+        return RedisTier(redis.Redis.from_url(REDIS_URL), namespace=namespace)
+    if BACKEND != 'sqlite':
+        raise RuntimeError(f"Unknown CACHE_BACKEND {BACKEND!r} (expected sqlite, redis or local)")
+    name = 'shared_cache.db' if instance is None else f"shared_cache-{instance}.db"
+    path = SQLITE_PATH or os.path.join(os.path.dirname(os.path.abspath(db_path)), name)
+    return SQLiteTier(path)
+
+# Process-wide cache; local-only until the app calls
+# shared_cache.configure(shared_tier_from_env(DB_PATH))
+shared_cache = SharedCache()
@@ -0,0 +1,533 @@
+# =====================================================
+# AI COURSE RECOMMENDATION SYSTEM - CATALOG SNAPSHOT
+# =====================================================
+# Shared, immutable, column-oriented course catalog
+# Author: Student
+# Date: October 2025
+# Description: Loads the courses table and course skills once per
+#              data version into read-only numpy columns (category
+#              and difficulty as small integer codes), shared by every
+#              request, session and thread, with vectorized filtering
+#              and an atomic swap when courses change
+# =====================================================
+#
+# Triggers on courses and course_skills bump counters in data_versions,
+# so writes from any process (Flask, Streamlit, scripts) change the
+# version. CatalogStore reads the version at most every CHECK_INTERVAL
+# seconds and rebuilds at most every MIN_REBUILD_INTERVAL seconds; readers
+# keep the snapshot they were handed, so a swap never changes data under
+# them. Enrollments are not part of the catalog: the co-enrollment matrix
+# is a separate snapshot with its own version and schedule
+# (co_enrollment.py).
+#
+# Each version is also published as a memory-mapped file
+# (catalog_snapshots/catalog-<version>.snap next to the database): the first
+# worker to see a new version builds and writes it, every other worker maps
+# the same file instead of querying SQLite and holding its own copy.
+#
+# Settings (environment):
+#   CATALOG_SNAPSHOTS=0             keep snapshots in process memory only
+#   CATALOG_SNAPSHOT_DIR=path       where snapshot files go
+
+import glob
+import os
+import threading
+import time
+
+import numpy as np
+
+from metrics import CACHE_LOOKUPS
+from cache_backend import shared_cache
+from snapshot_file import StringColumn, encode_strings, open_snapshot, write_snapshot
+
+# Difficulty codes match ranking.LEVELS (0 = missing)
+DIFFICULTIES = (None, 'Beginner', 'Intermediate', 'Advanced')
+_DIFFICULTY_CODES = {name: code for code, name in enumerate(DIFFICULTIES) if name}
+
+# Tables whose writes change the catalog
+VERSIONED_TABLES = ('courses', 'course_skills')
+
+CHECK_INTERVAL = 1.0
+MIN_REBUILD_INTERVAL = 2.0
+
+# Rebuild age for databases without the data_versions table
+FALLBACK_MAX_AGE = 60.0
+
+# Bytes of search text compared per step of search_mask (bounds its temporary arrays)
+SEARCH_CHUNK = 1 << 20
+
+SNAPSHOT_FILES = os.environ.get('CATALOG_SNAPSHOTS', '1') != '0'
+SNAPSHOT_DIR = os.environ.get('CATALOG_SNAPSHOT_DIR')
+
+# Snapshot files kept per directory, and how long a worker waits for another
+# one that is already writing the current version (a lock older than
+# BUILD_LOCK_TIMEOUT is treated as abandoned)
+KEEP_SNAPSHOT_FILES = 3
+BUILD_WAIT = 5.0
+BUILD_LOCK_TIMEOUT = 60.0
+
+# Columns in courses-table order, as SELECT * returns them
+COLUMNS = ('course_id', 'course_name', 'description', 'category', 'duration_hours', 'difficulty_level',
+           'average_rating', 'total_enrollments', 'created_date')
+
+def ensure_data_versions(conn, tables=VERSIONED_TABLES):
+    """Create the per-table version counters and the triggers that bump them
+
+    The 'instance' row is a random id telling apart databases whose counters
+    happen to match (e.g. a regenerated file), so their snapshot files differ.
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS data_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    conn.execute("INSERT OR IGNORE INTO data_versions (name, version) VALUES ('instance', random() & 281474976710655)")
+    for table in tables:
+        conn.execute('INSERT OR IGNORE INTO data_versions (name, version) VALUES (?, 0)', (table,))
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.lower()}_version
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE data_versions SET version = version + 1 WHERE name = '{table}';
+                END
+            ''')
+
+# Counters behind HTTP validators (http_cache.py), with a changed_at time.
+# Table-wide: (table, events that change what the API shows)
+TABLE_VERSIONS = (
+    ('skills', ('INSERT', 'UPDATE', 'DELETE')),
+    ('students', ('UPDATE OF name, department', 'DELETE')),
+)
+
+# Per-entity counters: a write to a row bumps '<prefix><key column>'
+ENTITY_VERSIONS = (
+    ('courses', 'course:', 'course_id'),
+    ('course_skills', 'course:', 'course_id'),
+    ('feedback', 'feedback:', 'course_id'),
+)
+
+# Per-department cohort aggregates (cached cohort signals, see cohort.py)
+COHORT_VERSIONS = (
+    ('cohort_course_stats', 'cohort:', 'department'),
+)
+
+_NOW = "(julianday('now') - 2440587.5) * 86400.0"
+
+def ensure_entity_versions(conn, tables=TABLE_VERSIONS, entities=ENTITY_VERSIONS):
+    """Add changed_at to data_versions plus the table and per-entity counters behind HTTP ETags"""
+    if not any(row[1] == 'changed_at' for row in conn.execute('PRAGMA table_info(data_versions)')):
+        conn.execute('ALTER TABLE data_versions ADD COLUMN changed_at REAL')
+    for table, events in tables:
+        conn.execute(f'INSERT OR IGNORE INTO data_versions (name, version, changed_at) VALUES (?, 0, {_NOW})', (table,))
+        for event in events:
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.split()[0].lower()}_version
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE data_versions SET version = version + 1, changed_at = {_NOW} WHERE name = '{table}';
+                END
+            ''')
+    for table, prefix, column in entities:
+        for event, row in (('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')):
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.lower()}_entity_version
+                AFTER {event} ON {table}
+                BEGIN
+                    INSERT INTO data_versions (name, version, changed_at) VALUES ('{prefix}' || {row}.{column}, 1, {_NOW})
+                    ON CONFLICT(name) DO UPDATE SET version = version + 1, changed_at = excluded.changed_at;
+                END
+            ''')
+
+def ensure_cohort_versions(conn):
+    """Per-department counters for cohort_course_stats, with a row for every department that has stats
+
+    cohort.py only caches a department's signal while its row exists, so
+    databases without these triggers are never served stale signals.
+    """
+    ensure_data_versions(conn, ())
+    ensure_entity_versions(conn, tables=(), entities=COHORT_VERSIONS)
+    conn.execute(f'''
+        INSERT OR IGNORE INTO data_versions (name, version, changed_at)
+        SELECT DISTINCT 'cohort:' || department, 0, {_NOW} FROM cohort_course_stats
+    ''')
+
+def read_versions(conn, names):
+    """(version per name, latest changed_at or None); names without a row are at version 0"""
+    rows = {row[0]: (row[1], row[2]) for row in conn.execute(f'''
+        SELECT name, version, changed_at FROM data_versions WHERE name IN ({','.join('?' * len(names))})
+    ''', names)}
+    changed = [rows[name][1] for name in names if name in rows and rows[name][1] is not None]
+    return tuple(rows.get(name, (0, None))[0] for name in names), max(changed) if changed else None
+
+def catalog_version(conn):
+    """Version tuple of the catalog tables, or None if the database has no counters"""
+    names = ('instance',) + VERSIONED_TABLES
+    try:
+        rows = conn.execute(f'''
+            SELECT name, version FROM data_versions WHERE name IN ({','.join('?' * len(names))})
+            ORDER BY name
+        ''', names).fetchall()
+    except Exception:
+        return None
+    return tuple(row[1] for row in rows) or None
+
+def _frozen(array):
+    array.flags.writeable = False
+    return array
+
+def _nullable(values):
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+def build_columns(rows, skill_pairs=()):
+    """Snapshot columns from courses rows (COLUMNS order) and course skill pairs"""
+    rows = sorted(rows, key=lambda r: r[0])
+    size = len(rows)
+    course_ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=size)
+
+    # Each distinct category string is stored once
+    categories = {}
+    codes = [categories.setdefault(r[3], len(categories)) for r in rows]
+
+    columns = {
+        'course_ids': course_ids,
+        'names': np.array([r[1] for r in rows], dtype=object),
+        'descriptions': np.array([r[2] for r in rows], dtype=object),
+        'durations': _nullable(r[4] for r in rows),
+        'ratings': _nullable(r[6] for r in rows),
+        'enrollments': _nullable(r[7] for r in rows),
+        'created': np.array([r[8] for r in rows], dtype=object),
+        'category_names': list(categories),
+        'category_codes': np.array(codes, dtype=np.int32),
+        'difficulty_codes': np.fromiter((_DIFFICULTY_CODES.get(r[5], 0) for r in rows), dtype=np.int8, count=size),
+        # Lowered "name\ndescription" as UTF-8 bytes, scanned by search_mask
+        'search_text': StringColumn(*encode_strings([f"{r[1] or ''}\n{r[2] or ''}".lower() for r in rows])),
+    }
+
+    # Skill incidence: (row position, skill_id, required level code)
+    position = np.searchsorted(course_ids, np.array([p[0] for p in skill_pairs], dtype=np.int64))
+    known = [i for i, p in enumerate(skill_pairs) if position[i] < size and course_ids[position[i]] == p[0]]
+    columns['skill_rows'] = position[known].astype(np.int64)
+    columns['skill_ids'] = np.array([skill_pairs[i][1] for i in known], dtype=np.int64)
+    columns['skill_levels'] = np.array([_DIFFICULTY_CODES.get(skill_pairs[i][2], 0) if len(skill_pairs[i]) > 2 else 0
+                                        for i in known], dtype=np.int8)
+
+    # Listing order: rating then enrollments, highest first, NULLs last (as SQLite sorts them)
+    columns['rating_order'] = np.lexsort((-np.nan_to_num(columns['enrollments'], nan=-np.inf),
+                                          -np.nan_to_num(columns['ratings'], nan=-np.inf)))
+    return columns
+
+class CatalogSnapshot:
+    """Read-only column arrays for every course, ordered by course_id
+
+    Nullable numbers are float64 with NaN for NULL; strings are object
+    arrays (or StringColumns over a mapped file; the lowered search text
+    is always one), with category and difficulty stored as codes into
+    small tuples. columns holds every array so the snapshot can be
+    written to and mapped from a file.
+    """
+
+    def __init__(self, columns, version=None, path=None, built_at=None):
+        self.columns = columns
+        self.version = version
+        self.path = path
+        self.loaded_at = time.monotonic()
+        # Wall-clock time the data was read from SQLite (Last-Modified of course listings)
+        self.built_at = built_at or time.time()
+        for name, column in columns.items():
+            if isinstance(column, np.ndarray):
+                _frozen(column)
+        self.course_ids = columns['course_ids']
+        self.size = self.course_ids.size
+        self.names = columns['names']
+        self.descriptions = columns['descriptions']
+        self.durations = columns['durations']
+        self.ratings = columns['ratings']
+        self.enrollments = columns['enrollments']
+        self.created = columns['created']
+        self.category_names = tuple(columns['category_names'])
+        self.category_codes = columns['category_codes']
+        self.difficulty_codes = columns['difficulty_codes']
+        self.skill_rows = columns['skill_rows']
+        self.skill_ids = columns['skill_ids']
+        self.skill_levels = columns['skill_levels']
+        self.rating_order = columns['rating_order']
+        self.search_text = columns['search_text']
+        self._derived = {}
+        self._lock = threading.Lock()
+
+    # ---- rows ----
+
+    def row(self, pos):
+        """One course as a dict with the courses-table columns"""
+        duration, rating, enrollments = self.durations[pos], self.ratings[pos], self.enrollments[pos]
+        return {
+            'course_id': int(self.course_ids[pos]),
+            'course_name': self.names[pos],
+            'description': self.descriptions[pos],
+            'category': self.category_names[self.category_codes[pos]],
+            'duration_hours': None if np.isnan(duration) else int(duration),
+            'difficulty_level': DIFFICULTIES[self.difficulty_codes[pos]],
+            'average_rating': None if np.isnan(rating) else float(rating),
+            'total_enrollments': None if np.isnan(enrollments) else int(enrollments),
+            'created_date': self.created[pos],
+        }
+
+    def rows(self, positions):
+        return [self.row(pos) for pos in positions]
+
+    def column(self, field, positions):
+        """Values of one courses-table column at positions, as a list of plain Python values"""
+        positions = np.asarray(positions, dtype=np.int64)
+        if field == 'course_id':
+            return self.course_ids[positions].tolist()
+        if field == 'category':
+            return [self.category_names[code] for code in self.category_codes[positions].tolist()]
+        if field == 'difficulty_level':
+            return [DIFFICULTIES[code] for code in self.difficulty_codes[positions].tolist()]
+        numbers = {'duration_hours': (self.durations, int), 'average_rating': (self.ratings, float),
+                   'total_enrollments': (self.enrollments, int)}
+        if field in numbers:
+            array, kind = numbers[field]
+            values = array[positions]
+            return [None if value != value else kind(value) for value in values.tolist()]
+        strings = {'course_name': self.names, 'description': self.descriptions, 'created_date': self.created}
+        column = strings[field]
+        return [column[pos] for pos in positions.tolist()]
+
+    def position_of(self, course_id):
+        """Row position of a course id, or None"""
+        pos = int(np.searchsorted(self.course_ids, course_id))
+        return pos if pos < self.size and self.course_ids[pos] == course_id else None
+
+    # ---- vectorized filters ----
+
+    def category_mask(self, categories):
+        codes = [i for i, name in enumerate(self.category_names) if name in set(categories)]
+        return np.isin(self.category_codes, codes)
+
+    def difficulty_mask(self, difficulty):
+        return self.difficulty_codes == _DIFFICULTY_CODES.get(difficulty, -1)
+
+    def search_mask(self, term):
+        """Case-insensitive substring match on name or description (like SQL LIKE '%term%')
+
+        Compares the lowered UTF-8 search text (the mapped file's pages when
+        there is one) with the term's bytes, SEARCH_CHUNK bytes at a time.
+        """
+        if not term:
+            return np.ones(self.size, dtype=bool)
+        mask = np.zeros(self.size, dtype=bool)
+        needle = np.frombuffer(term.lower().encode('utf-8'), dtype=np.uint8)
+        offsets, blob = self.search_text.offsets, self.search_text.blob
+        last = blob.size - needle.size + 1
+        found = np.empty(min(SEARCH_CHUNK, max(last, 0)), dtype=bool)
+        equal = np.empty_like(found)
+        for start in range(0, max(last, 0), SEARCH_CHUNK):
+            count = min(SEARCH_CHUNK, last - start)
+            hit, same = found[:count], equal[:count]
+            np.equal(blob[start:start + count], needle[0], out=hit)
+            for k in range(1, needle.size):
+                hit &= np.equal(blob[start + k:start + k + count], needle[k], out=same)
+            starts = np.flatnonzero(hit) + start
+            rows = np.searchsorted(offsets, starts, side='right') - 1
+            # A match running into the next row's text does not count
+            mask[rows[starts + needle.size <= offsets[rows + 1]]] = True
+        return mask
+
+    def select(self, category=None, difficulty=None, search=None, min_rating=None):
+        """Row positions matching every given filter, in listing (rating) order"""
+        mask = np.ones(self.size, dtype=bool)
+        if category:
+            mask &= self.category_mask([category])
+        if difficulty:
+            mask &= self.difficulty_mask(difficulty)
+        if search:
+            mask &= self.search_mask(search)
+        if min_rating:
+            mask &= np.nan_to_num(self.ratings) >= min_rating
+        return self.rating_order[mask[self.rating_order]]
+
+    def categories_in(self, positions=None):
+        """Distinct category names among positions (all rows by default)"""
+        codes = self.category_codes if positions is None else self.category_codes[positions]
+        return [self.category_names[code] for code in np.unique(codes).tolist()]
+
+    def difficulties_in(self, positions=None):
+        codes = self.difficulty_codes if positions is None else self.difficulty_codes[positions]
+        return [DIFFICULTIES[code] for code in np.unique(codes).tolist() if code]
+
+    # ---- structures built from this snapshot ----
+
+    def derived(self, key, factory):
+        """factory() computed once per snapshot and shared (e.g. ranking candidates)"""
+        value = self._derived.get(key)
+        if value is None:
+            with self._lock:
+                value = self._derived.get(key)
+                if value is None:
+                    value = self._derived[key] = factory()
+        return value
+
+def load_catalog(conn, version=None):
+    """Read courses and course skills into a new CatalogSnapshot"""
+    rows = conn.execute(f'SELECT {", ".join(COLUMNS)} FROM courses ORDER BY course_id').fetchall()
+    if any(row[1] == 'required_level' for row in conn.execute('PRAGMA table_info(course_skills)')):
+        pairs = conn.execute('SELECT course_id, skill_id, required_level FROM course_skills').fetchall()
+    else:
+        pairs = conn.execute('SELECT course_id, skill_id FROM course_skills').fetchall()
+    return CatalogSnapshot(build_columns(rows, [tuple(p) for p in pairs]), version)
+
+# ---- snapshot files ----
+
+def snapshot_directory(conn):
+    """Directory for this database's snapshot files, or None for in-memory databases or when disabled"""
+    if not SNAPSHOT_FILES:
+        return None
+    if SNAPSHOT_DIR:
+        return SNAPSHOT_DIR
+    for row in conn.execute('PRAGMA database_list'):
+        if row[1] == 'main':
+            return os.path.join(os.path.dirname(row[2]), 'catalog_snapshots') if row[2] else None
+    return None
+
+def snapshot_path(directory, version):
+    return os.path.join(directory, f"catalog-{'-'.join(str(v) for v in version)}.snap")
+
+def open_catalog(path, version):
+    """Map a published snapshot file, or None if it is missing or not for this version"""
+    try:
+        meta, columns = open_snapshot(path)
+    except (OSError, ValueError):
+        return None
+    if tuple(meta.get('version') or ()) != tuple(version):
+        return None
+    if 'search_text' not in columns:
+        # Written before the search column existed: rebuild it
+        return None
+    return CatalogSnapshot(columns, version, path, meta.get('written_at'))
+
+def publish_catalog(directory, snapshot):
+    """Write a snapshot file for snapshot.version and prune old ones"""
+    os.makedirs(directory, exist_ok=True)
+    path = snapshot_path(directory, snapshot.version)
+    write_snapshot(path, snapshot.columns, {'version': list(snapshot.version), 'written_at': snapshot.built_at})
+    prune_snapshot_files(directory, 'catalog-*.snap')
+    return path
+
+def prune_snapshot_files(directory, pattern):
+    """Remove all but the KEEP_SNAPSHOT_FILES newest files matching pattern"""
+    published = sorted(glob.glob(os.path.join(directory, pattern)), key=os.path.getmtime, reverse=True)
+    for old in published[KEEP_SNAPSHOT_FILES:]:
+        try:
+            # Workers still mapping an old file keep their pages until they swap
+            os.remove(old)
+        except OSError:
+            pass
+
+def take_build_lock(lock_path):
+    """Create lock_path exclusively; False while another worker holds it (stale locks are taken over)"""
+    try:
+        os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        return True
+    except FileExistsError:
+        try:
+            if time.time() - os.path.getmtime(lock_path) > BUILD_LOCK_TIMEOUT:
+                os.remove(lock_path)
+                return take_build_lock(lock_path)
+        except OSError:
+            pass
+        return False
+
+def shared_catalog(conn, version):
+    """Snapshot for version, mapped from its file when another worker already wrote it
+
+    Otherwise this worker builds it from SQLite and publishes it. While another
+    worker holds the build lock, wait up to BUILD_WAIT for its file before
+    building an in-memory copy.
+    """
+    directory = snapshot_directory(conn) if version else None
+    if directory is None:
+        return load_catalog(conn, version)
+    path = snapshot_path(directory, version)
+    mapped = open_catalog(path, version)
+    if mapped is not None:
+        return mapped
+
+    os.makedirs(directory, exist_ok=True)
+    lock_path = f"{path}.lock"
+    deadline = time.monotonic() + BUILD_WAIT
+    while not take_build_lock(lock_path):
+        if time.monotonic() > deadline:
+            return load_catalog(conn, version)
+        time.sleep(0.05)
+        mapped = open_catalog(path, version)
+        if mapped is not None:
+            return mapped
+    try:
+        mapped = open_catalog(path, version)
+        if mapped is not None:
+            return mapped
+        snapshot = load_catalog(conn, version)
+        try:
+            publish_catalog(directory, snapshot)
+        except OSError:
+            return snapshot
+    finally:
+        os.remove(lock_path)
+    return open_catalog(path, version) or snapshot
+
+class CatalogStore:
+    """Holds the current CatalogSnapshot and swaps in a new one when the data version changes"""
+
+    def __init__(self, check_interval=CHECK_INTERVAL, min_rebuild_interval=MIN_REBUILD_INTERVAL):
+        self.check_interval = check_interval
+        self.min_rebuild_interval = min_rebuild_interval
+        self.rebuilds = 0
+        self._snapshot = None
+        self._checked_at = 0.0
+        self._build_lock = threading.Lock()
+
+    def get(self, conn):
+        snapshot = self._snapshot
+        now = time.monotonic()
+        if snapshot is not None and now - self._checked_at < self.check_interval:
+            CACHE_LOOKUPS.inc(('course_catalog', 'hit'))
+            return snapshot
+
+        version = catalog_version(conn)
+        if snapshot is not None:
+            age = now - snapshot.loaded_at
+            current = version == snapshot.version and (version is not None or age < FALLBACK_MAX_AGE)
+            # Under continuous writes keep serving the last snapshot for a short while,
+            # and never make a reader wait for a rebuild another thread is doing
+            if current or age < self.min_rebuild_interval or not self._build_lock.acquire(blocking=False):
+                self._checked_at = now
+                CACHE_LOOKUPS.inc(('course_catalog', 'hit'))
+                return snapshot
+        else:
+            self._build_lock.acquire()
+
+        try:
+            latest = self._snapshot
+            if latest is not snapshot and latest.version == version:
+                CACHE_LOOKUPS.inc(('course_catalog', 'hit'))
+                return latest
+            CACHE_LOOKUPS.inc(('course_catalog', 'miss'))
+            latest = shared_catalog(conn, version)
+            self._snapshot = latest
+            self._checked_at = time.monotonic()
+            self.rebuilds += 1
+            return latest
+        finally:
+            self._build_lock.release()
+
+    def invalidate(self):
+        """Re-read the data version on the next get() (after a local write)"""
+        self._checked_at = 0.0
+
+catalog_store = CatalogStore()
+
+# Writes in another worker re-check the data version here without waiting for CHECK_INTERVAL
+shared_cache.subscribe('catalog', lambda prefix: catalog_store.invalidate())
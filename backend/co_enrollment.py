@@ -0,0 +1,306 @@
+# =====================================================
+# AI COURSE RECOMMENDATION SYSTEM - CO-ENROLLMENT MATRIX
+# =====================================================
+# Course x course co-enrollment counts, rebuilt in the background
+# Author: Student
+# Date: October 2025
+# Description: Counts, for every pair of courses, the students
+#              enrolled in both, as a read-only CSR snapshot of its
+#              own; it is rebuilt on a background thread at most every
+#              CO_ENROLLMENT_REFRESH seconds while enrollments change,
+#              reading enrollments in student order and expanding a
+#              bounded number of pairs at a time
+# =====================================================
+#
+# The matrix is versioned by the 'enrollments' counter in data_versions
+# (migration 7), not by the catalog, so enrolling never rebuilds the
+# course catalog. Requests only ever read the matrix they are handed:
+# CoEnrollmentStore.get() returns the current one (None until the first
+# build finishes) and at most starts a rebuild thread. Like catalog
+# snapshots, each version is published as
+# catalog_snapshots/co-enrollment-<version>.snap and mapped by every worker.
+#
+# Settings (environment):
+#   CO_ENROLLMENT_REFRESH=300       seconds between rebuilds while enrollments keep changing
+#   CO_ENROLLMENT_PAIR_CHUNK=1000000 most (course, course) pairs expanded at once while counting
+
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+
+from catalog import (BUILD_LOCK_TIMEOUT, CHECK_INTERVAL, prune_snapshot_files, read_versions,
+                     snapshot_directory, take_build_lock)
+from metrics import CACHE_LOOKUPS
+from snapshot_file import open_snapshot, write_snapshot
+from sql_metrics import instrumented_connect
+
+logger = logging.getLogger('co_enrollment')
+
+REFRESH = float(os.environ.get('CO_ENROLLMENT_REFRESH', '300'))
+PAIR_CHUNK = int(os.environ.get('CO_ENROLLMENT_PAIR_CHUNK', '1000000'))
+
+# Enrollment rows fetched from SQLite per batch
+FETCH_BATCH = 50000
+
+def co_enrollment_version(conn):
+    """Version tuple of the enrollments table, or None if the database has no counters"""
+    try:
+        return read_versions(conn, ('instance', 'enrollments'))[0]
+    except Exception:
+        return None
+
+def _pair_keys(student_ids, positions, size):
+    """a * size + b for every ordered pair of different course rows a, b within a student
+
+    Rows must be sorted by student.
+    """
+    starts = np.flatnonzero(np.r_[True, student_ids[1:] != student_ids[:-1]])
+    sizes = np.diff(np.r_[starts, student_ids.size])
+    per_entry = np.repeat(sizes, sizes)
+    left = np.repeat(np.arange(positions.size), per_entry)
+    block_start = np.repeat(np.cumsum(per_entry) - per_entry, per_entry)
+    right = np.repeat(np.repeat(starts, sizes), per_entry) + (np.arange(left.size) - block_start)
+    a, b = positions[left], positions[right]
+    keep = a != b
+    return a[keep] * size + b[keep]
+
+class PairCounter:
+    """Sums co-enrollment pairs over batches of enrollments, holding about PAIR_CHUNK pairs at a time"""
+
+    def __init__(self, course_ids, pair_chunk=PAIR_CHUNK):
+        self.course_ids = np.asarray(course_ids, dtype=np.int64)
+        self.pair_chunk = pair_chunk
+        self._keys = np.zeros(0, dtype=np.int64)
+        self._counts = np.zeros(0, dtype=np.int64)
+        self._pending = []
+
+    def add(self, student_ids, course_ids):
+        """Count the pairs of a batch holding every enrollment of its students, sorted by student"""
+        size = self.course_ids.size
+        student_ids = np.asarray(student_ids, dtype=np.int64)
+        course_ids = np.asarray(course_ids, dtype=np.int64)
+        # Enrollments of courses outside the catalog are dropped
+        positions = np.searchsorted(self.course_ids, course_ids)
+        known = positions < size
+        known[known] = self.course_ids[positions[known]] == course_ids[known]
+        student_ids, positions = student_ids[known], positions[known]
+        if not positions.size:
+            return
+
+        # Split between students so that each slice expands about pair_chunk pairs
+        starts = np.flatnonzero(np.r_[True, student_ids[1:] != student_ids[:-1]])
+        sizes = np.diff(np.r_[starts, student_ids.size])
+        work = np.cumsum(sizes * sizes)
+        cuts = np.searchsorted(work, np.arange(self.pair_chunk, work[-1], self.pair_chunk), side='right')
+        bounds = np.unique(np.r_[0, starts[cuts[cuts < starts.size]], student_ids.size])
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            keys, counts = np.unique(_pair_keys(student_ids[lo:hi], positions[lo:hi], size), return_counts=True)
+            self._pending.append((keys, counts))
+            if sum(k.size for k, _ in self._pending) > self.pair_chunk:
+                self._merge()
+
+    def _merge(self):
+        keys = np.concatenate([self._keys] + [k for k, _ in self._pending])
+        counts = np.concatenate([self._counts] + [c for _, c in self._pending])
+        self._keys, inverse = np.unique(keys, return_inverse=True)
+        self._counts = np.bincount(inverse, weights=counts, minlength=self._keys.size).astype(np.int64)
+        self._pending = []
+
+    def columns(self):
+        """CSR columns: course_ids, co_indptr, co_indices, co_counts"""
+        self._merge()
+        size = self.course_ids.size
+        indptr = np.zeros(size + 1, dtype=np.int64)
+        if size:
+            np.cumsum(np.bincount(self._keys // size, minlength=size), out=indptr[1:])
+        return {'course_ids': self.course_ids, 'co_indptr': indptr,
+                'co_indices': (self._keys % max(size, 1)).astype(np.int32),
+                'co_counts': self._counts.astype(np.int32)}
+
+class CoEnrollment:
+    """Read-only co-enrollment counts in CSR form over course_ids (sorted)
+
+    Entry (a, b) counts students enrolled in both courses, a != b.
+    """
+
+    def __init__(self, columns, version=None, path=None, built_at=None):
+        self.columns = columns
+        self.version = tuple(version) if version is not None else None
+        self.path = path
+        # Wall-clock time the enrollments were read from SQLite
+        self.built_at = built_at or time.time()
+        for column in columns.values():
+            if column.flags.writeable:
+                column.flags.writeable = False
+        self.course_ids = columns['course_ids']
+        self.indptr = columns['co_indptr']
+        self.indices = columns['co_indices']
+        self.counts = columns['co_counts']
+
+    def counts_for(self, course_ids, target_ids):
+        """Co-enrollment of each course in target_ids (sorted) with the given courses (repeats count again)"""
+        totals = np.zeros(self.course_ids.size, dtype=np.float64)
+        rows = np.searchsorted(self.course_ids, course_ids).tolist()
+        for row, course_id in zip(rows, course_ids):
+            if row < self.course_ids.size and self.course_ids[row] == course_id:
+                start, stop = self.indptr[row], self.indptr[row + 1]
+                totals[self.indices[start:stop]] += self.counts[start:stop]
+        result = np.zeros(len(target_ids), dtype=np.float64)
+        where = np.searchsorted(self.course_ids, target_ids)
+        known = where < self.course_ids.size
+        known[known] = self.course_ids[where[known]] == np.asarray(target_ids)[known]
+        result[known] = totals[where[known]]
+        return result
+
+def build_co_enrollment(conn, version=None, pair_chunk=PAIR_CHUNK):
+    """Read enrollments in student order, one batch at a time, into a new CoEnrollment"""
+    course_ids = [row[0] for row in conn.execute('SELECT course_id FROM courses ORDER BY course_id')]
+    counter = PairCounter(course_ids, pair_chunk)
+    cursor = conn.execute('SELECT student_id, course_id FROM enrollments ORDER BY student_id')
+    carry = np.zeros((0, 2), dtype=np.int64)
+    while True:
+        rows = cursor.fetchmany(FETCH_BATCH)
+        block = np.concatenate([carry, np.array(rows, dtype=np.int64).reshape(-1, 2)])
+        if rows:
+            # The last student's enrollments may continue in the next batch
+            last = np.searchsorted(block[:, 0], block[-1, 0])
+            block, carry = block[:last], block[last:]
+        counter.add(block[:, 0], block[:, 1])
+        if not rows:
+            break
+    return CoEnrollment(counter.columns(), version)
+
+# ---- snapshot files ----
+
+def co_enrollment_path(directory, version):
+    return os.path.join(directory, f"co-enrollment-{'-'.join(str(v) for v in version)}.snap")
+
+def open_co_enrollment(path, version):
+    """Map a published matrix file, or None if it is missing or not for this version"""
+    try:
+        meta, columns = open_snapshot(path)
+    except (OSError, ValueError):
+        return None
+    if tuple(meta.get('version') or ()) != tuple(version):
+        return None
+    return CoEnrollment(columns, version, path, meta.get('written_at'))
+
+def shared_co_enrollment(conn, version):
+    """Matrix for version, mapped from its file when another worker already wrote it
+
+    Otherwise this thread builds and publishes it; while another worker holds
+    the build lock it waits for that file (this only runs off the request path).
+    """
+    directory = snapshot_directory(conn) if version else None
+    if directory is None:
+        return build_co_enrollment(conn, version)
+    path = co_enrollment_path(directory, version)
+    os.makedirs(directory, exist_ok=True)
+    lock_path = f"{path}.lock"
+    deadline = time.monotonic() + BUILD_LOCK_TIMEOUT
+    while not take_build_lock(lock_path):
+        mapped = open_co_enrollment(path, version)
+        if mapped is not None:
+            return mapped
+        if time.monotonic() > deadline:
+            return build_co_enrollment(conn, version)
+        time.sleep(0.5)
+    try:
+        mapped = open_co_enrollment(path, version)
+        if mapped is not None:
+            return mapped
+        matrix = build_co_enrollment(conn, version)
+        try:
+            write_snapshot(path, matrix.columns, {'version': list(version), 'written_at': matrix.built_at})
+            prune_snapshot_files(directory, 'co-enrollment-*.snap')
+        except OSError:
+            return matrix
+    finally:
+        os.remove(lock_path)
+    return open_co_enrollment(path, version) or matrix
+
+def _database_file(conn):
+    for row in conn.execute('PRAGMA database_list'):
+        if row[1] == 'main':
+            return row[2] or None
+    return None
+
+class CoEnrollmentStore:
+    """Holds the current CoEnrollment and rebuilds it on a background thread
+
+    get() never builds on the caller's thread: it returns the current matrix
+    and, once the enrollments version has moved on and the matrix is at
+    least refresh seconds old, starts one rebuild from its own connection.
+    """
+
+    def __init__(self, refresh=REFRESH, check_interval=CHECK_INTERVAL):
+        self.refresh = refresh
+        self.check_interval = check_interval
+        self.rebuilds = 0
+        self._matrix = None
+        self._checked_at = 0.0
+        self._build_lock = threading.Lock()
+        self._thread = None
+
+    def get(self, conn):
+        """Current matrix, or None until the first build has finished"""
+        matrix = self._matrix
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            version = co_enrollment_version(conn)
+            if matrix is None or version is None or version != matrix.version:
+                directory = snapshot_directory(conn) if version else None
+                mapped = open_co_enrollment(co_enrollment_path(directory, version), version) if directory else None
+                if mapped is not None:
+                    self._matrix = matrix = mapped
+                elif matrix is None or time.time() - matrix.built_at >= self.refresh:
+                    self._start(conn)
+        CACHE_LOOKUPS.inc(('co_enrollment', 'hit' if matrix is not None else 'miss'))
+        return matrix
+
+    def ensure_loaded(self, conn):
+        """Current matrix, waiting for (or doing) the first build; for warm-up threads only"""
+        matrix = self.get(conn)
+        if matrix is None:
+            thread = self._thread
+            if thread is not None:
+                thread.join()
+            elif self._build_lock.acquire(blocking=False):
+                try:
+                    self._install(shared_co_enrollment(conn, co_enrollment_version(conn)))
+                finally:
+                    self._build_lock.release()
+            matrix = self._matrix
+        return matrix
+
+    def _install(self, matrix):
+        self._matrix = matrix
+        self._checked_at = time.monotonic()
+        self.rebuilds += 1
+
+    def _start(self, conn):
+        path = _database_file(conn)
+        if path is None or not self._build_lock.acquire(blocking=False):
+            return
+        self._thread = threading.Thread(target=self._rebuild, args=(path,), name='co-enrollment-rebuild',
+                                        daemon=True)
+        self._thread.start()
+
+    def _rebuild(self, path):
+        try:
+            conn = instrumented_connect(path, check_same_thread=False)
+            try:
+                self._install(shared_co_enrollment(conn, co_enrollment_version(conn)))
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.warning(f"Co-enrollment rebuild failed: {e}")
+        finally:
+            self._thread = None
+            self._build_lock.release()
+
+co_enrollment_store = CoEnrollmentStore()
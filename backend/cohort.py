@@ -0,0 +1,223 @@
+# =====================================================
+# AI COURSE RECOMMENDATION SYSTEM - COHORT POPULARITY
+# =====================================================
+# "Popular with students like you" from department/year
+# Author: Student
+# Date: October 2025
+# Description: Per-(department, year, course) enrollment and
+#              rating aggregates kept up to date on writes and
+#              read by primary-key range instead of GROUP BY
+# =====================================================
+
+import re
+import sqlite3
+import threading
+
+import numpy as np
+
+from metrics import CACHE_LOOKUPS
+
+# Smoothing prior for cohort ratings: PRIOR_WEIGHT reviews of PRIOR_RATING
+PRIOR_RATING = 3.5
+PRIOR_WEIGHT = 2.0
+
+# Share of the cohort signal given to enrollments (the rest is rating)
+POPULARITY_SHARE = 0.7
+
+def has_cohort_stats(conn):
+    """Check whether the cohort aggregate table exists"""
+    return conn.execute('''
+        SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'cohort_course_stats'
+    ''').fetchone() is not None
+
+def ensure_cohort_tables(conn):
+    """Create the cohort aggregate table (backfilling from history the first time)"""
+    exists = has_cohort_stats(conn)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS cohort_course_stats (
+            department TEXT NOT NULL,
+            year TEXT NOT NULL,
+            course_id INTEGER NOT NULL,
+            enrollments INTEGER DEFAULT 0,
+            rating_sum REAL DEFAULT 0,
+            rating_count INTEGER DEFAULT 0,
+            PRIMARY KEY (department, year, course_id)
+        ) WITHOUT ROWID
+    ''')
+    if not exists:
+        rebuild_cohort_stats(conn)
+
+def rebuild_cohort_stats(conn):
+    """Recompute every aggregate from enrollments and feedback (maintenance only)"""
+    conn.execute('DELETE FROM cohort_course_stats')
+    conn.execute('''
+        INSERT INTO cohort_course_stats (department, year, course_id, enrollments)
+        SELECT COALESCE(s.department, ''), COALESCE(s.year, ''), e.course_id, COUNT(*)
+        FROM enrollments e
+        JOIN students s ON s.student_id = e.student_id
+        GROUP BY 1, 2, 3
+    ''')
+    conn.execute('''
+        INSERT INTO cohort_course_stats (department, year, course_id, rating_sum, rating_count)
+        SELECT COALESCE(s.department, ''), COALESCE(s.year, ''), f.course_id, SUM(f.rating), COUNT(*)
+        FROM feedback f
+        JOIN students s ON s.student_id = f.student_id
+        GROUP BY 1, 2, 3
+        ON CONFLICT(department, year, course_id) DO UPDATE SET
+            rating_sum = excluded.rating_sum,
+            rating_count = excluded.rating_count
+    ''')
+
+def student_cohort(conn, student_id):
+    """(department, year) of a student, or None if the student does not exist"""
+    row = conn.execute('''
+        SELECT COALESCE(department, ''), COALESCE(year, '') FROM students WHERE student_id = ?
+    ''', (student_id,)).fetchone()
+    return (row[0], row[1]) if row else None
+
+def record_cohort_enrollment(conn, student_id, course_id):
+    """Count one enrollment towards the student's cohort"""
+    cohort = student_cohort(conn, student_id)
+    if cohort is None:
+        return
+    conn.execute('''
+        INSERT INTO cohort_course_stats (department, year, course_id, enrollments)
+        VALUES (?, ?, ?, 1)
+        ON CONFLICT(department, year, course_id) DO UPDATE SET enrollments = enrollments + 1
+    ''', (cohort[0], cohort[1], course_id))
+
+def record_cohort_feedback(conn, student_id, course_id, rating):
+    """Count one rating towards the student's cohort"""
+    cohort = student_cohort(conn, student_id)
+    if cohort is None:
+        return
+    conn.execute('''
+        INSERT INTO cohort_course_stats (department, year, course_id, rating_sum, rating_count)
+        VALUES (?, ?, ?, ?, 1)
+        ON CONFLICT(department, year, course_id) DO UPDATE SET
+            rating_sum = rating_sum + excluded.rating_sum,
+            rating_count = rating_count + 1
+    ''', (cohort[0], cohort[1], course_id, rating))
+
+def _year_number(year):
+    """Leading number of a year label such as '3rd Year' (None if there is none)"""
+    match = re.match(r'\s*(\d+)', str(year))
+    return int(match.group(1)) if match else None
+
+def _year_weight(year, other):
+    """Same year counts fully, other years 1 / (1 + distance), unparseable ones a quarter"""
+    if str(year) == str(other):
+        return 1.0
+    mine, theirs = _year_number(year), _year_number(other)
+    if mine is None or theirs is None:
+        return 0.25
+    return 1.0 / (1.0 + abs(mine - theirs))
+
+def _department_stats(conn, department, year, candidates):
+    """Year-weighted enrollments, rating sums and rating counts aligned to candidates"""
+    rows = conn.execute('''
+        SELECT year, course_id, enrollments, rating_sum, rating_count
+        FROM cohort_course_stats WHERE department = ?
+    ''', (department,)).fetchall()
+
+    enrollments = np.zeros(candidates.size)
+    rating_sum = np.zeros(candidates.size)
+    rating_count = np.zeros(candidates.size)
+    weights = {}
+    entries = []
+    for other, course_id, count, total, reviews in rows:
+        pos = candidates.position.get(course_id)
+        if pos is not None:
+            if other not in weights:
+                weights[other] = _year_weight(year, other)
+            entries.append((pos, weights[other], count, total, reviews))
+    if entries:
+        data = np.array(entries, dtype=np.float64)
+        positions = data[:, 0].astype(np.int64)
+        weight = data[:, 1]
+        enrollments = np.bincount(positions, weights=weight * data[:, 2], minlength=candidates.size)
+        rating_sum = np.bincount(positions, weights=weight * data[:, 3], minlength=candidates.size)
+        rating_count = np.bincount(positions, weights=weight * data[:, 4], minlength=candidates.size)
+    return enrollments, rating_sum, rating_count
+
+def _signal_for(conn, department, year, candidates):
+    try:
+        enrollments, rating_sum, rating_count = _department_stats(conn, department, year, candidates)
+    except sqlite3.OperationalError:
+        # No cohort_course_stats table in this database
+        return np.zeros(candidates.size)
+    top = enrollments.max() if enrollments.size else 0.0
+    if top <= 0:
+        return np.zeros(candidates.size)
+
+    popularity = np.log1p(enrollments) / np.log1p(top)
+    rating = (rating_sum + PRIOR_RATING * PRIOR_WEIGHT) / (rating_count + PRIOR_WEIGHT) / 5.0
+    return np.where(enrollments > 0, POPULARITY_SHARE * popularity + (1 - POPULARITY_SHARE) * rating, 0.0)
+
+def _department_version(conn, department):
+    """The 'cohort:<department>' counter (migration 10), or None when there is none to key on"""
+    try:
+        row = conn.execute('SELECT version FROM data_versions WHERE name = ?', (f"cohort:{department}",)).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+class CohortSignalCache:
+    """Read-only cohort signal per (department, year), reused until the department's stats change
+
+    Entries also remember the candidates they are aligned to, so a new
+    catalog snapshot recomputes them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._signals = {}
+
+    def get(self, conn, department, year, candidates):
+        version = _department_version(conn, department)
+        key = (department, year)
+        with self._lock:
+            entry = self._signals.get(key)
+        if version is not None and entry is not None and entry[0] is candidates and entry[1] == version:
+            CACHE_LOOKUPS.inc(('cohort_signal', 'hit'))
+            return entry[2]
+        CACHE_LOOKUPS.inc(('cohort_signal', 'miss'))
+
+        signal = _signal_for(conn, department, year, candidates)
+        signal.flags.writeable = False
+        if version is not None:
+            with self._lock:
+                self._signals[key] = (candidates, version, signal)
+        return signal
+
+    def clear(self):
+        with self._lock:
+            self._signals.clear()
+
+cohort_signal_cache = CohortSignalCache()
+
+def cohort_signal(conn, student_id, candidates):
+    """Cohort popularity in [0, 1] over ranking candidates (zeros if no cohort data)"""
+    cohort = student_cohort(conn, student_id)
+    if cohort is None:
+        return np.zeros(candidates.size)
+    return cohort_signal_cache.get(conn, cohort[0], cohort[1], candidates)
+
+def popular_with_cohort(conn, student_id, candidates, k=5, exclude_ids=(), mask=None):
+    """Courses most taken (and best rated) by the student's department and year"""
+    # ranking imports this module for the cohort signal
+    from ranking import top_k
+
+    signal = cohort_signal(conn, student_id, candidates)
+    eligible = signal > 0
+    if mask is not None:
+        eligible &= mask
+    if exclude_ids:
+        eligible &= ~candidates.mask_for(exclude_ids)
+
+    results = []
+    for pos in top_k(signal, k, eligible).tolist():
+        row = candidates.row(pos)
+        row['cohort_score'] = round(float(signal[pos]) * 100.0, 2)
+        results.append(row)
+    return results
@@ -0,0 +1,105 @@
+# =====================================================
+# AI COURSE RECOMMENDATION SYSTEM - COURSE CACHE
+# =====================================================
+# Course details with their required skills, many at a time
+# Author: Student
+# Date: October 2025
+# Description: Encoded course objects (courses row plus
+#              required_skills) kept in the shared cache per course
+#              version; misses for a whole batch are read with one
+#              query that aggregates skills with json_group_array
+# =====================================================
+#
+# Settings (environment):
+#   COURSE_CACHE_TTL=600            seconds an encoded course is kept (entries are
+#                                   keyed by version, so they are never stale)
+#   COURSE_BATCH_LIMIT=100          most ids one /api/courses/batch request may ask for
+
+import json
+import os
+
+from cache_backend import shared_cache
+from metrics import CACHE_LOOKUPS
+from serializers import Projection, RawJSON, encode_rows
+
+COURSE_CACHE_TTL = float(os.environ.get('COURSE_CACHE_TTL', '600'))
+COURSE_BATCH_LIMIT = int(os.environ.get('COURSE_BATCH_LIMIT', '100'))
+
+COURSE_FIELDS = Projection(
+    {name: name for name in ('course_id', 'course_name', 'description', 'category', 'duration_hours',
+                             'difficulty_level', 'average_rating', 'total_enrollments', 'created_date')})
+
+# A course's required skills as one JSON array, in the order the join returns them
+REQUIRED_SKILLS = '''
+    (SELECT json_group_array(json_object('skill_name', s.skill_name, 'category', s.category))
+     FROM course_skills cs
+     JOIN skills s ON s.skill_id = cs.skill_id
+     WHERE cs.course_id = c.course_id)
+'''
+
+def parse_ids(text, limit=None):
+    """Course ids from a comma separated ids= value, deduplicated in order
+
+    Raises ValueError for a missing, malformed or too long list.
+    """
+    limit = limit or COURSE_BATCH_LIMIT
+    try:
+        ids = tuple(dict.fromkeys(int(part) for part in (text or '').split(',') if part.strip()))
+    except ValueError:
+        raise ValueError('ids must be comma separated course ids')
+    if not ids:
+        raise ValueError('ids is required')
+    if len(ids) > limit:
+        raise ValueError(f"At most {limit} ids per request")
+    return ids
+
+def version_names(course_ids):
+    """data_versions rows a set of course details depends on (for catalog.read_versions)
+
+    The database's 'instance' id comes last, so a regenerated database whose
+    counters start over again never matches another one's entries or ETags.
+    """
+    return tuple(f"course:{course_id}" for course_id in course_ids) + ('skills', 'instance')
+
+class CourseCache:
+    """Encoded course detail objects keyed by course id, version and projected fields"""
+
+    def __init__(self, ttl=COURSE_CACHE_TTL):
+        self.ttl = ttl
+
+    def _key(self, course_id, version, skills_version, instance, fields):
+        return f"course:{course_id}:{instance}:{version}.{skills_version}:{','.join(fields)}"
+
+    def get_many(self, conn, course_ids, fields, versions):
+        """(course JSON objects in course_ids order, ids with no course)
+
+        versions are read_versions() values for version_names(course_ids).
+        Cached courses cost nothing; all the others are read with one query.
+        """
+        skills_version, instance = versions[-2:]
+        keys = dict(zip(course_ids, (self._key(course_id, version, skills_version, instance, fields)
+                                     for course_id, version in zip(course_ids, versions))))
+        found = shared_cache.get_many(list(keys.values()))
+        misses = [course_id for course_id, key in keys.items() if key not in found]
+        CACHE_LOOKUPS.inc(('course', 'hit'), len(course_ids) - len(misses))
+        CACHE_LOOKUPS.inc(('course', 'miss'), len(misses))
+
+        if misses:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(f'''
+                SELECT c.course_id, {COURSE_FIELDS.select(fields)}, {REQUIRED_SKILLS} AS required_skills
+                FROM courses c
+                WHERE c.course_id IN (SELECT value FROM json_each(?))
+            ''', (json.dumps(misses),))
+            rows = cursor.fetchall()
+            objects = encode_rows(fields + ('required_skills',),
+                                  (row[1:-1] + (RawJSON(row[-1]),) for row in rows))
+            loaded = {keys[row[0]]: text for row, text in zip(rows, objects)}
+            shared_cache.set_many(loaded, ttl=self.ttl)
+            found.update(loaded)
+
+        return ([found[key] for key in keys.values() if key in found],
+                [course_id for course_id, key in keys.items() if key not in found])
+
+course_cache = CourseCache()
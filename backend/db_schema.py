@@ -0,0 +1,142 @@
+# =====================================================
+# AI COURSE RECOMMENDATION SYSTEM - DATABASE SCHEMA
+# =====================================================
+# SQLite table definitions shared by the backend and tools
+# Author: Student
+# Date: October 2025
+# Description: Core tables plus the derived tables kept by
+#              the engines (closure, trending, cohort stats)
+# =====================================================
+
+from skill_gap import ensure_required_level_column
+from prerequisites import ensure_prerequisite_tables
+from trending import ensure_trending_tables
+from cohort import ensure_cohort_tables
+
+# Lookup indexes for the per-student and per-course queries (schema.sql
+# only indexes the filter and sort columns)
+LOOKUP_INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_enrollments_student ON enrollments(student_id, course_id)',
+    'CREATE INDEX IF NOT EXISTS idx_enrollments_course ON enrollments(course_id)',
+    'CREATE INDEX IF NOT EXISTS idx_feedback_course ON feedback(course_id)',
+    'CREATE INDEX IF NOT EXISTS idx_feedback_student ON feedback(student_id, course_id)',
+    'CREATE INDEX IF NOT EXISTS idx_course_skills_skill ON course_skills(skill_id)',
+]
+
+# Per-owner listings in date order (a course's feedback, a student's
+# enrollments) read straight off these, so streamed rows need no sort first
+LISTING_INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_feedback_course_date ON feedback(course_id, feedback_date)',
+    'CREATE INDEX IF NOT EXISTS idx_enrollments_student_date ON enrollments(student_id, enrollment_date)',
+]
+
+def create_core_tables(conn):
+    """Create the students, courses, skills, enrollments and feedback tables"""
+    cursor = conn.cursor()
+    
+    # Create tables
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS students (
+            student_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            phone TEXT,
+            department TEXT,
+            year TEXT,
+            registration_date DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS courses (
+            course_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            course_name TEXT NOT NULL,
+            description TEXT,
+            category TEXT,
+            duration_hours INTEGER,
+            difficulty_level TEXT CHECK(difficulty_level IN ('Beginner', 'Intermediate', 'Advanced')),
+            average_rating REAL DEFAULT 0.0,
+            total_enrollments INTEGER DEFAULT 0,
+            created_date DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS skills (
+            skill_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            skill_name TEXT UNIQUE NOT NULL,
+            category TEXT
+        )
+    ''')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS student_skills (
+            student_id INTEGER,
+            skill_id INTEGER,
+            proficiency_level TEXT CHECK(proficiency_level IN ('Beginner', 'Intermediate', 'Advanced')),
+            added_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (student_id, skill_id),
+            FOREIGN KEY (student_id) REFERENCES students(student_id),
+            FOREIGN KEY (skill_id) REFERENCES skills(skill_id)
+        )
+    ''')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS course_skills (
+            course_id INTEGER,
+            skill_id INTEGER,
+            required_level TEXT CHECK(required_level IN ('Beginner', 'Intermediate', 'Advanced')),
+            PRIMARY KEY (course_id, skill_id),
+            FOREIGN KEY (course_id) REFERENCES courses(course_id),
+            FOREIGN KEY (skill_id) REFERENCES skills(skill_id)
+        )
+    ''')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS enrollments (
+            enrollment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER,
+            course_id INTEGER,
+            enrollment_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+            completion_status TEXT DEFAULT 'Enrolled' CHECK(completion_status IN ('Enrolled', 'In Progress', 'Completed', 'Dropped')),
+            completion_date DATETIME,
+            FOREIGN KEY (student_id) REFERENCES students(student_id),
+            FOREIGN KEY (course_id) REFERENCES courses(course_id)
+        )
+    ''')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS feedback (
+            feedback_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER,
+            course_id INTEGER,
+            rating INTEGER CHECK(rating >= 1 AND rating <= 5),
+            review_text TEXT,
+            feedback_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (student_id) REFERENCES students(student_id),
+            FOREIGN KEY (course_id) REFERENCES courses(course_id)
+        )
+    ''')
+
+def create_derived_tables(conn, now=None):
+    """Create engine tables, backfilling them from existing rows the first time
+
+    now pins the trending epoch (used by the synthetic data generator).
+    """
+    # Databases created before required skill levels existed
+    ensure_required_level_column(conn)
+    
+    # Prerequisite edges and their transitive closure
+    ensure_prerequisite_tables(conn)
+    
+    # Time-decayed enrollment/feedback counters for trending courses
+    ensure_trending_tables(conn, now)
+    
+    # Per-(department, year, course) enrollment and rating aggregates
+    ensure_cohort_tables(conn)
+
+def create_tables(conn):
+    """Create every table the backend uses (safe to run repeatedly)"""
+    create_core_tables(conn)
+    create_derived_tables(conn)
@@ -0,0 +1,252 @@
+# =====================================================
+# AI COURSE RECOMMENDATION SYSTEM - OFFLINE EVALUATION
+# =====================================================
+# Replays enrollment history to score the recommenders
+# Author: Student
+# Date: October 2025
+# Description: Time-based train/test split of enrollments,
+#              precision@k, recall@k, NDCG@k and coverage
+#              computed with array operations, plus per-query
+#              latency percentiles for each recommender
+# =====================================================
+#
+# Usage (from backend/):
+#   python evaluate.py --db course_recommendation.db --k 5 --test-fraction 0.2
+#   python evaluate.py --cutoff 2025-01-01 --max-users 2000 --json results.json
+
+import argparse
+import json
+import sqlite3
+import time
+
+import numpy as np
+
+from ranking import load_candidates, recommend_for_student, student_profile
+from co_enrollment import build_co_enrollment
+from prerequisites import PrerequisiteGraph, ensure_prerequisite_tables
+from trending import ensure_trending_tables, rebuild_trending
+from cohort import ensure_cohort_tables, popular_with_cohort, rebuild_cohort_stats
+
+# ---- recommenders under test ----
+# Each takes (conn, student_id, k, graph, candidates, co_enrollment) and
+# returns recommended course ids. candidates and co_enrollment are built once
+# from the training snapshot, as the app's candidate_cache and
+# co_enrollment_store hold them between rebuilds.
+
+def api_recommendations(conn, student_id, k, graph, candidates, co_enrollment):
+    """Same pipeline as GET /api/recommendations/<id> in app_sqlite.py"""
+    skills, enrolled = student_profile(conn, student_id)
+    if not skills:
+        rows = popular_with_cohort(conn, student_id, candidates, k=k, exclude_ids=enrolled,
+                                   mask=graph.student_mask(conn, student_id, candidates))
+    else:
+        rows = recommend_for_student(conn, student_id, k=k, require_skill_match=True, prerequisites=graph,
+                                     candidates=candidates, co_enrollment=co_enrollment)
+    return [row['course_id'] for row in rows]
+
+def streamlit_recommendations(conn, student_id, k, graph, candidates, co_enrollment):
+    """Same pipeline as get_course_recommendations() in streamlit_app.py"""
+    rows = recommend_for_student(conn, student_id, k=k, prerequisites=graph, candidates=candidates,
+                                 co_enrollment=co_enrollment)
+    return [row['course_id'] for row in rows]
+
+def popularity_baseline(conn, student_id, k, graph, candidates, co_enrollment):
+    """Most-enrolled courses the student has not taken"""
+    rows = conn.execute('''
+        SELECT course_id FROM courses
+        WHERE course_id NOT IN (SELECT course_id FROM enrollments WHERE student_id = ?)
+        ORDER BY total_enrollments DESC, course_id
+        LIMIT ?
+    ''', (student_id, k)).fetchall()
+    return [row[0] for row in rows]
+
+RECOMMENDERS = {
+    'get_recommendations': api_recommendations,
+    'get_course_recommendations': streamlit_recommendations,
+    'popularity': popularity_baseline,
+}
+
+# ---- train/test split ----
+
+def load_enrollments(conn):
+    """(student_id, course_id, enrollment_id) arrays ordered by enrollment time"""
+    rows = conn.execute('''
+        SELECT student_id, course_id, enrollment_id FROM enrollments
+        ORDER BY enrollment_date, enrollment_id
+    ''').fetchall()
+    data = np.array(rows, dtype=np.int64).reshape(-1, 3)
+    return data[:, 0], data[:, 1], data[:, 2]
+
+def split_point(conn, test_fraction=0.2, cutoff=None):
+    """Index into the time-ordered enrollments where the test period starts"""
+    total = conn.execute('SELECT COUNT(*) FROM enrollments').fetchone()[0]
+    if cutoff:
+        before = conn.execute('SELECT COUNT(*) FROM enrollments WHERE enrollment_date < ?', (cutoff,)).fetchone()[0]
+        return before
+    return int(round(total * (1.0 - test_fraction)))
+
+def training_snapshot(conn, test_enrollment_ids, cutoff_date):
+    """In-memory copy of the database as it looked before the test period
+
+    Test enrollments and later feedback are removed, and every aggregate
+    derived from them is recomputed, so recommenders cannot see the answers.
+    """
+    snapshot = sqlite3.connect(':memory:')
+    conn.backup(snapshot)
+
+    snapshot.execute('CREATE TEMP TABLE test_enrollments (enrollment_id INTEGER PRIMARY KEY)')
+    snapshot.executemany('INSERT INTO test_enrollments VALUES (?)', [(int(e),) for e in test_enrollment_ids])
+    snapshot.execute('DELETE FROM enrollments WHERE enrollment_id IN (SELECT enrollment_id FROM test_enrollments)')
+    if cutoff_date:
+        snapshot.execute('DELETE FROM feedback WHERE feedback_date >= ?', (cutoff_date,))
+
+    snapshot.execute('''
+        UPDATE courses SET
+            total_enrollments = (SELECT COUNT(*) FROM enrollments WHERE course_id = courses.course_id),
+            average_rating = (SELECT AVG(rating) FROM feedback WHERE course_id = courses.course_id)
+    ''')
+    ensure_prerequisite_tables(snapshot)
+    ensure_trending_tables(snapshot)
+    rebuild_trending(snapshot)
+    ensure_cohort_tables(snapshot)
+    rebuild_cohort_stats(snapshot)
+    snapshot.commit()
+    return snapshot
+
+# ---- metrics ----
+
+def ranking_metrics(recommended, relevant_users, relevant_courses, k, catalog_size):
+    """Mean precision@k, recall@k, NDCG@k and catalog coverage
+
+    recommended is an (n_users x k) array of course ids padded with -1;
+    relevant_users/relevant_courses list every held-out (user row, course) pair.
+    """
+    n_users = recommended.shape[0]
+    stride = int(max(recommended.max(initial=0), relevant_courses.max(initial=0))) + 1
+
+    user_rows = np.repeat(np.arange(n_users, dtype=np.int64), k).reshape(n_users, k)
+    rec_keys = user_rows * stride + recommended
+    hits = np.isin(rec_keys, relevant_users * stride + relevant_courses) & (recommended >= 0)
+
+    relevant_counts = np.bincount(relevant_users, minlength=n_users).astype(np.float64)
+    hit_counts = hits.sum(axis=1)
+
+    discounts = 1.0 / np.log2(np.arange(2, k + 2))
+    dcg = (hits * discounts).sum(axis=1)
+    ideal = np.concatenate([[0.0], np.cumsum(discounts)])[np.minimum(relevant_counts, k).astype(np.int64)]
+
+    recommended_ids = np.unique(recommended[recommended >= 0])
+    return {
+        'precision_at_k': float(np.mean(hit_counts / k)),
+        'recall_at_k': float(np.mean(np.divide(hit_counts, relevant_counts, out=np.zeros(n_users),
+                                               where=relevant_counts > 0))),
+        'ndcg_at_k': float(np.mean(np.divide(dcg, ideal, out=np.zeros(n_users), where=ideal > 0))),
+        'coverage': float(recommended_ids.size / catalog_size) if catalog_size else 0.0,
+    }
+
+def latency_summary(latencies_ms):
+    """p50/p95/p99/mean/max of per-query latencies in milliseconds"""
+    values = np.asarray(latencies_ms, dtype=np.float64)
+    if not values.size:
+        return {}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        'p50_ms': round(float(p50), 3),
+        'p95_ms': round(float(p95), 3),
+        'p99_ms': round(float(p99), 3),
+        'mean_ms': round(float(values.mean()), 3),
+        'max_ms': round(float(values.max()), 3),
+    }
+
+# ---- driver ----
+
+def evaluate(db_path, k=5, test_fraction=0.2, cutoff=None, recommenders=None, max_users=None, seed=42):
+    """Run every recommender against the held-out enrollments and return a report"""
+    conn = sqlite3.connect(db_path)
+    students, courses, enrollment_ids = load_enrollments(conn)
+    split = split_point(conn, test_fraction, cutoff)
+    if cutoff is None and split < enrollment_ids.size:
+        cutoff_date = conn.execute('SELECT enrollment_date FROM enrollments WHERE enrollment_id = ?',
+                                   (int(enrollment_ids[split]),)).fetchone()[0]
+    else:
+        cutoff_date = cutoff
+
+    test_students, test_courses = students[split:], courses[split:]
+    snapshot = training_snapshot(conn, enrollment_ids[split:], cutoff_date)
+    conn.close()
+
+    users = np.unique(test_students)
+    if max_users and users.size > max_users:
+        users = np.sort(np.random.default_rng(seed).choice(users, max_users, replace=False))
+    user_rows = np.searchsorted(users, test_students)
+    in_sample = (user_rows < users.size) & (users[np.minimum(user_rows, users.size - 1)] == test_students)
+    relevant_users, relevant_courses = user_rows[in_sample], test_courses[in_sample]
+
+    catalog_size = snapshot.execute('SELECT COUNT(*) FROM courses').fetchone()[0]
+    graph = PrerequisiteGraph()
+    graph.load(snapshot)
+    candidates = load_candidates(snapshot)
+    co_enrollment = build_co_enrollment(snapshot)
+
+    report = {
+        'k': k,
+        'train_enrollments': int(split),
+        'test_enrollments': int(test_students.size),
+        'cutoff': cutoff_date,
+        'users': int(users.size),
+        'recommenders': {},
+    }
+    for name in recommenders or RECOMMENDERS:
+        recommend = RECOMMENDERS[name]
+        recommended = np.full((users.size, k), -1, dtype=np.int64)
+        latencies = []
+        for row, student_id in enumerate(users.tolist()):
+            started = time.perf_counter()
+            course_ids = recommend(snapshot, student_id, k, graph, candidates, co_enrollment)[:k]
+            latencies.append((time.perf_counter() - started) * 1000.0)
+            recommended[row, :len(course_ids)] = course_ids
+
+        metrics = ranking_metrics(recommended, relevant_users, relevant_courses, k, catalog_size)
+        metrics['latency'] = latency_summary(latencies)
+        report['recommenders'][name] = metrics
+
+    snapshot.close()
+    return report
+
+def print_report(report):
+    print(f"Train enrollments: {report['train_enrollments']}  Test enrollments: {report['test_enrollments']}  "
+          f"Users: {report['users']}  Cutoff: {report['cutoff']}")
+    k = report['k']
+    header = f"{'recommender':<28}{'P@' + str(k):>8}{'R@' + str(k):>8}{'NDCG@' + str(k):>9}{'cover':>8}" \
+             f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    print(header)
+    print('-' * len(header))
+    for name, m in report['recommenders'].items():
+        lat = m['latency']
+        print(f"{name:<28}{m['precision_at_k']:>8.4f}{m['recall_at_k']:>8.4f}{m['ndcg_at_k']:>9.4f}"
+              f"{m['coverage']:>8.3f}{lat.get('p50_ms', 0):>9.2f}{lat.get('p95_ms', 0):>9.2f}"
+              f"{lat.get('p99_ms', 0):>9.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline evaluation of the course recommenders')
+    parser.add_argument('--db', default='course_recommendation.db', help='SQLite database to replay')
+    parser.add_argument('--k', type=int, default=5, help='Recommendations per student')
+    parser.add_argument('--test-fraction', type=float, default=0.2,
+                        help='Share of the most recent enrollments held out')
+    parser.add_argument('--cutoff', help='Hold out enrollments on or after this date instead')
+    parser.add_argument('--recommender', action='append', choices=sorted(RECOMMENDERS),
+                        help='Recommender to evaluate (repeatable; default: all)')
+    parser.add_argument('--max-users', type=int, help='Evaluate a seeded random sample of test users')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='Also write the report to this file')
+    args = parser.parse_args()
+
+    report = evaluate(args.db, k=args.k, test_fraction=args.test_fraction, cutoff=args.cutoff,
+                      recommenders=args.recommender, max_users=args.max_users, seed=args.seed)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,348 @@
+# =====================================================
+# AI COURSE RECOMMENDATION SYSTEM - SYNTHETIC DATA
+# =====================================================
+# Large-scale, seeded dataset generator for benchmarks
+# Author: Student
+# Date: October 2025
+# Description: Builds a database with configurable numbers of
+#              students, courses, skills, enrollments and reviews
+#              using skewed (power-law) distributions, written in
+#              one bulk transaction with indexes built afterwards
+# =====================================================
+#
+# Usage (from backend/):
+#   python generate_data.py --out synthetic.db --students 100000 --courses 10000 --enrollments 2000000
+#   python generate_data.py --out big.db --students 1000000 --courses 100000 --enrollments 20000000
+#
+# The same --seed always produces the same database.
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+from db_schema import LISTING_INDEXES, LOOKUP_INDEXES, create_core_tables, create_derived_tables
+from migrations import migrate
+
+CATEGORIES = [
+    'Programming', 'Web Development', 'Data Science', 'AI/ML', 'Database', 'Cloud Computing',
+    'Cybersecurity', 'Mobile Development', 'DevOps', 'Design', 'Business Analytics',
+    'Project Management', 'Game Development', 'IoT', 'Blockchain', 'Emerging Tech',
+]
+
+TOPICS = {
+    'Programming': ['Python', 'Java', 'C++', 'Go', 'Rust', 'JavaScript'],
+    'Web Development': ['React', 'Django', 'Node.js', 'GraphQL', 'CSS', 'Vue'],
+    'Data Science': ['Pandas', 'Statistics', 'Data Visualization', 'R', 'Spark'],
+    'AI/ML': ['Machine Learning', 'Deep Learning', 'NLP', 'Computer Vision', 'Reinforcement Learning'],
+    'Database': ['SQL', 'PostgreSQL', 'MongoDB', 'Database Design', 'Query Optimization'],
+    'Cloud Computing': ['AWS', 'Azure', 'Google Cloud', 'Serverless', 'Cloud Architecture'],
+    'Cybersecurity': ['Network Security', 'Ethical Hacking', 'Cryptography', 'Security Operations'],
+    'Mobile Development': ['Android', 'iOS', 'Flutter', 'React Native'],
+    'DevOps': ['Docker', 'Kubernetes', 'CI/CD', 'Terraform', 'Monitoring'],
+    'Design': ['UI/UX', 'Figma', 'Design Systems', 'Accessibility'],
+    'Business Analytics': ['Excel', 'Power BI', 'Tableau', 'Marketing Analytics'],
+    'Project Management': ['Agile', 'Scrum', 'Kanban', 'Leadership'],
+    'Game Development': ['Unity', 'Unreal Engine', 'Game Design'],
+    'IoT': ['Arduino', 'Raspberry Pi', 'Embedded Systems'],
+    'Blockchain': ['Smart Contracts', 'Solidity', 'Web3'],
+    'Emerging Tech': ['Quantum Computing', 'AR/VR', 'Edge Computing'],
+}
+
+COURSE_FORMATS = ['Fundamentals', 'Bootcamp', 'Masterclass', 'in Practice', 'for Beginners',
+                  'Deep Dive', 'Projects', 'Essentials']
+
+DEPARTMENTS = ['Computer Science', 'Information Technology', 'Electronics', 'Mechanical', 'Civil',
+               'Data Science', 'AI & ML']
+YEARS = ['1st Year', '2nd Year', '3rd Year', '4th Year', 'Graduate']
+LEVEL_NAMES = np.array(['Beginner', 'Intermediate', 'Advanced'], dtype=object)
+STATUSES = np.array(['Enrolled', 'In Progress', 'Completed', 'Dropped'], dtype=object)
+
+# Indexes created after the bulk load (building them once is much cheaper than
+# maintaining them row by row during the inserts)
+DEFERRED_INDEXES = LOOKUP_INDEXES + LISTING_INDEXES + [
+    'CREATE INDEX IF NOT EXISTS idx_enrollments_date ON enrollments(enrollment_date)',
+    'CREATE INDEX IF NOT EXISTS idx_courses_category ON courses(category)',
+    'CREATE INDEX IF NOT EXISTS idx_courses_rating ON courses(average_rating DESC)',
+]
+
+SECONDS_PER_DAY = 86400
+
+def zipf_weights(n, exponent, rng):
+    """Power-law weights over n items, assigned to items in random order"""
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    rng.shuffle(weights)
+    return weights / weights.sum()
+
+def format_timestamps(seconds):
+    """Unix seconds -> 'YYYY-MM-DD HH:MM:SS' strings (SQLite CURRENT_TIMESTAMP format)"""
+    text = np.datetime_as_string(seconds.astype('datetime64[s]'), unit='s')
+    return np.char.replace(text, 'T', ' ')
+
+def insert_rows(conn, sql, columns, batch_size):
+    """executemany in fixed-size batches over column arrays"""
+    total = len(columns[0])
+    for start in range(0, total, batch_size):
+        chunk = [column[start:start + batch_size] for column in columns]
+        conn.executemany(sql, zip(*[c.tolist() if hasattr(c, 'tolist') else c for c in chunk]))
+    return total
+
+class Timer:
+    def __init__(self, label):
+        self.label = label
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        print(f"  {self.label:<32}{time.perf_counter() - self.started:8.2f}s")
+
+def generate(out, students=10000, courses=1000, skills=300, enrollments=100000, feedback_rate=0.3,
+             seed=42, years_of_history=3, batch_size=50000, end_time=1760000000):
+    """Write a synthetic database to out; returns row counts per table
+
+    end_time fixes "now" (default mid-October 2025) so output only depends on
+    the arguments and seed.
+    """
+    rng = np.random.default_rng(seed)
+    start_time = end_time - years_of_history * 365 * SECONDS_PER_DAY
+
+    conn = sqlite3.connect(out)
+    conn.execute('PRAGMA journal_mode = OFF')
+    conn.execute('PRAGMA synchronous = OFF')
+    conn.execute('PRAGMA locking_mode = EXCLUSIVE')
+    conn.execute('PRAGMA temp_store = MEMORY')
+    conn.execute('PRAGMA cache_size = -262144')
+    create_core_tables(conn)
+    counts = {}
+
+    conn.execute('BEGIN')
+
+    # ---- skills: spread over categories, a few categories dominate ----
+    with Timer('skills'):
+        category_weights = zipf_weights(len(CATEGORIES), 0.8, rng)
+        skill_category = rng.choice(len(CATEGORIES), size=skills, p=category_weights)
+        skill_names = []
+        seen = {}
+        for category_index in skill_category.tolist():
+            category = CATEGORIES[category_index]
+            topic = TOPICS[category][seen.get(category, 0) % len(TOPICS[category])]
+            seen[category] = seen.get(category, 0) + 1
+            skill_names.append(f"{topic} {seen[category]}" if seen[category] > len(TOPICS[category]) else topic)
+        counts['skills'] = insert_rows(
+            conn, 'INSERT INTO skills (skill_id, skill_name, category) VALUES (?, ?, ?)',
+            [np.arange(1, skills + 1), skill_names, [CATEGORIES[c] for c in skill_category.tolist()]],
+            batch_size
+        )
+
+    # ---- courses: category, level, duration and a latent quality ----
+    with Timer('courses (generate)'):
+        course_category = rng.choice(len(CATEGORIES), size=courses, p=category_weights)
+        course_level = rng.choice(3, size=courses, p=[0.5, 0.35, 0.15])
+        durations = np.clip(np.round(rng.lognormal(3.4, 0.6, size=courses)), 2, 150).astype(np.int64)
+        quality = np.clip(rng.normal(4.0, 0.5, size=courses), 1.5, 5.0)
+        created = rng.integers(start_time, end_time - 30 * SECONDS_PER_DAY, size=courses)
+        formats = rng.integers(0, len(COURSE_FORMATS), size=courses)
+        course_names, descriptions = [], []
+        for i, (c, f) in enumerate(zip(course_category.tolist(), formats.tolist())):
+            topics = TOPICS[CATEGORIES[c]]
+            topic = topics[i % len(topics)]
+            course_names.append(f"{topic} {COURSE_FORMATS[f]}")
+            descriptions.append(f"Learn {topic} with hands-on {CATEGORIES[c].lower()} projects")
+        # A few courses take most of the enrollments
+        popularity = zipf_weights(courses, 1.1, rng)
+
+    # ---- students ----
+    with Timer('students'):
+        password = hashlib.sha256('password123'.encode('utf-8')).hexdigest()
+        department = rng.choice(len(DEPARTMENTS), size=students, p=zipf_weights(len(DEPARTMENTS), 0.7, rng))
+        year = rng.choice(len(YEARS), size=students, p=[0.28, 0.26, 0.22, 0.18, 0.06])
+        registered = np.sort(rng.integers(start_time, end_time, size=students))
+        ids = np.arange(1, students + 1)
+        counts['students'] = insert_rows(
+            conn, '''INSERT INTO students (student_id, name, email, password, phone, department, year,
+                                           registration_date) VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+            [ids, [f"Student {i}" for i in ids.tolist()], [f"student{i}@example.edu" for i in ids.tolist()],
+             [password] * students, [f"9{i:09d}" for i in ids.tolist()],
+             [DEPARTMENTS[d] for d in department.tolist()], [YEARS[y] for y in year.tolist()],
+             format_timestamps(registered).tolist()],
+            batch_size
+        )
+
+    # ---- enrollments: heavy-tailed activity per student, power-law per course ----
+    with Timer('enrollments (generate)'):
+        activity = rng.lognormal(0.0, 1.0, size=students)
+        activity /= activity.sum()
+        enrollments = min(enrollments, students * courses)
+        keys = np.zeros(0, dtype=np.int64)
+        while keys.size < enrollments:
+            # Skewed draws repeat pairs, so keep drawing until enough are unique
+            draw = int((enrollments - keys.size) * 1.25) + 16
+            pair_students = rng.choice(students, size=draw, p=activity)
+            pair_courses = rng.choice(courses, size=draw, p=popularity)
+            keys = np.union1d(keys, pair_students.astype(np.int64) * courses + pair_courses)
+        if keys.size > enrollments:
+            keys = np.sort(rng.choice(keys, size=enrollments, replace=False))
+        e_student = keys // courses
+        e_course = keys % courses
+
+        # Enrolled after both the registration and the course launch, skewed recent
+        earliest = np.maximum(registered[e_student], created[e_course])
+        enrolled_at = earliest + (rng.beta(2.0, 1.2, size=keys.size) * (end_time - earliest)).astype(np.int64)
+        order = np.argsort(enrolled_at, kind='stable')
+        e_student, e_course, enrolled_at = e_student[order], e_course[order], enrolled_at[order]
+
+        age_days = (end_time - enrolled_at) / SECONDS_PER_DAY
+        done_chance = np.clip(age_days / (durations[e_course] * 3.0 + 30.0), 0.0, 0.85)
+        roll = rng.random(keys.size)
+        status = np.where(roll < done_chance, 2, np.where(roll < done_chance + 0.08, 3,
+                          np.where(age_days > 14, 1, 0)))
+        completed_at = enrolled_at + (rng.random(keys.size) * (end_time - enrolled_at)).astype(np.int64)
+        completion = np.where(status == 2, format_timestamps(completed_at).astype(object), None)
+
+    with Timer('enrollments (insert)'):
+        counts['enrollments'] = insert_rows(
+            conn, '''INSERT INTO enrollments (student_id, course_id, enrollment_date, completion_status,
+                                              completion_date) VALUES (?, ?, ?, ?, ?)''',
+            [e_student + 1, e_course + 1, format_timestamps(enrolled_at).tolist(), STATUSES[status],
+             completion],
+            batch_size
+        )
+
+    # ---- feedback: mostly from completers, ratings around each course's quality ----
+    with Timer('feedback'):
+        review_chance = np.where(status == 2, min(1.0, feedback_rate * 2.0), feedback_rate * 0.3)
+        reviewed = np.flatnonzero(rng.random(keys.size) < review_chance)
+        ratings = np.clip(np.round(quality[e_course[reviewed]] + rng.normal(0.0, 0.8, reviewed.size)), 1, 5)
+        ratings = ratings.astype(np.int64)
+        reviewed_at = enrolled_at[reviewed] + (
+            rng.random(reviewed.size) * (end_time - enrolled_at[reviewed])).astype(np.int64)
+        counts['feedback'] = insert_rows(
+            conn, '''INSERT INTO feedback (student_id, course_id, rating, review_text, feedback_date)
+                     VALUES (?, ?, ?, ?, ?)''',
+            [e_student[reviewed] + 1, e_course[reviewed] + 1, ratings,
+             [None] * reviewed.size, format_timestamps(reviewed_at).tolist()],
+            batch_size
+        )
+
+    # Aggregates are known up front, so courses are written once with final values
+    with Timer('courses (insert)'):
+        totals = np.bincount(e_course, minlength=courses)
+        rating_sums = np.bincount(e_course[reviewed], weights=ratings, minlength=courses)
+        rating_counts = np.bincount(e_course[reviewed], minlength=courses)
+        averages = np.round(np.divide(rating_sums, rating_counts, out=np.zeros(courses),
+                                      where=rating_counts > 0), 2)
+        counts['courses'] = insert_rows(
+            conn, '''INSERT INTO courses (course_id, course_name, description, category, duration_hours,
+                                          difficulty_level, average_rating, total_enrollments, created_date)
+                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+            [np.arange(1, courses + 1), course_names, descriptions,
+             [CATEGORIES[c] for c in course_category.tolist()], durations, LEVEL_NAMES[course_level],
+             averages, totals, format_timestamps(created).tolist()],
+            batch_size
+        )
+
+    # ---- skill links: courses teach skills from their own category ----
+    with Timer('course_skills / student_skills'):
+        by_category = [np.flatnonzero(skill_category == c) for c in range(len(CATEGORIES))]
+        skill_popularity = zipf_weights(skills, 0.9, rng)
+        per_course = rng.integers(2, 7, size=courses)
+        cs_course, cs_skill = [], []
+        for c in range(courses):
+            pool = by_category[course_category[c]]
+            n = int(per_course[c])
+            picks = rng.choice(pool, size=min(n, pool.size), replace=False) if pool.size else np.zeros(0, np.int64)
+            if picks.size < n:
+                extra = rng.choice(skills, size=n - picks.size, p=skill_popularity)
+                picks = np.unique(np.concatenate([picks, extra]))
+            cs_course.append(np.full(picks.size, c))
+            cs_skill.append(picks)
+        cs_course = np.concatenate(cs_course)
+        cs_skill = np.concatenate(cs_skill)
+        cs_level = np.clip(course_level[cs_course] + rng.integers(-1, 1, size=cs_course.size), 0, 2)
+        counts['course_skills'] = insert_rows(
+            conn, 'INSERT INTO course_skills (course_id, skill_id, required_level) VALUES (?, ?, ?)',
+            [cs_course + 1, cs_skill + 1, LEVEL_NAMES[cs_level]],
+            batch_size
+        )
+
+        # About a fifth of students have no skills (cold start)
+        per_student = np.where(rng.random(students) < 0.2, 0, rng.integers(1, 9, size=students))
+        ss_student = np.repeat(np.arange(students), per_student)
+        ss_skill = rng.choice(skills, size=ss_student.size, p=skill_popularity)
+        ss_keys = np.unique(ss_student.astype(np.int64) * skills + ss_skill)
+        ss_student, ss_skill = ss_keys // skills, ss_keys % skills
+        ss_level = rng.choice(3, size=ss_keys.size, p=[0.5, 0.35, 0.15])
+        counts['student_skills'] = insert_rows(
+            conn, '''INSERT INTO student_skills (student_id, skill_id, proficiency_level, added_date)
+                     VALUES (?, ?, ?, ?)''',
+            [ss_student + 1, ss_skill + 1, LEVEL_NAMES[ss_level],
+             format_timestamps(registered[ss_student]).tolist()],
+            batch_size
+        )
+
+    conn.commit()
+
+    with Timer('deferred indexes'):
+        for statement in DEFERRED_INDEXES:
+            conn.execute(statement)
+        conn.commit()
+
+    with Timer('derived tables'):
+        create_derived_tables(conn, now=end_time)
+        conn.commit()
+
+    conn.execute('PRAGMA locking_mode = NORMAL')
+    conn.execute('PRAGMA journal_mode = DELETE')
+    conn.close()
+
+    # Stamp the schema version (and build the remaining schema.sql indexes)
+    # so the app starts on the generated database without a separate upgrade
+    with Timer('migrations'):
+        migrate(out)
+
+    # After the migrations, so the indexes they build get statistics too
+    with Timer('analyze'):
+        conn = sqlite3.connect(out)
+        conn.execute('ANALYZE')
+        conn.commit()
+        conn.close()
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a large synthetic course recommendation database')
+    parser.add_argument('--out', default='synthetic.db', help='Database file to create')
+    parser.add_argument('--students', type=int, default=10000)
+    parser.add_argument('--courses', type=int, default=1000)
+    parser.add_argument('--skills', type=int, default=300)
+    parser.add_argument('--enrollments', type=int, default=100000)
+    parser.add_argument('--feedback-rate', type=float, default=0.3,
+                        help='Review rate: completed enrollments review at twice this, others at 0.3x')
+    parser.add_argument('--years', type=int, default=3, help='Years of history to spread dates over')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--batch-size', type=int, default=50000)
+    parser.add_argument('--force', action='store_true', help='Overwrite --out if it exists')
+    args = parser.parse_args()
+
+    if os.path.exists(args.out):
+        if not args.force:
+            parser.error(f"{args.out} already exists (use --force to overwrite)")
+        os.remove(args.out)
+
+    print(f"Generating {args.out} (seed {args.seed})")
+    started = time.perf_counter()
+    counts = generate(args.out, students=args.students, courses=args.courses, skills=args.skills,
+                      enrollments=args.enrollments, feedback_rate=args.feedback_rate, seed=args.seed,
+                      years_of_history=args.years, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - started
+    rows = sum(counts.values())
+    for table, count in counts.items():
+        print(f"  {table:<20}{count:>12,}")
+    print(f"Done: {rows:,} rows in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+# =====================================================
+# AI COURSE RECOMMENDATION SYSTEM - HTTP CACHING
+# =====================================================
+# Conditional GETs for the read-heavy endpoints
+# Author: Student
+# Date: October 2025
+# Description: Version counters kept by triggers (per table and
+#              per course, see catalog.ensure_entity_versions) drive
+#              ETag / Last-Modified headers and 304 responses; full
+#              bodies come from a response cache keyed by URL and
+#              version and are gzip or brotli compressed once per
+#              encoding
+# =====================================================
+#
+# Settings (environment):
+#   RESPONSE_CACHE_TTL=300          seconds a cached body is kept (it can never be stale,
+#                                   the key contains the data version)
+#   COMPRESS_MIN_BYTES=1024         smaller bodies are sent uncompressed
+#
+# Brotli is used when the optional brotli package is installed and the
+# client accepts it; gzip otherwise.
+
+import gzip
+import hashlib
+import os
+from datetime import datetime, timezone
+
+from flask import Response, request
+from werkzeug.http import is_resource_modified
+
+from cache_backend import MISSING, shared_cache
+from metrics import CACHE_LOOKUPS
+from serializers import dumps
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+RESPONSE_CACHE_TTL = float(os.environ.get('RESPONSE_CACHE_TTL', '300'))
+COMPRESS_MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', '1024'))
+
+# Part of every validator; bump it when response bodies change shape for the same data
+RESPONSE_FORMAT = 2
+
+def _etag(versions):
+    """Validator for this URL (path and query) at the given data versions"""
+    query = sorted(request.args.items(multi=True))
+    return hashlib.blake2b(repr((RESPONSE_FORMAT, request.path, versions, query)).encode('utf-8'), digest_size=12).hexdigest()
+
+def _encoding(size):
+    """Best encoding the client accepts for a body of this size"""
+    if size < COMPRESS_MIN_BYTES:
+        return 'identity'
+    options = (['br'] if brotli is not None else []) + ['gzip']
+    return request.accept_encodings.best_match(options) or 'identity'
+
+def _compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+def conditional_json(versions, last_modified, build):
+    """JSON response for GET endpoints whose content depends only on versions
+
+    versions must include the database's 'instance' id (read_versions(...,
+    'instance')): the other counters start over in a regenerated database,
+    and the ETag and response cache key are derived from versions alone.
+
+    build() returns the payload dict (which may hold serializers.RawJSON
+    values), or a ready (response, status) tuple (e.g. a 404) that is sent
+    as is without validators or caching. A request
+    whose If-None-Match / If-Modified-Since still matches gets a 304 without
+    calling build(); otherwise the body comes from the response cache.
+    """
+    etag = _etag(versions)
+    modified = datetime.fromtimestamp(int(last_modified), tz=timezone.utc) if last_modified else None
+
+    if not is_resource_modified(request.environ, etag=etag, last_modified=modified):
+        response = Response(status=304)
+    else:
+        key = f"response:{request.path}:{etag}"
+        entry = shared_cache.get(key)
+        CACHE_LOOKUPS.inc(('response', 'miss' if entry is MISSING else 'hit'))
+        changed = entry is MISSING
+        if changed:
+            payload = build()
+            if isinstance(payload, tuple):
+                return payload
+            entry = {'identity': dumps(payload).encode('utf-8')}
+
+        encoding = _encoding(len(entry['identity']))
+        if encoding not in entry:
+            entry = dict(entry, **{encoding: _compress(entry['identity'], encoding)})
+            changed = True
+        if changed:
+            shared_cache.set(key, entry, ttl=RESPONSE_CACHE_TTL)
+
+        response = Response(entry[encoding], mimetype='application/json')
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+
+    response.set_etag(etag, weak=True)
+    if modified is not None:
+        response.last_modified = modified
+    # Clients may keep the body but must revalidate it
+    response.headers['Cache-Control'] = 'no-cache'
+    response.vary.add('Accept-Encoding')
+    # Some of these URLs also answer Accept: application/x-ndjson with a stream
+    response.vary.add('Accept')
+    return response
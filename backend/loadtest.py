@@ -0,0 +1,333 @@
+# =====================================================
+# AI COURSE RECOMMENDATION SYSTEM - LOAD TEST
+# =====================================================
+# Concurrent mixed read/write load and lock contention
+# Author: Student
+# Date: October 2025
+# Description: Drives browse, recommend, enroll, feedback and
+#              register traffic from many processes and threads,
+#              recording throughput, latency histograms and the
+#              rate of "database is locked" failures
+# =====================================================
+#
+# Usage (from backend/):
+#   python loadtest.py --processes 4 --threads 8 --duration 30
+#   python loadtest.py --scale medium --journal-mode wal --json wal.json
+#   python loadtest.py --url http://localhost:5000 --mix browse=60,enroll=30,register=10
+#
+# By default every worker process imports the Flask app and sends requests
+# through its test client, so each process behaves like one server worker
+# sharing the database file; with --url the requests go over HTTP instead.
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import numpy as np
+
+from migrations import migrate
+
+DEFAULT_MIX = {'browse': 50, 'recommend': 20, 'enroll': 15, 'feedback': 10, 'register': 5}
+
+# Latency histogram bucket upper bounds in milliseconds (last bucket is open)
+BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+OUTCOMES = ['ok', 'rejected', 'locked', 'server_error', 'exception']
+
+class LockErrorTracker(logging.Handler):
+    """Notes which threads logged a 'database is locked' error from the app"""
+
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.locked_threads = set()
+
+    def emit(self, record):
+        if 'database is locked' in record.getMessage():
+            self.locked_threads.add(threading.get_ident())
+
+    def take(self):
+        """True if the current thread hit a lock error since the last call"""
+        ident = threading.get_ident()
+        if ident in self.locked_threads:
+            self.locked_threads.discard(ident)
+            return True
+        return False
+
+class TestClientTransport:
+    """Sends requests through the Flask test client of an in-process app"""
+
+    def __init__(self):
+        import app_sqlite
+
+        self.app = app_sqlite.app
+        self.tracker = LockErrorTracker()
+        app_logger = logging.getLogger('app_sqlite')
+        app_logger.addHandler(self.tracker)
+        app_logger.propagate = False
+        self.local = threading.local()
+        # Measure a warmed-up worker, as a load balancer gated on /api/ready would
+        app_sqlite.warmup.wait(timeout=300)
+
+    def request(self, method, path, body=None, query=None):
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+        response = client.open(path, method=method, json=body, query_string=query)
+        return response.status_code, self.tracker.take()
+
+class HttpTransport:
+    """Sends requests to a running server; lock errors show up only as 500s"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def request(self, method, path, body=None, query=None):
+        url = self.base_url + path
+        if query:
+            url += '?' + urllib.parse.urlencode(query)
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        req = urllib.request.Request(url, data=data, method=method,
+                                     headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(req, timeout=60) as response:
+                response.read()
+                return response.status, False
+        except urllib.error.HTTPError as e:
+            return e.code, False
+
+class Scenarios:
+    """The traffic mix: each scenario issues one request and returns (status, locked)"""
+
+    def __init__(self, transport, ids, worker_id, seed):
+        self.transport = transport
+        self.students, self.courses, self.categories = ids
+        self.worker_id = worker_id
+        self.seed = seed
+        self.registered = 0
+        self.lock = threading.Lock()
+
+    def browse(self, rng):
+        if rng.random() < 0.5:
+            return self.transport.request('GET', '/api/courses',
+                                          query={'category': rng.choice(self.categories)})
+        return self.transport.request('GET', f'/api/courses/{int(rng.choice(self.courses))}')
+
+    def recommend(self, rng):
+        return self.transport.request('GET', f'/api/recommendations/{int(rng.choice(self.students))}')
+
+    def enroll(self, rng):
+        return self.transport.request('POST', '/api/enrollments', body={
+            'student_id': int(rng.choice(self.students)), 'course_id': int(rng.choice(self.courses))})
+
+    def feedback(self, rng):
+        return self.transport.request('POST', '/api/feedback', body={
+            'student_id': int(rng.choice(self.students)), 'course_id': int(rng.choice(self.courses)),
+            'rating': int(rng.integers(1, 6)), 'review_text': 'Load test review'})
+
+    def register(self, rng):
+        with self.lock:
+            self.registered += 1
+            n = self.registered
+        return self.transport.request('POST', '/api/auth/register', body={
+            'name': 'Load Test', 'email': f"load{self.seed}_{self.worker_id}_{os.getpid()}_{n}@example.edu",
+            'password': 'password123', 'phone': '9000000000', 'department': 'Computer Science',
+            'year': '1st Year'})
+
+def classify(status, locked):
+    if locked:
+        return 'locked'
+    if status < 400:
+        return 'ok'
+    if status < 500:
+        return 'rejected'
+    return 'server_error'
+
+def load_ids(db_path):
+    conn = sqlite3.connect(db_path)
+    students = np.array([r[0] for r in conn.execute('SELECT student_id FROM students')], dtype=np.int64)
+    courses = np.array([r[0] for r in conn.execute('SELECT course_id FROM courses')], dtype=np.int64)
+    categories = [r[0] for r in conn.execute('SELECT DISTINCT category FROM courses') if r[0]]
+    conn.close()
+    return students, courses, categories
+
+def worker_process(worker_id, config, barrier, results):
+    """One process: config['threads'] threads issuing requests until the deadline"""
+    if config['url']:
+        transport = HttpTransport(config['url'])
+    else:
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+        transport = TestClientTransport()
+    scenarios = Scenarios(transport, load_ids(config['db']), worker_id, config['seed'])
+    names = list(config['mix'])
+    weights = np.array([config['mix'][n] for n in names], dtype=np.float64)
+    weights /= weights.sum()
+
+    records = {name: [] for name in names}
+    records_lock = threading.Lock()
+    barrier.wait()
+    deadline = time.perf_counter() + config['duration']
+
+    def run_thread(thread_id):
+        rng = np.random.default_rng([config['seed'], worker_id, thread_id])
+        local = {name: [] for name in names}
+        while time.perf_counter() < deadline:
+            name = names[rng.choice(len(names), p=weights)]
+            started = time.perf_counter()
+            try:
+                status, locked = getattr(scenarios, name)(rng)
+                outcome = classify(status, locked)
+            except Exception:
+                outcome = 'exception'
+            local[name].append(((time.perf_counter() - started) * 1000.0, OUTCOMES.index(outcome)))
+        with records_lock:
+            for name in names:
+                records[name].extend(local[name])
+
+    threads = [threading.Thread(target=run_thread, args=(t,)) for t in range(config['threads'])]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.put({name: np.array(rows, dtype=np.float64).reshape(-1, 2).tolist() for name, rows in records.items()})
+
+def scenario_report(rows, duration):
+    """Throughput, outcome counts, lock-error rate, percentiles and histogram for one scenario"""
+    data = np.asarray(rows, dtype=np.float64).reshape(-1, 2)
+    latencies, outcomes = data[:, 0], data[:, 1].astype(np.int64)
+    counts = np.bincount(outcomes, minlength=len(OUTCOMES))
+    report = {
+        'requests': int(latencies.size),
+        'throughput_rps': round(latencies.size / duration, 2),
+        'outcomes': {name: int(count) for name, count in zip(OUTCOMES, counts)},
+        'lock_error_rate': round(float(counts[OUTCOMES.index('locked')]) / latencies.size, 5)
+        if latencies.size else 0.0,
+    }
+    if latencies.size:
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        report.update({'p50_ms': round(float(p50), 2), 'p95_ms': round(float(p95), 2),
+                       'p99_ms': round(float(p99), 2), 'max_ms': round(float(latencies.max()), 2)})
+        edges = np.searchsorted(BUCKETS_MS, latencies, side='left')
+        hist = np.bincount(edges, minlength=len(BUCKETS_MS) + 1)
+        labels = [f"<={b}ms" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"]
+        report['histogram'] = dict(zip(labels, hist.tolist()))
+    return report
+
+def journal_mode(db_path, mode=None):
+    conn = sqlite3.connect(db_path)
+    if mode:
+        current = conn.execute(f'PRAGMA journal_mode = {mode}').fetchone()[0]
+    else:
+        current = conn.execute('PRAGMA journal_mode').fetchone()[0]
+    conn.close()
+    return current
+
+def run_load(db_path, url=None, processes=4, threads=8, duration=30.0, mix=None, seed=42):
+    """Run the load test and return the report dict"""
+    config = {'db': db_path, 'url': url, 'threads': threads, 'duration': duration,
+              'mix': mix or DEFAULT_MIX, 'seed': seed}
+    os.environ['COURSE_DB_PATH'] = db_path
+
+    context = multiprocessing.get_context('spawn')
+    barrier = context.Barrier(processes + 1)
+    results = context.Queue()
+    workers = [context.Process(target=worker_process, args=(i, config, barrier, results))
+               for i in range(processes)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    started = time.perf_counter()
+    merged = {name: [] for name in config['mix']}
+    for _ in workers:
+        for name, rows in results.get().items():
+            merged[name].extend(rows)
+    elapsed = time.perf_counter() - started
+    for worker in workers:
+        worker.join()
+
+    scenarios = {name: scenario_report(rows, elapsed) for name, rows in merged.items()}
+    total = scenario_report([row for rows in merged.values() for row in rows], elapsed)
+    return {
+        'config': {'processes': processes, 'threads': threads, 'duration_s': duration, 'mix': config['mix'],
+                   'seed': seed, 'target': url or 'test-client', 'journal_mode': journal_mode(db_path)},
+        'elapsed_s': round(elapsed, 2),
+        'total': total,
+        'scenarios': scenarios,
+    }
+
+def print_report(report):
+    config = report['config']
+    print(f"{config['processes']} processes x {config['threads']} threads for {report['elapsed_s']}s "
+          f"({config['target']}, journal_mode={config['journal_mode']})")
+    header = f"{'scenario':<12}{'req/s':>9}{'ok':>8}{'rejected':>10}{'locked':>8}{'5xx':>7}{'lock %':>8}" \
+             f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    print(header)
+    print('-' * len(header))
+    rows = list(report['scenarios'].items()) + [('TOTAL', report['total'])]
+    for name, r in rows:
+        o = r['outcomes']
+        print(f"{name:<12}{r['throughput_rps']:>9.1f}{o['ok']:>8}{o['rejected']:>10}{o['locked']:>8}"
+              f"{o['server_error'] + o['exception']:>7}{r['lock_error_rate'] * 100:>7.2f}%"
+              f"{r.get('p50_ms', 0):>9.1f}{r.get('p95_ms', 0):>9.1f}{r.get('p99_ms', 0):>9.1f}")
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown scenario '{name}' (choose from {', '.join(DEFAULT_MIX)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent load and write-contention test')
+    parser.add_argument('--db', help='Database to load (copied to a scratch file unless --in-place)')
+    parser.add_argument('--scale', default='small', help='Synthetic dataset scale when --db is not given')
+    parser.add_argument('--data-dir', default='benchmark_data', help='Where generated datasets are cached')
+    parser.add_argument('--in-place', action='store_true', help='Write to --db itself instead of a copy')
+    parser.add_argument('--url', help='Target a running server instead of in-process test clients')
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=8, help='Threads per process')
+    parser.add_argument('--duration', type=float, default=30.0, help='Seconds of load')
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX,
+                        help='Scenario weights, e.g. browse=50,recommend=20,enroll=15,feedback=10,register=5')
+    parser.add_argument('--journal-mode', choices=['delete', 'truncate', 'persist', 'wal'],
+                        help='Set the database journal mode before the run')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='Also write the report to this file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        if args.db and args.in_place:
+            db_path = args.db
+        else:
+            if args.db:
+                source = args.db
+            else:
+                from benchmark import dataset_path
+                source = dataset_path(args.data_dir, args.scale, args.seed)
+            db_path = os.path.join(scratch, 'load.db')
+            shutil.copyfile(source, db_path)
+        # Workers only check the schema version, so migrate before starting them
+        migrate(db_path)
+        if args.journal_mode:
+            journal_mode(db_path, args.journal_mode)
+
+        report = run_load(os.path.abspath(db_path), url=args.url, processes=args.processes,
+                          threads=args.threads, duration=args.duration, mix=args.mix, seed=args.seed)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,264 @@
+# =====================================================
+# AI COURSE RECOMMENDATION SYSTEM - METRICS
+# =====================================================
+# Low-contention counters and Prometheus text exposition
+# Author: Student
+# Date: October 2025
+# Description: Counters and histograms that write to per-thread
+#              shards (no lock on the hot path) and are summed at
+#              scrape time, plus gauges for DB connections, caches,
+#              SQL timings and process memory for /api/metrics
+# =====================================================
+#
+# Values are per process: with several server workers, scrape each one
+# (or let Prometheus sum across instances).
+
+import bisect
+import os
+import resource
+import threading
+import time
+
+# Request/engine latency bucket upper bounds in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REGISTRY = []
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _labels(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float):
+        return repr(round(value, 9))
+    return str(value)
+
+class _Sharded:
+    """Base for metrics whose values live in one dict per writing thread
+
+    Only the owning thread writes to its shard, so updates need no lock;
+    the lock is taken once per thread when its shard is created. Shards of
+    finished threads (werkzeug starts one per request) are folded into a
+    retired total so the shard list stays short.
+    """
+
+    kind = None
+    MAX_SHARDS = 64
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards = []
+        self._retired = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _shard(self):
+        shard = getattr(self._local, 'values', None)
+        if shard is None:
+            shard = self._local.values = {}
+            with self._lock:
+                if len(self._shards) >= self.MAX_SHARDS:
+                    self._retire()
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _retire(self):
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                self._merge(self._retired, shard.copy())
+        self._shards = live
+
+    def _merge(self, into, shard):
+        for labels, value in shard.items():
+            into[labels] = into.get(labels, 0) + value
+
+    def values(self):
+        with self._lock:
+            self._retire()
+            totals = dict(self._retired)
+            shards = [shard.copy() for _, shard in self._shards]
+        for shard in shards:
+            self._merge(totals, shard)
+        return totals
+
+    def header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(_Sharded):
+    """Monotonic counter summed over every thread that incremented it"""
+
+    kind = 'counter'
+
+    def inc(self, labels=(), amount=1):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def total(self, labels=()):
+        return self.values().get(labels, 0)
+
+    def render(self):
+        lines = self.header()
+        for labels, value in sorted(self.values().items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+class UpDownGauge(Counter):
+    """Gauge moved with inc()/dec() from any thread, e.g. requests in flight"""
+
+    kind = 'gauge'
+
+    def dec(self, labels=(), amount=1):
+        self.inc(labels, -amount)
+
+class Histogram(_Sharded):
+    """Cumulative-bucket histogram; each shard entry is [bucket counts..., sum]"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, labels=()):
+        shard = self._shard()
+        entry = shard.get(labels)
+        if entry is None:
+            entry = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        entry[bisect.bisect_left(self.buckets, value)] += 1
+        entry[-1] += value
+
+    def time(self, labels=()):
+        return _Timer(self, labels)
+
+    def _merge(self, into, shard):
+        for labels, entry in shard.items():
+            entry = list(entry)
+            if labels in into:
+                into[labels] = [a + b for a, b in zip(into[labels], entry)]
+            else:
+                into[labels] = entry
+
+    def render(self):
+        lines = self.header()
+        bounds = [f'le="{_number(bound)}"' for bound in self.buckets + (float('inf'),)]
+        for labels, entry in sorted(self.values().items()):
+            running = 0
+            for bound, count in zip(bounds, entry[:-1]):
+                running += count
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, bound)} {running}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(entry[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {running}")
+        return lines
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started, self.labels)
+        return False
+
+class GaugeFunction:
+    """Gauge whose samples are computed by a callback at scrape time"""
+
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, labelnames, callback, kind='gauge'):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+        self.kind = kind
+        REGISTRY.append(self)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in self.callback():
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+# ---- shared metrics ----
+
+HTTP_REQUESTS = Counter('http_requests_total', 'HTTP requests by route, method and status',
+                        ['route', 'method', 'status'])
+HTTP_ERRORS = Counter('http_request_errors_total', 'HTTP requests answered with a 5xx status',
+                      ['route', 'method'])
+HTTP_LATENCY = Histogram('http_request_duration_seconds', 'HTTP request latency', ['route', 'method'])
+HTTP_IN_FLIGHT = UpDownGauge('http_requests_in_flight', 'HTTP requests currently being handled')
+
+ENGINE_LATENCY = Histogram('recommendation_engine_duration_seconds',
+                           'Time spent inside recommendation, planning and skill-gap engines', ['engine'])
+
+CACHE_LOOKUPS = Counter('cache_lookups_total', 'In-process cache lookups by cache and result', ['cache', 'result'])
+
+DB_CONNECTIONS = Counter('db_connections_total', 'SQLite connections opened and closed', ['event'])
+
+def _cache_hit_ratios():
+    lookups = CACHE_LOOKUPS.values()
+    for cache in sorted({labels[0] for labels in lookups}):
+        hits = lookups.get((cache, 'hit'), 0)
+        total = hits + lookups.get((cache, 'miss'), 0)
+        yield (cache,), hits / total if total else 0.0
+
+def _db_connections_open():
+    counts = DB_CONNECTIONS.values()
+    yield (), counts.get(('opened',), 0) - counts.get(('closed',), 0)
+
+def _resident_memory():
+    try:
+        with open('/proc/self/statm') as f:
+            yield (), int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        yield (), resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def _max_resident_memory():
+    yield (), resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def _cpu_seconds():
+    yield (), time.process_time()
+
+def _threads():
+    yield (), threading.active_count()
+
+def _sql_query_stats():
+    from sql_metrics import query_stats
+    for stats in query_stats():
+        yield (stats['caller'], stats['query']), stats
+
+GaugeFunction('cache_hit_ratio', 'Share of cache lookups that hit since start', ['cache'], _cache_hit_ratios)
+GaugeFunction('db_connections_open', 'SQLite connections currently open (opened minus closed)', [],
+              _db_connections_open)
+GaugeFunction('process_resident_memory_bytes', 'Resident set size', [], _resident_memory)
+GaugeFunction('process_max_resident_memory_bytes', 'Peak resident set size', [], _max_resident_memory)
+GaugeFunction('process_cpu_seconds_total', 'User and system CPU time', [], _cpu_seconds, kind='counter')
+GaugeFunction('process_threads', 'Live Python threads', [], _threads)
+GaugeFunction('sql_query_seconds_total', 'Time spent in SQL statements by calling function and query',
+              ['caller', 'query'], lambda: ((l, s['total_ms'] / 1000.0) for l, s in _sql_query_stats()),
+              kind='counter')
+GaugeFunction('sql_queries_total', 'SQL statements executed by calling function and query',
+              ['caller', 'query'], lambda: ((l, s['count']) for l, s in _sql_query_stats()), kind='counter')
+
+def render():
+    """Every registered metric in Prometheus text exposition format"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,403 @@
+# =====================================================
+# AI COURSE RECOMMENDATION SYSTEM - SCHEMA MIGRATIONS
+# =====================================================
+# Versioned, forward-only database migrations
+# Author: Student
+# Date: October 2025
+# Description: Ordered migrations recorded in a schema_migrations
+#              table and PRAGMA user_version, applied once from the
+#              command line; app workers only read the version at
+#              startup instead of creating tables and seeding data
+# =====================================================
+#
+# Usage (from backend/):
+#   python migrations.py status
+#   python migrations.py upgrade                   # course_recommendation.db
+#   python migrations.py upgrade --db synthetic.db --to 4
+#
+# Migrations never change once released: add a new one to MIGRATIONS
+# instead. Each runs in its own BEGIN IMMEDIATE transaction, so two
+# runners never apply the same step twice. Index migrations build one
+# index per transaction, so live writers only ever wait for one index.
+
+import argparse
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime
+
+from catalog import ensure_cohort_versions, ensure_data_versions, ensure_entity_versions
+from db_schema import LISTING_INDEXES, LOOKUP_INDEXES, create_core_tables, create_derived_tables
+
+logger = logging.getLogger('migrations')
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEMA_SQL = os.path.join(REPO_DIR, 'schema.sql')
+
+DEFAULT_DB = os.environ.get('COURSE_DB_PATH', 'course_recommendation.db')
+
+_CREATE_INDEX = re.compile(r'CREATE\s+(UNIQUE\s+)?INDEX\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)\s+ON\s+(\w+)\s*\(([^)]*)\)',
+                           re.I)
+
+class SchemaVersionError(RuntimeError):
+    """The database schema is older than this code expects"""
+
+def hash_password(password):
+    """Hash password using SHA-256"""
+    return hashlib.sha256(password.encode('utf-8')).hexdigest()
+
+# ---- migration steps ----
+
+def seed_sample_data(conn):
+    """Insert the demo students, skills, courses and activity into an empty database"""
+    # Imported here so the version check stays light
+    from trending import rebuild_trending
+    from cohort import rebuild_cohort_stats
+
+    cursor = conn.cursor()
+
+    # Databases that already hold data are left alone
+    cursor.execute('SELECT COUNT(*) FROM students')
+    if cursor.fetchone()[0] > 0:
+        return
+
+    # Insert sample students
+    students = [
+        ('Arjun Sharma', 'arjun.sharma@college.edu', hash_password('password123'), '9876543210', 'Computer Science', '3rd Year'),
+        ('Priya Patel', 'priya.patel@college.edu', hash_password('password123'), '9876543211', 'Information Technology', '2nd Year'),
+        ('Rajesh Kumar', 'rajesh.kumar@college.edu', hash_password('password123'), '9876543212', 'Electronics', '4th Year'),
+        ('Sneha Singh', 'sneha.singh@college.edu', hash_password('password123'), '9876543213', 'Computer Science', '1st Year'),
+        ('Amit Verma', 'amit.verma@college.edu', hash_password('password123'), '9876543214', 'Information Technology', '3rd Year')
+    ]
+
+    cursor.executemany('''
+        INSERT INTO students (name, email, password, phone, department, year)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', students)
+
+    # Insert sample skills
+    skills = [
+        ('Python Programming', 'Programming'),
+        ('JavaScript', 'Programming'),
+        ('SQL', 'Database'),
+        ('React', 'Web Development'),
+        ('Machine Learning', 'AI/ML'),
+        ('Data Analysis', 'Data Science'),
+        ('HTML/CSS', 'Web Development'),
+        ('Docker', 'DevOps'),
+        ('UI Design', 'Design'),
+        ('Node.js', 'Programming')
+    ]
+
+    cursor.executemany('''
+        INSERT INTO skills (skill_name, category)
+        VALUES (?, ?)
+    ''', skills)
+
+    # Insert sample courses
+    courses = [
+        ('Complete Python Bootcamp', 'Learn Python from scratch to advanced level', 'Programming', 40, 'Beginner'),
+        ('React Development Course', 'Build modern web applications with React', 'Web Development', 30, 'Intermediate'),
+        ('Machine Learning Fundamentals', 'Introduction to ML algorithms and techniques', 'AI/ML', 50, 'Advanced'),
+        ('SQL Mastery', 'Database design and query optimization', 'Database', 25, 'Intermediate'),
+        ('Data Science with Python', 'Analyze data using Python libraries', 'Data Science', 45, 'Intermediate'),
+        ('Docker for Developers', 'Containerization and deployment strategies', 'DevOps', 20, 'Intermediate'),
+        ('UI/UX Design Principles', 'Create beautiful and functional interfaces', 'Design', 35, 'Beginner'),
+        ('Node.js Backend Development', 'Build scalable server applications', 'Programming', 40, 'Advanced')
+    ]
+
+    cursor.executemany('''
+        INSERT INTO courses (course_name, description, category, duration_hours, difficulty_level)
+        VALUES (?, ?, ?, ?, ?)
+    ''', courses)
+
+    # Insert student skills
+    student_skills = [
+        (1, 1, 'Advanced'),  # Arjun - Python Advanced
+        (1, 3, 'Intermediate'),  # Arjun - SQL Intermediate
+        (1, 5, 'Beginner'),  # Arjun - ML Beginner
+        (2, 2, 'Intermediate'),  # Priya - JavaScript Intermediate
+        (2, 4, 'Intermediate'),  # Priya - React Intermediate
+        (2, 7, 'Advanced'),  # Priya - HTML/CSS Advanced
+        (3, 1, 'Intermediate'),  # Rajesh - Python Intermediate
+        (3, 6, 'Advanced'),  # Rajesh - Data Analysis Advanced
+        (4, 1, 'Beginner'),  # Sneha - Python Beginner
+        (4, 7, 'Intermediate'),  # Sneha - HTML/CSS Intermediate
+        (5, 2, 'Advanced'),  # Amit - JavaScript Advanced
+        (5, 8, 'Intermediate'),  # Amit - Docker Intermediate
+    ]
+
+    cursor.executemany('''
+        INSERT INTO student_skills (student_id, skill_id, proficiency_level)
+        VALUES (?, ?, ?)
+    ''', student_skills)
+
+    # Insert course skills
+    course_skills = [
+        (1, 1),  # Python Course - Python skill
+        (2, 2),  # React Course - JavaScript skill
+        (2, 4),  # React Course - React skill
+        (3, 1),  # ML Course - Python skill
+        (3, 5),  # ML Course - ML skill
+        (4, 3),  # SQL Course - SQL skill
+        (5, 1),  # Data Science - Python skill
+        (5, 6),  # Data Science - Data Analysis skill
+        (6, 8),  # Docker Course - Docker skill
+        (7, 7),  # UI Design - HTML/CSS skill
+        (7, 9),  # UI Design - UI Design skill
+        (8, 2),  # Node.js - JavaScript skill
+    ]
+
+    cursor.executemany('''
+        INSERT INTO course_skills (course_id, skill_id)
+        VALUES (?, ?)
+    ''', course_skills)
+
+    # Insert sample enrollments
+    enrollments = [
+        (1, 1, 'Completed', '2024-01-15'),
+        (1, 3, 'In Progress', None),
+        (2, 2, 'Completed', '2024-02-10'),
+        (2, 7, 'Enrolled', None),
+        (3, 4, 'Completed', '2024-01-20'),
+        (3, 5, 'In Progress', None),
+        (4, 1, 'Enrolled', None),
+        (5, 2, 'Completed', '2024-02-05'),
+        (5, 8, 'Enrolled', None)
+    ]
+
+    cursor.executemany('''
+        INSERT INTO enrollments (student_id, course_id, completion_status, completion_date)
+        VALUES (?, ?, ?, ?)
+    ''', enrollments)
+
+    # Insert sample feedback
+    feedback = [
+        (1, 1, 5, 'Excellent course! Very well structured and easy to follow.'),
+        (2, 2, 4, 'Great content, learned a lot about React development.'),
+        (3, 4, 5, 'Perfect for learning SQL fundamentals.'),
+        (5, 2, 4, 'Good course, would recommend to others.')
+    ]
+
+    cursor.executemany('''
+        INSERT INTO feedback (student_id, course_id, rating, review_text)
+        VALUES (?, ?, ?, ?)
+    ''', feedback)
+
+    # Update course ratings and enrollment counts
+    cursor.execute('''
+        UPDATE courses SET average_rating = (
+            SELECT AVG(rating) FROM feedback WHERE course_id = courses.course_id
+        )
+    ''')
+
+    cursor.execute('''
+        UPDATE courses SET total_enrollments = (
+            SELECT COUNT(*) FROM enrollments WHERE course_id = courses.course_id
+        )
+    ''')
+
+    # Seed trending counters from the sample history
+    rebuild_trending(conn)
+    rebuild_cohort_stats(conn)
+
+def schema_sql_indexes(path=SCHEMA_SQL):
+    """CREATE INDEX statements from schema.sql, rewritten to IF NOT EXISTS"""
+    with open(path) as f:
+        text = f.read()
+    statements = []
+    for match in _CREATE_INDEX.finditer(text):
+        unique, name, table, columns = match.groups()
+        statements.append(f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name} "
+                          f"ON {table}({' '.join(columns.split())})")
+    return statements
+
+def _covering_index(conn, table, columns):
+    """Name of an existing index on table whose leading columns are columns, if any"""
+    for row in conn.execute(f'PRAGMA index_list({table})').fetchall():
+        indexed = [info[2] for info in conn.execute(f'PRAGMA index_info("{row[1]}")').fetchall()]
+        if indexed[:len(columns)] == columns:
+            return row[1]
+    return None
+
+def build_indexes(conn, statements):
+    """Create each index in its own short write transaction
+
+    Indexes whose columns are already the leading columns of another index
+    (a primary key or UNIQUE constraint, say) are skipped: they would only
+    slow writes down.
+    """
+    for sql in statements:
+        _, name, table, columns = _CREATE_INDEX.match(sql).groups()
+        columns = [column.split()[0] for column in columns.split(',')]
+        started = time.perf_counter()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            existing = _covering_index(conn, table, columns)
+            if existing is None:
+                conn.execute(sql)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        if existing is None or existing == name:
+            logger.info(f"  index {name}: {(time.perf_counter() - started) * 1000:.0f} ms")
+        else:
+            logger.info(f"  index {name}: skipped, covered by {existing}")
+
+def build_schema_sql_indexes(conn):
+    build_indexes(conn, schema_sql_indexes())
+
+def build_lookup_indexes(conn):
+    build_indexes(conn, LOOKUP_INDEXES)
+
+def build_listing_indexes(conn):
+    build_indexes(conn, LISTING_INDEXES)
+
+def catalog_version_counters(conn):
+    ensure_data_versions(conn, ('courses', 'course_skills'))
+
+def enrollment_version_counter(conn):
+    ensure_data_versions(conn, ('enrollments',))
+
+def student_skill_version_counter(conn):
+    ensure_data_versions(conn, ('student_skills',))
+
+# (version, description, function, online). Offline steps run inside one
+# transaction together with their version bump; online steps manage their
+# own short transactions and must be safe to re-run after a crash.
+MIGRATIONS = [
+    (1, 'core tables', create_core_tables, False),
+    (2, 'engine tables (required levels, prerequisites, trending, cohorts)', create_derived_tables, False),
+    (3, 'sample data for empty databases', seed_sample_data, False),
+    (4, 'indexes from schema.sql', build_schema_sql_indexes, True),
+    (5, 'enrollment, feedback and course-skill lookup indexes', build_lookup_indexes, True),
+    (6, 'data version counters and triggers for courses and course skills', catalog_version_counters, False),
+    (7, 'data version counter and triggers for enrollments (co-enrollment snapshots)', enrollment_version_counter, False),
+    (8, 'skill, student, per-course and per-course-feedback version counters (ETags)', ensure_entity_versions, False),
+    (9, 'date-ordered feedback and enrollment listing indexes (streamed lists)', build_listing_indexes, True),
+    (10, 'per-department cohort stats version counters (cached cohort signals)', ensure_cohort_versions, False),
+    (11, 'student skills version counter (warm-up snapshots)', student_skill_version_counter, False),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+# ---- running and checking ----
+
+def current_version(conn):
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+def schema_version(db_path):
+    """Schema version of db_path without creating or locking it (0 if it does not exist)"""
+    if not os.path.exists(db_path):
+        return 0
+    conn = sqlite3.connect(f"file:{os.path.abspath(db_path)}?mode=ro", uri=True)
+    try:
+        return current_version(conn)
+    finally:
+        conn.close()
+
+def check_schema(db_path):
+    """Startup check for app workers: raise SchemaVersionError unless migrations are applied"""
+    version = schema_version(db_path)
+    if version < LATEST_VERSION:
+        raise SchemaVersionError(
+            f"{db_path} is at schema version {version} but this code needs {LATEST_VERSION}; "
+            f"run `python migrations.py upgrade --db {db_path}` from backend/ before starting workers"
+        )
+    if version > LATEST_VERSION:
+        logger.warning(f"{db_path} is at schema version {version}, newer than this code ({LATEST_VERSION})")
+    return version
+
+def _ensure_history_table(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TEXT NOT NULL,
+            duration_ms REAL NOT NULL
+        )
+    ''')
+
+def _record(conn, version, description, started):
+    conn.execute('INSERT OR REPLACE INTO schema_migrations (version, description, applied_at, duration_ms) '
+                 'VALUES (?, ?, ?, ?)',
+                 (version, description, datetime.now().isoformat(), (time.perf_counter() - started) * 1000))
+    conn.execute(f'PRAGMA user_version = {int(version)}')
+
+def migrate(db_path, target=None, timeout=60.0):
+    """Apply every pending migration up to target (default: latest); returns the versions applied"""
+    target = LATEST_VERSION if target is None else target
+    conn = sqlite3.connect(db_path, timeout=timeout, isolation_level=None)
+    applied = []
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        _ensure_history_table(conn)
+        conn.execute('COMMIT')
+        for version, description, apply, online in MIGRATIONS:
+            if version > target or version <= current_version(conn):
+                continue
+            logger.info(f"Applying migration {version}: {description}")
+            started = time.perf_counter()
+            if online:
+                apply(conn)
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                # Another runner may have applied it while we waited for the lock
+                if current_version(conn) >= version:
+                    conn.execute('COMMIT')
+                    continue
+                if not online:
+                    apply(conn)
+                _record(conn, version, description, started)
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            applied.append(version)
+    finally:
+        conn.close()
+    return applied
+
+def history(db_path):
+    """Applied migrations as (version, description, applied_at, duration_ms) rows"""
+    if not os.path.exists(db_path):
+        return []
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute('SELECT version, description, applied_at, duration_ms FROM schema_migrations '
+                            'ORDER BY version').fetchall()
+    except sqlite3.OperationalError:
+        return []
+    finally:
+        conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply or inspect database schema migrations')
+    parser.add_argument('command', choices=['status', 'upgrade'])
+    parser.add_argument('--db', default=DEFAULT_DB, help='Database file (default: COURSE_DB_PATH or course_recommendation.db)')
+    parser.add_argument('--to', type=int, help='Stop at this version (default: latest)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    if args.command == 'upgrade':
+        started = time.perf_counter()
+        applied = migrate(args.db, args.to)
+        if applied:
+            print(f"Applied {len(applied)} migration(s) in {time.perf_counter() - started:.2f}s")
+        else:
+            print('Already up to date')
+
+    version = schema_version(args.db)
+    print(f"{args.db}: schema version {version} (latest {LATEST_VERSION})")
+    done = {row[0]: row for row in history(args.db)}
+    for version, description, _, _ in MIGRATIONS:
+        row = done.get(version)
+        state = f"applied {row[2][:19]} ({row[3]:.0f} ms)" if row else 'pending'
+        print(f"  {version:>3}  {description:<70}{state}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+# =====================================================
+# AI COURSE RECOMMENDATION SYSTEM - LEARNING PLANNER
+# =====================================================
+# Time-budgeted learning-path planning
+# Author: Student
+# Date: October 2025
+# Description: Picks and orders courses that fit a weekly
+#              hour budget over a horizon, maximizing the
+#              ranking score while respecting prerequisites
+#              and difficulty progression
+# =====================================================
+
+import math
+
+import numpy as np
+
+from ranking import (LEVELS, compute_signals, load_candidates, score_signals, student_profile,
+                     top_k)
+from metrics import CACHE_LOOKUPS
+from cache_backend import MISSING, database_instance, shared_cache
+
+# Weekly hours assumed for each quiz time_commitment answer
+WEEKLY_HOURS = {
+    'short': 2,
+    'medium': 5.5,
+    'long': 11.5,
+    'intensive': 20,
+}
+
+DEFAULT_HORIZON_WEEKS = 12
+
+# Largest plans the API accepts (the knapsack table grows with the hour budget)
+MAX_WEEKLY_HOURS = 80
+MAX_HORIZON_WEEKS = 104
+
+# Knapsack items considered after pruning by score
+MAX_PLAN_CANDIDATES = 200
+
+# Plans also go stale as ratings and enrollments drift, so shared copies expire
+PLAN_TTL = 600
+
+class PlanCache:
+    """Computed plans keyed by profile and database instance, in the shared cache under 'plan:<student_id>:'"""
+
+    def _key(self, key):
+        return f"plan:{key[0]}:{key[1:]!r}"
+
+    def get(self, key):
+        plan = shared_cache.get(self._key(key))
+        CACHE_LOOKUPS.inc(('learning_plan', 'miss' if plan is MISSING else 'hit'))
+        return None if plan is MISSING else plan
+
+    def put(self, key, plan):
+        shared_cache.set(self._key(key), plan, ttl=PLAN_TTL)
+
+    def invalidate_student(self, student_id):
+        """Drop cached plans for one student in every worker"""
+        shared_cache.invalidate(f"plan:{student_id}:")
+
+    def clear(self):
+        shared_cache.invalidate('plan:')
+
+plan_cache = PlanCache()
+
+def _bundles(candidates, chosen, prerequisites, completed):
+    """For each candidate position, the positions that must be taken with it"""
+    bundles = []
+    for pos in chosen:
+        bundle = [pos]
+        if prerequisites is not None:
+            course_id = int(candidates.course_ids[pos])
+            for prereq_id in prerequisites.missing_prerequisites(course_id, completed):
+                prereq_pos = candidates.position.get(prereq_id)
+                if prereq_pos is None:
+                    bundle = None
+                    break
+                bundle.append(prereq_pos)
+        bundles.append(bundle)
+    return bundles
+
+def _knapsack(costs, values, budget):
+    """0/1 knapsack over integer costs; returns indices of chosen items
+
+    The DP table is filled one item at a time with array operations and the
+    choice matrix is kept for reconstruction.
+    """
+    best = np.zeros(budget + 1)
+    took = np.zeros((len(costs), budget + 1), dtype=bool)
+    for i, (cost, value) in enumerate(zip(costs, values)):
+        if cost > budget:
+            continue
+        with_item = best[:budget + 1 - cost] + value
+        better = with_item > best[cost:]
+        took[i, cost:] = better
+        best[cost:] = np.where(better, with_item, best[cost:])
+
+    chosen, remaining = [], budget
+    for i in range(len(costs) - 1, -1, -1):
+        if took[i, remaining]:
+            chosen.append(i)
+            remaining -= costs[i]
+    return chosen[::-1]
+
+def _schedule(candidates, positions, scores, prerequisites, weekly_hours):
+    """Order courses by prerequisites, then difficulty, then score, and assign weeks"""
+    positions = set(positions)
+    course_ids = {int(candidates.course_ids[p]): p for p in positions}
+    if prerequisites is not None:
+        blocked_by = {c: set(prerequisites.ancestors_of(c)) & course_ids.keys() for c in course_ids}
+    else:
+        blocked_by = {c: set() for c in course_ids}
+
+    ordered, done = [], set()
+    while len(ordered) < len(course_ids):
+        ready = [c for c in course_ids if c not in done and blocked_by[c] <= done]
+        if not ready:
+            break
+        nxt = min(ready, key=lambda c: (candidates.levels[course_ids[c]], -scores[course_ids[c]], c))
+        ordered.append(nxt)
+        done.add(nxt)
+
+    plan, hours = [], 0.0
+    for course_id in ordered:
+        pos = course_ids[course_id]
+        row = candidates.row(pos)
+        duration = row['duration_hours'] or 0
+        plan.append({
+            'course_id': course_id,
+            'course_name': row.get('course_name'),
+            'difficulty_level': row.get('difficulty_level'),
+            'duration_hours': duration,
+            'score': round(float(scores[pos]), 2),
+            'start_week': int(hours // weekly_hours) + 1,
+            'end_week': max(int(math.ceil((hours + duration) / weekly_hours)), 1),
+        })
+        hours += duration
+    return plan
+
+def plan_learning_path(candidates, scores, weekly_hours, weeks=DEFAULT_HORIZON_WEEKS, eligible=None,
+                       prerequisites=None, completed_ids=(), start_level=1,
+                       max_candidates=MAX_PLAN_CANDIDATES):
+    """Choose and order courses that fit weekly_hours * weeks and maximize total score
+
+    Candidates are pruned to the best max_candidates by score, capped at one
+    difficulty level above start_level, and bundled with their missing
+    prerequisites before the knapsack runs.
+    """
+    budget = int(weekly_hours * weeks)
+    durations = candidates.durations
+
+    mask = np.ones(candidates.size, dtype=bool) if eligible is None else eligible.copy()
+    mask &= (durations > 0) & (durations <= budget) & (scores > 0)
+    mask &= candidates.levels <= min(3, start_level + 1)
+    chosen = top_k(scores, max_candidates, mask)
+
+    completed = set(completed_ids)
+    costs, values, bundles = [], [], []
+    for bundle in _bundles(candidates, chosen.tolist(), prerequisites, completed):
+        if bundle is None:
+            continue
+        cost = int(durations[bundle].sum())
+        if cost <= budget:
+            costs.append(cost)
+            values.append(float(scores[bundle].sum()))
+            bundles.append(bundle)
+
+    # Hours beyond what every bundle together costs cannot be used, so they need no table columns
+    picked = set()
+    for i in _knapsack(costs, values, min(budget, sum(costs))):
+        picked.update(bundles[i])
+
+    # Bundles can share prerequisites, so top up any budget that freed
+    spent = int(durations[list(picked)].sum()) if picked else 0
+    for i in np.argsort(-np.array(values)).tolist() if values else []:
+        extra = [p for p in bundles[i] if p not in picked]
+        cost = int(durations[extra].sum()) if extra else 0
+        if extra and spent + cost <= budget:
+            picked.update(extra)
+            spent += cost
+
+    plan = _schedule(candidates, picked, scores, prerequisites, weekly_hours)
+    return {
+        'weekly_hours': weekly_hours,
+        'weeks': weeks,
+        'total_hours': int(spent),
+        'total_score': round(float(sum(item['score'] for item in plan)), 2),
+        'courses': plan,
+    }
+
+def plan_for_student(conn, student_id, weekly_hours, weeks=DEFAULT_HORIZON_WEEKS, experience_level=None,
+                     categories=None, prerequisites=None, weights=None, candidates=None):
+    """Rank the catalog for a student profile and plan it, caching the result per profile"""
+    key = (student_id, database_instance(conn), float(weekly_hours), int(weeks), experience_level,
+           tuple(sorted(categories)) if categories else None)
+    plan = plan_cache.get(key)
+    if plan is not None:
+        return plan
+
+    if candidates is None:
+        candidates = load_candidates(conn)
+    skills, enrolled = student_profile(conn, student_id) if student_id else ({}, [])
+
+    # Current level from the quiz answer, else the student's mean proficiency
+    if experience_level:
+        start_level = LEVELS.get(experience_level, 1)
+    elif skills:
+        codes = [LEVELS.get(level, 1) for level in skills.values()]
+        start_level = int(round(sum(codes) / len(codes)))
+    else:
+        start_level = 1
+
+    signals = compute_signals(candidates, skills, min(3, start_level + 1))
+    scores = score_signals(signals, weights)
+
+    eligible = ~candidates.mask_for(enrolled)
+    if categories:
+        in_categories = candidates.category_mask(categories)
+        if (eligible & in_categories).any():
+            eligible &= in_categories
+
+    # Courses already in progress count as taken when bundling prerequisites
+    plan = plan_learning_path(
+        candidates, scores, weekly_hours, weeks, eligible=eligible,
+        prerequisites=prerequisites, completed_ids=enrolled, start_level=start_level
+    )
+    plan_cache.put(key, plan)
+    return plan
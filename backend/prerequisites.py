@@ -0,0 +1,293 @@
+# =====================================================
+# AI COURSE RECOMMENDATION SYSTEM - PREREQUISITE GRAPH
+# =====================================================
+# Course prerequisite DAG with a cached transitive closure
+# Author: Student
+# Date: October 2025
+# Description: Edges and closure stored in SQLite, mirrored
+#              in memory as ancestor bitsets so eligibility
+#              checks are a single mask comparison
+# =====================================================
+
+import threading
+from collections import deque
+
+import numpy as np
+
+def ensure_prerequisite_tables(conn):
+    """Create the prerequisite edge and closure tables"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS course_prerequisites (
+            prerequisite_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            course_id INTEGER NOT NULL,
+            prerequisite_course_id INTEGER NOT NULL,
+            is_mandatory INTEGER DEFAULT 1,
+            created_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (course_id, prerequisite_course_id),
+            FOREIGN KEY (course_id) REFERENCES courses(course_id),
+            FOREIGN KEY (prerequisite_course_id) REFERENCES courses(course_id)
+        )
+    ''')
+
+    # One row per (course, mandatory ancestor at any depth)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS course_prerequisite_closure (
+            course_id INTEGER NOT NULL,
+            ancestor_id INTEGER NOT NULL,
+            PRIMARY KEY (course_id, ancestor_id)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_prerequisite_closure_ancestor
+        ON course_prerequisite_closure(ancestor_id)
+    ''')
+
+def completed_course_ids(conn, student_id):
+    """Courses the student has completed"""
+    # Unary + keeps the planner on a student index: the low-selectivity status
+    # index can look better than it is when it has no ANALYZE statistics
+    rows = conn.execute('''
+        SELECT course_id FROM enrollments
+        WHERE student_id = ? AND +completion_status = 'Completed'
+    ''', (student_id,)).fetchall()
+    return [row[0] for row in rows]
+
+class PrerequisiteGraph:
+    """In-memory mirror of the mandatory prerequisite DAG and its closure
+
+    load() and edge edits rebuild the dicts below in place while holding
+    the lock, so every reader takes it too and never sees them half built.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.loaded = False
+        self.parents = {}
+        self.children = {}
+        self.ancestors = {}
+        self._bits = {}
+        self._masks = {}
+
+    # ---- loading ----
+
+    def load(self, conn):
+        """Load edges and closure from SQLite (rebuilding the closure if it is empty)"""
+        with self._lock:
+            edges = conn.execute('''
+                SELECT course_id, prerequisite_course_id FROM course_prerequisites
+                WHERE is_mandatory = 1
+            ''').fetchall()
+            closure = conn.execute('SELECT course_id, ancestor_id FROM course_prerequisite_closure').fetchall()
+
+            self.parents, self.children = {}, {}
+            self.ancestors, self._bits, self._masks = {}, {}, {}
+            for course_id, prereq_id in edges:
+                self.parents.setdefault(course_id, set()).add(prereq_id)
+                self.children.setdefault(prereq_id, set()).add(course_id)
+
+            if edges and not closure:
+                self._recompute(conn, self._topological(self.parents.keys()))
+            else:
+                ancestors = {}
+                for course_id, ancestor_id in closure:
+                    ancestors.setdefault(course_id, set()).add(ancestor_id)
+                self.ancestors = {c: frozenset(a) for c, a in ancestors.items()}
+                for course_id in self.ancestors:
+                    self._refresh_mask(course_id)
+            self.loaded = True
+
+    def ensure_loaded(self, conn):
+        if not self.loaded:
+            self.load(conn)
+        return self
+
+    # ---- bitsets ----
+
+    def _bit(self, course_id):
+        bit = self._bits.get(course_id)
+        if bit is None:
+            bit = self._bits[course_id] = len(self._bits)
+        return bit
+
+    def _refresh_mask(self, course_id):
+        mask = 0
+        for ancestor_id in self.ancestors.get(course_id, ()):
+            mask |= 1 << self._bit(ancestor_id)
+        if mask:
+            self._masks[course_id] = mask
+        else:
+            self._masks.pop(course_id, None)
+
+    def completed_mask(self, completed_ids):
+        """Bitset of completed courses that are prerequisites of anything"""
+        mask = 0
+        with self._lock:
+            for course_id in completed_ids:
+                bit = self._bits.get(course_id)
+                if bit is not None:
+                    mask |= 1 << bit
+        return mask
+
+    # ---- incremental maintenance ----
+
+    def _descendants(self, course_id):
+        found, queue = set(), deque([course_id])
+        while queue:
+            for child in self.children.get(queue.popleft(), ()):
+                if child not in found:
+                    found.add(child)
+                    queue.append(child)
+        return found
+
+    def _topological(self, nodes):
+        """Order nodes so every course comes after its prerequisites within the set"""
+        nodes = set(nodes)
+        indegree = {n: len(self.parents.get(n, set()) & nodes) for n in nodes}
+        queue = deque(sorted(n for n, d in indegree.items() if d == 0))
+        order = []
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for child in sorted(self.children.get(node, set()) & nodes):
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    queue.append(child)
+        return order
+
+    def _recompute(self, conn, ordered):
+        """Rebuild ancestors for the given courses (in topological order) and persist them"""
+        if not ordered:
+            return
+        conn.executemany('DELETE FROM course_prerequisite_closure WHERE course_id = ?',
+                         [(c,) for c in ordered])
+        rows = []
+        for course_id in ordered:
+            ancestors = set()
+            for parent in self.parents.get(course_id, ()):
+                ancestors.add(parent)
+                ancestors |= self.ancestors.get(parent, frozenset())
+            if ancestors:
+                self.ancestors[course_id] = frozenset(ancestors)
+                rows.extend((course_id, a) for a in ancestors)
+            else:
+                self.ancestors.pop(course_id, None)
+            self._refresh_mask(course_id)
+        conn.executemany('''
+            INSERT OR IGNORE INTO course_prerequisite_closure (course_id, ancestor_id)
+            VALUES (?, ?)
+        ''', rows)
+
+    def _begin_edit(self, conn):
+        """Take the database write lock and reload the graph inside that transaction
+
+        Another worker may have changed the edges since this mirror was loaded;
+        the cycle check and the closure rows written must see its edges.
+        """
+        if not conn.in_transaction:
+            conn.execute('BEGIN IMMEDIATE')
+        self.load(conn)
+
+    def add_prerequisite(self, conn, course_id, prereq_id, is_mandatory=True):
+        """Add an edge; raises LookupError for an unknown course, ValueError if it would create a cycle"""
+        with self._lock:
+            self._begin_edit(conn)
+            found = {row[0] for row in conn.execute('SELECT course_id FROM courses WHERE course_id IN (?, ?)',
+                                                    (course_id, prereq_id))}
+            for missing in (course_id, prereq_id):
+                if missing not in found:
+                    raise LookupError(f"Course {missing} not found")
+            if course_id == prereq_id or (is_mandatory and course_id in self.ancestors.get(prereq_id, ())):
+                raise ValueError('Prerequisite would create a cycle')
+
+            conn.execute('''
+                INSERT INTO course_prerequisites (course_id, prerequisite_course_id, is_mandatory)
+                VALUES (?, ?, ?)
+                ON CONFLICT(course_id, prerequisite_course_id) DO UPDATE SET is_mandatory = excluded.is_mandatory
+            ''', (course_id, prereq_id, 1 if is_mandatory else 0))
+            if not is_mandatory:
+                # A downgraded edge no longer constrains the closure
+                if prereq_id in self.parents.get(course_id, ()):
+                    self._drop_edge(conn, course_id, prereq_id)
+                return
+
+            self.parents.setdefault(course_id, set()).add(prereq_id)
+            self.children.setdefault(prereq_id, set()).add(course_id)
+
+            # Everything below course_id gains prereq_id and its ancestors
+            gained = set(self.ancestors.get(prereq_id, ())) | {prereq_id}
+            rows = []
+            for node in self._descendants(course_id) | {course_id}:
+                self.ancestors[node] = frozenset(self.ancestors.get(node, frozenset()) | gained)
+                self._refresh_mask(node)
+                rows.extend((node, a) for a in gained)
+            conn.executemany('''
+                INSERT OR IGNORE INTO course_prerequisite_closure (course_id, ancestor_id)
+                VALUES (?, ?)
+            ''', rows)
+
+    def _drop_edge(self, conn, course_id, prereq_id):
+        self.parents.get(course_id, set()).discard(prereq_id)
+        self.children.get(prereq_id, set()).discard(course_id)
+        affected = self._descendants(course_id) | {course_id}
+        self._recompute(conn, self._topological(affected))
+
+    def remove_prerequisite(self, conn, course_id, prereq_id):
+        """Remove an edge and rebuild the closure for the affected subtree"""
+        with self._lock:
+            self._begin_edit(conn)
+            cursor = conn.execute('''
+                DELETE FROM course_prerequisites WHERE course_id = ? AND prerequisite_course_id = ?
+            ''', (course_id, prereq_id))
+            if prereq_id in self.parents.get(course_id, ()):
+                self._drop_edge(conn, course_id, prereq_id)
+            return cursor.rowcount > 0
+
+    # ---- queries ----
+
+    def prerequisites_of(self, course_id):
+        """Direct mandatory prerequisites of a course"""
+        with self._lock:
+            return frozenset(self.parents.get(course_id, ()))
+
+    def ancestors_of(self, course_id):
+        """Every mandatory prerequisite of a course, at any depth"""
+        with self._lock:
+            return self.ancestors.get(course_id, frozenset())
+
+    def is_eligible(self, course_id, completed_mask):
+        """True when every mandatory prerequisite (at any depth) is completed"""
+        with self._lock:
+            mask = self._masks.get(course_id)
+        return mask is None or (mask & completed_mask) == mask
+
+    def missing_prerequisites(self, course_id, completed_ids):
+        """Uncompleted prerequisites of a course, in the order they should be taken"""
+        completed = set(completed_ids)
+        with self._lock:
+            missing = [a for a in self.ancestors.get(course_id, ()) if a not in completed]
+            return self._topological(missing)
+
+    def learning_path(self, course_id, completed_ids):
+        """Topologically ordered courses to take to reach course_id"""
+        path = self.missing_prerequisites(course_id, completed_ids)
+        if course_id not in set(completed_ids):
+            path.append(course_id)
+        return path
+
+    def student_mask(self, conn, student_id, candidates):
+        """Eligibility mask over ranking candidates for a student"""
+        return self.eligible_mask(candidates, completed_course_ids(conn, student_id))
+
+    def eligible_mask(self, candidates, completed_ids):
+        """Boolean array over ranking candidates: True where prerequisites are met"""
+        mask = np.ones(candidates.size, dtype=bool)
+        # Bits and masks from the same graph state; the comparison runs outside the lock
+        with self._lock:
+            completed = self.completed_mask(completed_ids)
+            masks = list(self._masks.items())
+        for course_id, needed in masks:
+            if (needed & completed) != needed:
+                pos = candidates.position.get(course_id)
+                if pos is not None:
+                    mask[pos] = False
+        return mask
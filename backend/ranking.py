@@ -0,0 +1,284 @@
+# =====================================================
+# AI COURSE RECOMMENDATION SYSTEM - RANKING ENGINE
+# =====================================================
+# Shared course ranking used by Flask and Streamlit
+# Author: Student
+# Date: October 2025
+# Description: Vectorized multi-signal scoring over the whole
+#              candidate set with top-k partial selection
+# =====================================================
+
+import numpy as np
+
+from catalog import catalog_store, load_catalog
+from co_enrollment import co_enrollment_store
+from cohort import cohort_signal
+from cache_backend import shared_cache
+
+# Difficulty / proficiency levels mapped to ordinal codes
+LEVELS = {'Beginner': 1, 'Intermediate': 2, 'Advanced': 3}
+
+# Default signal weights (relative, normalized at scoring time)
+DEFAULT_WEIGHTS = {
+    'skill_match': 0.35,
+    'proficiency_gap': 0.15,
+    'rating': 0.20,
+    'popularity': 0.10,
+    'difficulty_fit': 0.10,
+    'co_enrollment': 0.10,
+    'cohort': 0.10,
+}
+
+class CourseCandidates:
+    """Ranking columns over a CatalogSnapshot plus its skill incidence"""
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.size = catalog.size
+        self.course_ids = catalog.course_ids
+        self.ratings = np.nan_to_num(catalog.ratings)
+        self.enrollments = np.nan_to_num(catalog.enrollments)
+        self.durations = np.nan_to_num(catalog.durations).astype(np.int64)
+        self.levels = catalog.difficulty_codes
+
+        # Map course_id -> row position
+        self.position = {cid: i for i, cid in enumerate(self.course_ids.tolist())}
+
+        # Skill incidence in coordinate form: one entry per (course row, skill)
+        self.skill_rows = catalog.skill_rows
+        self.skill_ids = catalog.skill_ids
+        self.skill_totals = np.bincount(self.skill_rows, minlength=self.size).astype(np.float64)
+
+        # Required level per skill entry, falling back to the course difficulty
+        course_levels = self.levels[self.skill_rows]
+        self.entry_levels = np.where(catalog.skill_levels > 0, catalog.skill_levels, course_levels).astype(np.float64)
+        self.max_skill_id = int(self.skill_ids.max()) if self.skill_ids.size else 0
+
+        # Student-independent signals are computed once per candidate set
+        self.rating_signal = self.ratings / 5.0
+        max_enrollments = self.enrollments.max() if self.size else 0.0
+        if max_enrollments > 0:
+            self.popularity_signal = np.log1p(self.enrollments) / np.log1p(max_enrollments)
+        else:
+            self.popularity_signal = np.zeros(self.size)
+        self._difficulty_fit = {}
+
+    def difficulty_fit(self, target_level):
+        """Closeness of each course's difficulty to the target level (cached per level)"""
+        fit = self._difficulty_fit.get(target_level)
+        if fit is None:
+            fit = 1.0 - np.abs(self.levels - float(target_level)) / 2.0
+            fit = np.where(self.levels > 0, fit, 0.0)
+            self._difficulty_fit[target_level] = fit
+        return fit
+
+    def mask_for(self, course_ids):
+        """Boolean mask selecting the given course ids"""
+        mask = np.zeros(self.size, dtype=bool)
+        positions = [self.position[c] for c in course_ids if c in self.position]
+        mask[positions] = True
+        return mask
+
+    def category_mask(self, categories):
+        """Boolean mask selecting courses in the given categories"""
+        return self.catalog.category_mask(categories)
+
+    def row(self, pos):
+        """One candidate as a new dict of course columns"""
+        return self.catalog.row(pos)
+
+def has_column(conn, table, column):
+    """Check whether a table has a column (older database files may predate it)"""
+    return any(row[1] == column for row in conn.execute(f'PRAGMA table_info({table})'))
+
+def load_candidates(conn):
+    """Load every course and its skills from an open SQLite connection"""
+    return CourseCandidates(load_catalog(conn))
+
+class CandidateCache:
+    """CourseCandidates for the shared catalog snapshot, built once per catalog version"""
+
+    def get(self, conn):
+        snapshot = catalog_store.get(conn)
+        return snapshot.derived('candidates', lambda: CourseCandidates(snapshot))
+
+    def invalidate(self):
+        """Re-check the catalog version in every worker (after a write to courses or course skills)"""
+        shared_cache.invalidate('catalog')
+
+candidate_cache = CandidateCache()
+
+def load_co_enrollment(conn, student_id, candidates, matrix):
+    """Count co-enrollments with the student's courses, aligned to candidates
+
+    Sums the co-enrollment matrix rows for the student's courses, then
+    removes the pairs the student contributes themselves (the matrix may
+    predate their latest enrollments, so counts stop at zero).
+    """
+    mine = [row[0] for row in conn.execute('SELECT course_id FROM enrollments WHERE student_id = ?', (student_id,))]
+    mine = [c for c in mine if c in candidates.position]
+    counts = matrix.counts_for(mine, candidates.course_ids)
+    own = np.bincount(np.asarray([candidates.position[c] for c in mine], dtype=np.int64), minlength=candidates.size)
+    return np.maximum(counts - own * (len(mine) - own), 0.0)
+
+def _normalize_weights(weights):
+    merged = dict(DEFAULT_WEIGHTS)
+    if weights:
+        unknown = set(weights) - set(DEFAULT_WEIGHTS)
+        if unknown:
+            raise ValueError(f"Unknown ranking signals: {', '.join(sorted(unknown))}")
+        merged.update(weights)
+    total = sum(merged.values())
+    if total <= 0:
+        raise ValueError("Ranking weights must sum to a positive value")
+    return {name: value / total for name, value in merged.items()}
+
+def compute_signals(candidates, student_skills=None, target_level=None, co_enrollment=None, cohort=None):
+    """Compute every ranking signal as an array in [0, 1] over all candidates
+
+    student_skills maps skill_id -> proficiency level name (or code); cohort is
+    an already-normalized cohort popularity array aligned to candidates.
+    """
+    n = candidates.size
+    signals = {}
+
+    # Skill match and proficiency gap over the skill incidence entries
+    if student_skills and candidates.skill_ids.size:
+        # Dense skill_id -> student level table, gathered once per incidence entry
+        table = np.zeros(candidates.max_skill_id + 1, dtype=np.float64)
+        for skill_id, level in student_skills.items():
+            if 0 <= skill_id <= candidates.max_skill_id:
+                table[skill_id] = LEVELS.get(level, 0) if isinstance(level, str) else level
+        entry_student = table[candidates.skill_ids]
+        has_skill = (entry_student > 0).astype(np.float64)
+
+        matched = np.bincount(candidates.skill_rows, weights=has_skill, minlength=n)
+        totals = candidates.skill_totals
+        signals['skill_match'] = np.divide(matched, totals, out=np.zeros(n), where=totals > 0)
+
+        # Best next step requires one level above the student's proficiency in that skill
+        np.minimum(entry_student + 1.0, 3.0, out=entry_student)
+        entry_fit = (1.0 - np.abs(candidates.entry_levels - entry_student) / 2.0) * has_skill
+        fit_sum = np.bincount(candidates.skill_rows, weights=entry_fit, minlength=n)
+        signals['proficiency_gap'] = np.divide(fit_sum, matched, out=np.zeros(n), where=matched > 0)
+        signals['matching_skills'] = matched
+    else:
+        signals['skill_match'] = np.zeros(n)
+        signals['proficiency_gap'] = np.zeros(n)
+        signals['matching_skills'] = np.zeros(n)
+
+    signals['rating'] = candidates.rating_signal
+    signals['popularity'] = candidates.popularity_signal
+
+    if isinstance(target_level, str):
+        target_level = LEVELS.get(target_level)
+    if target_level:
+        signals['difficulty_fit'] = candidates.difficulty_fit(int(target_level))
+    else:
+        signals['difficulty_fit'] = np.zeros(n)
+
+    if co_enrollment is not None and co_enrollment.size and co_enrollment.max() > 0:
+        signals['co_enrollment'] = co_enrollment / co_enrollment.max()
+    else:
+        signals['co_enrollment'] = np.zeros(n)
+
+    signals['cohort'] = cohort if cohort is not None else np.zeros(n)
+
+    return signals
+
+def score_signals(signals, weights=None):
+    """Weighted sum of signals scaled to 0-100"""
+    normalized = _normalize_weights(weights)
+    scores = np.zeros_like(signals['rating'])
+    for name, weight in normalized.items():
+        if weight:
+            scores += weight * signals[name]
+    return scores * 100.0
+
+def top_k(scores, k, mask=None):
+    """Indices of the k best scores (descending), using partial selection"""
+    if mask is not None:
+        eligible = np.flatnonzero(mask)
+        scores = scores[eligible]
+    else:
+        eligible = None
+
+    k = min(k, scores.size)
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+
+    if k < scores.size:
+        part = np.argpartition(-scores, k - 1)[:k]
+    else:
+        part = np.arange(scores.size)
+    # Stable ordering: score descending, then original position
+    best = part[np.lexsort((part, -scores[part]))]
+    return eligible[best] if eligible is not None else best
+
+def rank_courses(candidates, k=5, student_skills=None, target_level=None, exclude_ids=(),
+                 co_enrollment=None, weights=None, mask=None, require_skill_match=False, cohort=None):
+    """Score all candidates and return the top-k as (positions, scores, signals)"""
+    signals = compute_signals(candidates, student_skills, target_level, co_enrollment, cohort)
+    scores = score_signals(signals, weights)
+
+    eligible = np.ones(candidates.size, dtype=bool) if mask is None else mask.copy()
+    if exclude_ids:
+        eligible &= ~candidates.mask_for(exclude_ids)
+    if require_skill_match:
+        eligible &= signals['matching_skills'] > 0
+
+    best = top_k(scores, k, eligible)
+    return best, scores[best], signals
+
+def student_profile(conn, student_id):
+    """Fetch a student's skill levels and enrolled course ids"""
+    conn_cursor = conn.cursor()
+    conn_cursor.execute('''
+        SELECT skill_id, proficiency_level FROM student_skills WHERE student_id = ?
+    ''', (student_id,))
+    skills = {skill_id: level for skill_id, level in conn_cursor.fetchall()}
+
+    conn_cursor.execute('SELECT course_id FROM enrollments WHERE student_id = ?', (student_id,))
+    enrolled = [row[0] for row in conn_cursor.fetchall()]
+    return skills, enrolled
+
+def target_level_for(student_skills):
+    """Suggested difficulty: one step above the student's mean proficiency"""
+    if not student_skills:
+        return None
+    codes = [LEVELS.get(v, v) if isinstance(v, str) else v for v in student_skills.values()]
+    return min(3, int(round(sum(codes) / len(codes))) + 1)
+
+def recommend_for_student(conn, student_id, k=5, weights=None, require_skill_match=False,
+                          prerequisites=None, candidates=None, co_enrollment=None):
+    """Full recommendation pipeline for a student: rows annotated with scores
+
+    When a PrerequisiteGraph is given, courses whose prerequisites the student
+    has not completed are filtered out. candidates defaults to a fresh catalog load,
+    co_enrollment (a CoEnrollment) to the shared matrix, if it has been built yet.
+    """
+    if candidates is None:
+        candidates = load_candidates(conn)
+    if co_enrollment is None:
+        co_enrollment = co_enrollment_store.get(conn)
+    skills, enrolled = student_profile(conn, student_id)
+    co_counts = None
+    if enrolled and co_enrollment is not None:
+        co_counts = load_co_enrollment(conn, student_id, candidates, co_enrollment)
+    cohort = cohort_signal(conn, student_id, candidates)
+    mask = prerequisites.student_mask(conn, student_id, candidates) if prerequisites is not None else None
+
+    best, scores, signals = rank_courses(
+        candidates, k=k, student_skills=skills, target_level=target_level_for(skills),
+        exclude_ids=enrolled, co_enrollment=co_counts, weights=weights, mask=mask,
+        require_skill_match=require_skill_match, cohort=cohort
+    )
+    results = []
+    for pos, score in zip(best.tolist(), scores.tolist()):
+        row = candidates.row(pos)
+        row['matching_skills'] = int(signals['matching_skills'][pos])
+        row['skill_match_ratio'] = float(signals['skill_match'][pos])
+        row['cohort_score'] = round(float(signals['cohort'][pos]) * 100.0, 2)
+        row['match_score'] = round(score, 2)
+        results.append(row)
+    return results
@@ -0,0 +1,313 @@
+# =====================================================
+# AI COURSE RECOMMENDATION SYSTEM - RERUN PROFILER
+# =====================================================
+# Where each Streamlit rerun spends its time
+# Author: Student
+# Date: October 2025
+# Description: Times every rerun's page function, DB calls and
+#              chart builds, attributes them to the session and
+#              page, samples full cProfile stacks at a configurable
+#              rate and writes everything to a local SQLite store
+# =====================================================
+#
+# Settings (environment):
+#   RERUN_PROFILING=0          turn the hooks off
+#   RERUN_PROFILE_SAMPLE=0.02  share of reruns that also record a cProfile
+#   RERUN_PROFILE_DB=rerun_profiles.db
+#
+# Analysis (from backend/ or the repo root):
+#   python backend/rerun_profiler.py summary --db rerun_profiles.db
+#   python backend/rerun_profiler.py stacks --db rerun_profiles.db --page "Browse Courses"
+
+import argparse
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import queue
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from sql_metrics import add_listener
+
+ENABLED = os.environ.get('RERUN_PROFILING', '1') != '0'
+SAMPLE_RATE = float(os.environ.get('RERUN_PROFILE_SAMPLE', '0.02'))
+STORE_PATH = os.environ.get('RERUN_PROFILE_DB', 'rerun_profiles.db')
+
+# Lines of the sorted cProfile listing kept as text next to the raw stats
+STACK_LINES = 40
+
+_local = threading.local()
+
+class RerunProfile:
+    """Timings for one script rerun, grouped into spans by kind and name"""
+
+    def __init__(self, session_id, page=None):
+        self.session_id = session_id
+        self.page = page
+        self.started_at = datetime.now().isoformat()
+        self.total = 0.0
+        self.spans = {}
+        self.stats = None
+
+    def add(self, kind, name, seconds):
+        key = (kind, name)
+        span = self.spans.get(key)
+        if span is None:
+            self.spans[key] = [1, seconds]
+        else:
+            span[0] += 1
+            span[1] += seconds
+
+    def kind_totals(self):
+        """{kind: (calls, seconds)} over every span"""
+        totals = {}
+        for (kind, _), (calls, seconds) in self.spans.items():
+            total_calls, total_seconds = totals.get(kind, (0, 0.0))
+            totals[kind] = (total_calls + calls, total_seconds + seconds)
+        return totals
+
+def current_profile():
+    return getattr(_local, 'profile', None)
+
+@contextmanager
+def span(kind, name):
+    """Time a block into the current rerun's profile (no-op outside a rerun)"""
+    profile = current_profile()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(kind, name, time.perf_counter() - started)
+
+def _on_query(stats, elapsed_ms, rows):
+    profile = current_profile()
+    if profile is not None:
+        profile.add('db', f"{stats.caller}: {stats.name}", elapsed_ms / 1000.0)
+
+add_listener(_on_query)
+
+@contextmanager
+def profile_rerun(session_id, store=None, sample_rate=None):
+    """Profile one rerun on this thread; set .page on the yielded profile once known"""
+    if not ENABLED:
+        yield RerunProfile(session_id)
+        return
+    profile = _local.profile = RerunProfile(session_id)
+    rate = SAMPLE_RATE if sample_rate is None else sample_rate
+    profiler = cProfile.Profile() if rate > 0 and random.random() < rate else None
+    started = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield profile
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.create_stats()
+            profile.stats = profiler.stats
+        profile.total = time.perf_counter() - started
+        _local.profile = None
+        if store is not None:
+            store.submit(profile)
+
+# ---- local store ----
+
+def ensure_profile_tables(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS rerun_profiles (
+            profile_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started_at TEXT NOT NULL,
+            session_id TEXT,
+            page TEXT,
+            total_ms REAL NOT NULL,
+            page_ms REAL DEFAULT 0,
+            db_ms REAL DEFAULT 0,
+            db_calls INTEGER DEFAULT 0,
+            chart_ms REAL DEFAULT 0,
+            charts INTEGER DEFAULT 0,
+            sampled INTEGER DEFAULT 0
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_rerun_profiles_page ON rerun_profiles(page, started_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_rerun_profiles_session ON rerun_profiles(session_id)')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS rerun_spans (
+            profile_id INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            name TEXT NOT NULL,
+            calls INTEGER NOT NULL,
+            total_ms REAL NOT NULL,
+            FOREIGN KEY (profile_id) REFERENCES rerun_profiles(profile_id)
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_rerun_spans_profile ON rerun_spans(profile_id)')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS rerun_stacks (
+            profile_id INTEGER PRIMARY KEY,
+            listing TEXT NOT NULL,
+            raw_stats BLOB NOT NULL,
+            FOREIGN KEY (profile_id) REFERENCES rerun_profiles(profile_id)
+        )
+    ''')
+
+def stats_listing(raw_stats, lines=STACK_LINES):
+    """Text of the top functions by cumulative time from marshalled cProfile stats"""
+    stream = io.StringIO()
+    stats = pstats.Stats(_StatsHolder(raw_stats), stream=stream)
+    stats.sort_stats('cumulative').print_stats(lines)
+    return stream.getvalue()
+
+class _StatsHolder:
+    """Minimal object pstats.Stats accepts in place of a Profile"""
+
+    def __init__(self, raw_stats):
+        self.stats = raw_stats
+
+    def create_stats(self):
+        pass
+
+class ProfileStore:
+    """Writes finished rerun profiles from a background thread so reruns never wait on disk"""
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        self._queue = queue.Queue(maxsize=10000)
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._writer, name='rerun-profile-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, profile):
+        try:
+            self._queue.put_nowait(profile)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout=5.0):
+        """Wait until every submitted profile is written"""
+        deadline = time.time() + timeout
+        while self._queue.unfinished_tasks and time.time() < deadline:
+            time.sleep(0.01)
+
+    def _writer(self):
+        conn = sqlite3.connect(self.path)
+        ensure_profile_tables(conn)
+        conn.commit()
+        while True:
+            profile = self._queue.get()
+            try:
+                self._write(conn, profile)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, conn, profile):
+        totals = profile.kind_totals()
+        page_calls, page_s = totals.get('page', (0, 0.0))
+        db_calls, db_s = totals.get('db', (0, 0.0))
+        charts, chart_s = totals.get('chart', (0, 0.0))
+        cursor = conn.execute('''
+            INSERT INTO rerun_profiles (started_at, session_id, page, total_ms, page_ms, db_ms, db_calls,
+                                        chart_ms, charts, sampled)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (profile.started_at, profile.session_id, profile.page, profile.total * 1000, page_s * 1000,
+              db_s * 1000, db_calls, chart_s * 1000, charts, int(profile.stats is not None)))
+        profile_id = cursor.lastrowid
+        conn.executemany('INSERT INTO rerun_spans (profile_id, kind, name, calls, total_ms) VALUES (?, ?, ?, ?, ?)',
+                         [(profile_id, kind, name, calls, seconds * 1000)
+                          for (kind, name), (calls, seconds) in profile.spans.items()])
+        if profile.stats is not None:
+            conn.execute('INSERT INTO rerun_stacks (profile_id, listing, raw_stats) VALUES (?, ?, ?)',
+                         (profile_id, stats_listing(profile.stats), marshal.dumps(profile.stats)))
+        conn.commit()
+
+# ---- analysis ----
+
+def page_summary(conn):
+    """Per-page rerun count, latency percentiles and the share spent in DB and charts"""
+    rows = conn.execute('''
+        SELECT page, total_ms, db_ms, chart_ms FROM rerun_profiles ORDER BY page, total_ms
+    ''').fetchall()
+    pages = {}
+    for page, total_ms, db_ms, chart_ms in rows:
+        pages.setdefault(page, []).append((total_ms, db_ms, chart_ms))
+    summary = []
+    for page, values in pages.items():
+        totals = [v[0] for v in values]
+        n = len(totals)
+        summary.append({
+            'page': page,
+            'reruns': n,
+            'p50_ms': totals[n // 2],
+            'p95_ms': totals[min(n - 1, int(n * 0.95))],
+            'mean_ms': sum(totals) / n,
+            'db_share': sum(v[1] for v in values) / max(sum(totals), 1e-9),
+            'chart_share': sum(v[2] for v in values) / max(sum(totals), 1e-9),
+        })
+    return sorted(summary, key=lambda r: r['p95_ms'], reverse=True)
+
+def top_spans(conn, page=None, kind=None, limit=15):
+    """Spans with the most total time, optionally for one page or span kind"""
+    return conn.execute('''
+        SELECT p.page, s.kind, s.name, SUM(s.calls), SUM(s.total_ms), COUNT(DISTINCT s.profile_id)
+        FROM rerun_spans s
+        JOIN rerun_profiles p ON p.profile_id = s.profile_id
+        WHERE (? IS NULL OR p.page = ?) AND (? IS NULL OR s.kind = ?)
+        GROUP BY p.page, s.kind, s.name
+        ORDER BY SUM(s.total_ms) DESC
+        LIMIT ?
+    ''', (page, page, kind, kind, limit)).fetchall()
+
+def merged_stacks(conn, page=None):
+    """pstats.Stats combining every sampled cProfile (for one page if given)"""
+    rows = conn.execute('''
+        SELECT k.raw_stats FROM rerun_stacks k
+        JOIN rerun_profiles p ON p.profile_id = k.profile_id
+        WHERE ? IS NULL OR p.page = ?
+    ''', (page, page)).fetchall()
+    if not rows:
+        return None
+    stats = pstats.Stats(_StatsHolder(marshal.loads(rows[0][0])))
+    for (raw,) in rows[1:]:
+        stats.add(_StatsHolder(marshal.loads(raw)))
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description='Analyse recorded Streamlit rerun profiles')
+    parser.add_argument('command', choices=['summary', 'stacks'])
+    parser.add_argument('--db', default=STORE_PATH, help='Profile store written by the Streamlit app')
+    parser.add_argument('--page', help='Only this page')
+    parser.add_argument('--lines', type=int, default=STACK_LINES, help='Functions to list for stacks')
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    if args.command == 'summary':
+        header = f"{'page':<22}{'reruns':>8}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}{'db %':>8}{'chart %':>9}"
+        print(header)
+        print('-' * len(header))
+        for r in page_summary(conn):
+            if args.page and r['page'] != args.page:
+                continue
+            print(f"{str(r['page']):<22}{r['reruns']:>8}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}"
+                  f"{r['mean_ms']:>10.1f}{r['db_share'] * 100:>7.1f}%{r['chart_share'] * 100:>8.1f}%")
+        print()
+        print('Top spans:')
+        for page, kind, name, calls, total_ms, reruns in top_spans(conn, page=args.page):
+            print(f"  {total_ms:>10.1f} ms  {calls:>6} calls  {reruns:>5} reruns  [{kind}] {page}: {name}")
+    else:
+        stats = merged_stacks(conn, args.page)
+        if stats is None:
+            print('No sampled stacks recorded (raise RERUN_PROFILE_SAMPLE)')
+        else:
+            stats.sort_stats('cumulative').print_stats(args.lines)
+    conn.close()
+
+if __name__ == '__main__':
+    main()
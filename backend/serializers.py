@@ -0,0 +1,149 @@
+# =====================================================
+# AI COURSE RECOMMENDATION SYSTEM - SERIALIZATION
+# =====================================================
+# Column projections and a row-to-JSON fast path
+# Author: Student
+# Date: October 2025
+# Description: Each list endpoint names the columns it returns
+#              (clients can narrow them with ?fields=a,b), selects
+#              only those, and encodes the result rows straight from
+#              tuples into JSON text without a dict per row; large
+#              lists can also be streamed as NDJSON batch by batch
+# =====================================================
+#
+# Settings (environment):
+#   STREAM_BATCH=500                rows fetched and written per NDJSON chunk
+#
+# Output is the same compact, ASCII-escaped JSON that jsonify produces,
+# except that object keys follow the projection order instead of being
+# sorted.
+
+import json
+import os
+from json.encoder import encode_basestring_ascii
+
+from flask import Response, request
+
+NDJSON = 'application/x-ndjson'
+STREAM_BATCH = int(os.environ.get('STREAM_BATCH', '500'))
+
+class RawJSON:
+    """Already encoded JSON text, written into the output as is"""
+
+    def __init__(self, text):
+        self.text = text
+
+def _float(value):
+    if value != value:
+        return 'NaN'
+    if value in (float('inf'), float('-inf')):
+        return 'Infinity' if value > 0 else '-Infinity'
+    return float.__repr__(value)
+
+_ENCODERS = {
+    str: encode_basestring_ascii,
+    int: int.__repr__,
+    float: _float,
+    type(None): lambda value: 'null',
+    bool: lambda value: 'true' if value else 'false',
+    RawJSON: lambda value: value.text,
+}
+
+def encode_value(value):
+    """JSON text of one scalar (anything else goes through json.dumps)"""
+    encoder = _ENCODERS.get(type(value))
+    if encoder is None:
+        return json.dumps(value, separators=(',', ':'))
+    return encoder(value)
+
+class Projection:
+    """Fields an endpoint can return (field -> SQL expression) and the ones it returns by default"""
+
+    def __init__(self, columns, default=None):
+        self.columns = dict(columns)
+        self.default = tuple(default or self.columns)
+
+    def fields(self, requested=None):
+        """Fields named by a comma separated fields= value, or the default projection
+
+        Raises ValueError naming any field the endpoint does not have.
+        """
+        if not requested:
+            return self.default
+        names = tuple(dict.fromkeys(name.strip() for name in requested.split(',') if name.strip()))
+        unknown = [name for name in names if name not in self.columns]
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(unknown)}; available: {', '.join(self.columns)}")
+        return names or self.default
+
+    def select(self, fields):
+        """SQL select list for fields"""
+        return ', '.join(self.columns[field] if self.columns[field] == field
+                         else f"{self.columns[field]} AS {field}" for field in fields)
+
+def _row_template(fields):
+    return '{' + ','.join(encode_basestring_ascii(field).replace('%', '%%') + ':%s' for field in fields) + '}'
+
+def encode_rows(fields, rows, template=None):
+    """JSON object text for each row tuple (values in fields order)"""
+    template = template or _row_template(fields)
+    encode = encode_value
+    return [template % tuple(map(encode, row)) for row in rows]
+
+class RowsJSON(RawJSON):
+    """A JSON array of objects encoded from row tuples whose values are in fields order"""
+
+    def __init__(self, fields, rows):
+        parts = encode_rows(fields, rows)
+        self.count = len(parts)
+        super().__init__('[' + ','.join(parts) + ']')
+
+def dumps(payload):
+    """Compact JSON text of payload; RawJSON values anywhere in nested dicts are spliced in as is"""
+    if isinstance(payload, RawJSON):
+        return payload.text
+    if isinstance(payload, dict):
+        return '{' + ','.join(encode_basestring_ascii(str(key)) + ':' + dumps(value)
+                              for key, value in payload.items()) + '}'
+    return json.dumps(payload, separators=(',', ':'))
+
+def json_response(payload, status=200):
+    """Flask response for payload encoded with dumps"""
+    return Response(dumps(payload), status=status, mimetype='application/json')
+
+# ---- NDJSON streaming ----
+
+def wants_ndjson():
+    """True when the request's Accept header prefers NDJSON to JSON"""
+    return request.accept_mimetypes.best_match(['application/json', NDJSON]) == NDJSON
+
+def cursor_batches(cursor, size=None):
+    """Row lists read from an executed cursor with fetchmany"""
+    size = size or STREAM_BATCH
+    while True:
+        rows = cursor.fetchmany(size)
+        if not rows:
+            return
+        yield rows
+
+def ndjson_response(fields, batches, on_close=None):
+    """Streaming response writing one JSON object per line, one chunk per batch of row tuples
+
+    Only one batch is held at a time. on_close (e.g. closing the connection
+    the cursor reads from) runs when the response is closed, including when
+    the client disconnects mid-stream.
+    """
+    template = _row_template(fields)
+
+    def generate():
+        for rows in batches:
+            if rows:
+                yield '\n'.join(encode_rows(fields, rows, template)) + '\n'
+
+    response = Response(generate(), mimetype=NDJSON)
+    if on_close is not None:
+        response.call_on_close(on_close)
+    # Proxies should pass chunks on as they come
+    response.headers['X-Accel-Buffering'] = 'no'
+    response.vary.add('Accept')
+    return response
@@ -0,0 +1,218 @@
+# =====================================================
+# AI COURSE RECOMMENDATION SYSTEM - SKILL GAP ENGINE
+# =====================================================
+# Proficiency-aware skill-gap scoring
+# Author: Student
+# Date: October 2025
+# Description: Students and courses as weighted skill vectors;
+#              batch gap/readiness per course and cached
+#              per-student skill levels updated on skill changes
+# =====================================================
+#
+# Settings (environment):
+#   SKILL_CACHE_STUDENTS=10000      students whose skill levels each process keeps (LRU)
+#
+# A student is cached as sorted (skill_ids, levels) arrays holding only the
+# skills they have, so memory follows their profile, not the taxonomy size.
+
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from catalog import catalog_store
+from ranking import LEVELS, has_column, top_k
+from metrics import CACHE_LOOKUPS
+
+SKILL_CACHE_STUDENTS = int(os.environ.get('SKILL_CACHE_STUDENTS', '10000'))
+
+def ensure_required_level_column(conn):
+    """Add course_skills.required_level to databases created before it existed"""
+    if not has_column(conn, 'course_skills', 'required_level'):
+        conn.execute('''
+            ALTER TABLE course_skills ADD COLUMN required_level TEXT
+            CHECK(required_level IN ('Beginner', 'Intermediate', 'Advanced'))
+        ''')
+
+class CourseSkillMatrix:
+    """Sparse course x skill matrix of required levels (coordinate form)"""
+
+    def __init__(self, course_ids, rows, skills, required):
+        self.course_ids = np.asarray(course_ids, dtype=np.int64)
+        self.size = self.course_ids.size
+        self.position = {cid: i for i, cid in enumerate(self.course_ids.tolist())}
+        self.rows = np.ascontiguousarray(rows, dtype=np.int64)
+        self.skills = np.ascontiguousarray(skills, dtype=np.int64)
+        self.required = np.asarray(required, dtype=np.float64)
+
+        self.max_skill_id = int(self.skills.max()) if self.skills.size else 0
+        self.required_totals = np.bincount(self.rows, weights=self.required, minlength=self.size)
+        self.skill_counts = np.bincount(self.rows, minlength=self.size)
+
+def load_course_matrix(conn):
+    """Load required skill levels for every course"""
+    course_ids = [row[0] for row in conn.execute('SELECT course_id FROM courses ORDER BY course_id')]
+    if has_column(conn, 'course_skills', 'required_level'):
+        level_sql = 'COALESCE(cs.required_level, c.difficulty_level)'
+    else:
+        level_sql = 'c.difficulty_level'
+    entries = conn.execute(f'''
+        SELECT cs.course_id, cs.skill_id, {level_sql}
+        FROM course_skills cs
+        JOIN courses c ON c.course_id = cs.course_id
+    ''').fetchall()
+    position = {cid: i for i, cid in enumerate(course_ids)}
+    data = np.array([(position[c], s, LEVELS.get(level, 1)) for c, s, level in entries if c in position],
+                    dtype=np.int64).reshape(-1, 3)
+    return CourseSkillMatrix(course_ids, data[:, 0], data[:, 1], data[:, 2])
+
+def course_matrix_from_catalog(catalog):
+    """CourseSkillMatrix over a CatalogSnapshot's skill incidence (no query)"""
+    levels = np.where(catalog.skill_levels > 0, catalog.skill_levels, catalog.difficulty_codes[catalog.skill_rows])
+    return CourseSkillMatrix(catalog.course_ids, catalog.skill_rows, catalog.skill_ids, np.where(levels > 0, levels, 1))
+
+def student_levels(rows):
+    """Sorted (skill_ids, levels) arrays from (skill_id, proficiency_level) rows"""
+    pairs = sorted((int(skill_id), LEVELS.get(level, 0)) for skill_id, level in rows)
+    return (np.array([p[0] for p in pairs], dtype=np.int64),
+            np.array([p[1] for p in pairs], dtype=np.float64))
+
+def levels_at(student, skills):
+    """A student's level for each skill id in skills (0 for skills they lack)"""
+    ids, levels = student
+    if not ids.size:
+        return np.zeros(len(skills), dtype=np.float64)
+    pos = np.minimum(np.searchsorted(ids, skills), ids.size - 1)
+    return np.where(ids[pos] == skills, levels[pos], 0.0)
+
+class SkillGapEngine:
+    """Batch gap and readiness scoring with cached student skill levels"""
+
+    def __init__(self, max_students=SKILL_CACHE_STUDENTS):
+        self.max_students = max_students
+        self._lock = threading.Lock()
+        self._students = OrderedDict()
+
+    def _remember(self, student_id, student, replace=True):
+        """Cache one student's levels, evicting the least recently used (caller holds the lock)"""
+        if replace or student_id not in self._students:
+            self._students[student_id] = student
+        self._students.move_to_end(student_id)
+        while len(self._students) > self.max_students:
+            self._students.popitem(last=False)
+
+    # ---- cache management ----
+
+    def course_matrix(self, conn):
+        """Skill matrix of the shared catalog snapshot, derived once per catalog version"""
+        catalog = catalog_store.get(conn)
+        built = []
+        matrix = catalog.derived('skill_matrix', lambda: built.append(True) or course_matrix_from_catalog(catalog))
+        CACHE_LOOKUPS.inc(('course_skill_matrix', 'miss' if built else 'hit'))
+        return matrix
+
+    def invalidate_courses(self):
+        catalog_store.invalidate()
+
+    def invalidate_student(self, student_id):
+        with self._lock:
+            self._students.pop(student_id, None)
+
+    def clear_students(self):
+        with self._lock:
+            self._students.clear()
+
+    def student_levels(self, conn, student_id):
+        """Sorted (skill_ids, levels) arrays for a student (cached)"""
+        with self._lock:
+            student = self._students.get(student_id)
+            if student is not None:
+                self._students.move_to_end(student_id)
+        CACHE_LOOKUPS.inc(('student_skill_vector', 'miss' if student is None else 'hit'))
+        if student is None:
+            student = student_levels(conn.execute('''
+                SELECT skill_id, proficiency_level FROM student_skills WHERE student_id = ?
+            ''', (student_id,)).fetchall())
+            with self._lock:
+                self._remember(student_id, student)
+        return student
+
+    def preload_students(self, conn, student_ids):
+        """Load the levels of several students with one query; returns {student_id: (skill_ids, levels)}"""
+        student_ids = [int(s) for s in student_ids]
+        if not student_ids:
+            return {}
+        placeholders = ','.join('?' * len(student_ids))
+        rows = {student_id: [] for student_id in student_ids}
+        for student_id, skill_id, level in conn.execute(f'''
+            SELECT student_id, skill_id, proficiency_level FROM student_skills
+            WHERE student_id IN ({placeholders})
+        ''', student_ids):
+            rows[student_id].append((skill_id, level))
+        students = {student_id: student_levels(pairs) for student_id, pairs in rows.items()}
+        self.install_students(students)
+        return students
+
+    def install_students(self, students):
+        """Add precomputed levels without replacing ones already cached"""
+        with self._lock:
+            for student_id, student in students.items():
+                self._remember(student_id, student, replace=False)
+
+    def update_student_skill(self, student_id, skill_id, level):
+        """Apply a skill change to the cached levels without reloading them"""
+        with self._lock:
+            student = self._students.get(student_id)
+            if student is None:
+                return
+            ids, levels = student
+            value = LEVELS.get(level, 0) if level else 0
+            pos = int(np.searchsorted(ids, skill_id))
+            if pos < ids.size and ids[pos] == skill_id:
+                levels = levels.copy()
+                levels[pos] = value
+            else:
+                ids, levels = np.insert(ids, pos, skill_id), np.insert(levels, pos, value)
+            self._students[student_id] = (ids, levels)
+
+    # ---- scoring ----
+
+    def gap_scores(self, conn, student_id):
+        """Per-course (gap, readiness, missing_skills) arrays for a student
+
+        gap is the share of required skill levels the student still lacks;
+        readiness is its complement.
+        """
+        matrix = self.course_matrix(conn)
+        have = levels_at(self.student_levels(conn, student_id), matrix.skills)
+        shortfall = np.maximum(matrix.required - have, 0.0)
+        missing = np.bincount(matrix.rows, weights=(have == 0).astype(np.float64), minlength=matrix.size)
+        gap = np.divide(
+            np.bincount(matrix.rows, weights=shortfall, minlength=matrix.size),
+            matrix.required_totals, out=np.zeros(matrix.size), where=matrix.required_totals > 0
+        )
+        readiness = np.where(matrix.skill_counts > 0, 1.0 - gap, 0.0)
+        return gap, readiness, missing
+
+    def next_best_courses(self, conn, student_id, k=5, exclude_ids=()):
+        """Courses the student is closest to being ready for that still teach something new"""
+        matrix = self.course_matrix(conn)
+        gap, readiness, missing = self.gap_scores(conn, student_id)
+
+        eligible = gap > 0
+        for course_id in exclude_ids:
+            pos = matrix.position.get(course_id)
+            if pos is not None:
+                eligible[pos] = False
+
+        best = top_k(readiness, k, eligible)
+        return [
+            {
+                'course_id': int(matrix.course_ids[pos]),
+                'readiness': round(float(readiness[pos]), 3),
+                'skill_gap': round(float(gap[pos]), 3),
+                'missing_skills': int(missing[pos]),
+            }
+            for pos in best.tolist()
+        ]
@@ -0,0 +1,120 @@
+# =====================================================
+# AI COURSE RECOMMENDATION SYSTEM - SNAPSHOT FILES
+# =====================================================
+# Read-only, memory-mapped column files
+# Author: Student
+# Date: October 2025
+# Description: Writes a set of numpy columns (and string columns
+#              as offsets + UTF-8 bytes) to one file that other
+#              processes open with mmap, so every worker shares the
+#              same physical pages instead of holding its own copy
+# =====================================================
+#
+# Layout: 8-byte magic, 8-byte header length, JSON header, then each
+# column's raw bytes at a 64-byte aligned offset. The header lists
+# dtype, shape and offset per column plus caller metadata. Files are
+# written to a temporary name and published with os.replace, so a
+# reader sees either the old file or the complete new one.
+
+import json
+import mmap
+import os
+
+import numpy as np
+
+MAGIC = b'CSNAP001'
+ALIGN = 64
+
+class StringColumn:
+    """Sequence of optional strings decoded on access from a mapped byte blob"""
+
+    def __init__(self, offsets, blob, nulls):
+        self.offsets = offsets
+        self.blob = blob
+        self.nulls = nulls
+
+    def __len__(self):
+        return self.offsets.size - 1
+
+    def __getitem__(self, pos):
+        if self.nulls[pos]:
+            return None
+        return self.blob[self.offsets[pos]:self.offsets[pos + 1]].tobytes().decode('utf-8')
+
+    def __iter__(self):
+        return (self[pos] for pos in range(len(self)))
+
+def encode_strings(values):
+    """(offsets, blob, nulls) arrays for a sequence of optional strings"""
+    encoded = [b'' if v is None else str(v).encode('utf-8') for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    blob = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    nulls = np.array([v is None for v in values], dtype=np.bool_)
+    return offsets, blob, nulls
+
+def _is_strings(column):
+    return isinstance(column, (StringColumn, list, tuple)) or column.dtype == object
+
+def write_snapshot(path, columns, meta=None):
+    """Write columns (name -> array or string sequence) to path atomically"""
+    parts, layout = [], {}
+    for name, column in columns.items():
+        if _is_strings(column):
+            offsets, blob, nulls = encode_strings(list(column))
+            layout[name] = {'kind': 'strings', 'parts': {}}
+            for part, array in (('offsets', offsets), ('blob', blob), ('nulls', nulls)):
+                layout[name]['parts'][part] = entry = {'dtype': array.dtype.str, 'shape': list(array.shape)}
+                parts.append((entry, array))
+        else:
+            array = np.ascontiguousarray(column)
+            layout[name] = entry = {'kind': 'array', 'dtype': array.dtype.str, 'shape': list(array.shape)}
+            parts.append((entry, array))
+
+    # Offsets are relative to the end of the header, so they can be fixed before its length is known
+    position = 0
+    for entry, array in parts:
+        position = -(-position // ALIGN) * ALIGN
+        entry['offset'] = position
+        position += array.nbytes
+    header = json.dumps({'meta': meta or {}, 'columns': layout}).encode('utf-8')
+    data_start = -(-(16 + len(header)) // ALIGN) * ALIGN
+
+    partial = f"{path}.{os.getpid()}.tmp"
+    with open(partial, 'wb') as f:
+        f.write(MAGIC)
+        f.write(len(header).to_bytes(8, 'little'))
+        f.write(header)
+        for entry, array in parts:
+            f.seek(data_start + entry['offset'])
+            f.write(array.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(partial, path)
+
+def open_snapshot(path):
+    """Map a snapshot file read-only; returns (meta, columns)"""
+    with open(path, 'rb') as f:
+        if f.read(8) != MAGIC:
+            raise ValueError(f"{path} is not a snapshot file")
+        header_length = int.from_bytes(f.read(8), 'little')
+        header = json.loads(f.read(header_length).decode('utf-8'))
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    data_start = -(-(16 + header_length) // ALIGN) * ALIGN
+
+    def view(entry):
+        dtype = np.dtype(entry['dtype'])
+        count = int(np.prod(entry['shape'], dtype=np.int64))
+        if not count:
+            return np.empty(entry['shape'], dtype=dtype)
+        array = np.frombuffer(mapped, dtype=dtype, count=count, offset=data_start + entry['offset'])
+        return array.reshape(entry['shape'])
+
+    columns = {}
+    for name, entry in header['columns'].items():
+        if entry['kind'] == 'strings':
+            parts = entry['parts']
+            columns[name] = StringColumn(view(parts['offsets']), view(parts['blob']), view(parts['nulls']))
+        else:
+            columns[name] = view(entry)
+    return header['meta'], columns
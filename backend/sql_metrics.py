@@ -0,0 +1,338 @@
+# =====================================================
+# AI COURSE RECOMMENDATION SYSTEM - SQL INSTRUMENTATION
+# =====================================================
+# Per-statement timing shared by the Flask and Streamlit apps
+# Author: Student
+# Date: October 2025
+# Description: Connection/cursor wrappers that tag each statement
+#              with a query name and calling function, keep latency
+#              histograms and row counts, and log slow statements
+#              with their EXPLAIN QUERY PLAN and full-scan flags
+# =====================================================
+#
+# Settings (environment):
+#   SQL_INSTRUMENTATION=0   plain sqlite3 connections, no bookkeeping
+#   SQL_SLOW_MS=100         statements at or above this go to the slow-query log
+#
+# Fast statements cost two perf_counter() calls, a short stack walk and a
+# counter update; EXPLAIN QUERY PLAN only runs for slow statements and is
+# cached per SQL text.
+
+import collections
+import functools
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+from metrics import DB_CONNECTIONS
+
+logger = logging.getLogger('sql_metrics')
+
+ENABLED = os.environ.get('SQL_INSTRUMENTATION', '1') != '0'
+SLOW_QUERY_MS = float(os.environ.get('SQL_SLOW_MS', '100'))
+
+# Latency histogram bucket upper bounds in milliseconds (last bucket is open)
+BUCKETS_MS = (0.1, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+SLOW_LOG_SIZE = 200
+PLAN_CACHE_SIZE = 1000
+
+# Frames from these modules are skipped when looking for the calling function
+_SKIP_MODULES = ('sql_metrics', 'sqlite3', 'pandas')
+
+_STATEMENT = re.compile(r'^\s*(?:--[^\n]*\n\s*|/\*.*?\*/\s*)*(?:WITH\b.*?\)\s*)?(\w+)', re.S | re.I)
+_TABLE = re.compile(r'\b(?:FROM|INTO|UPDATE|JOIN|(?:TABLE|INDEX)(?:\s+IF\s+(?:NOT\s+)?EXISTS)?)\s+([A-Za-z_][\w]*)', re.I)
+
+class QueryStats:
+    """Counters and latency histogram for one (caller, query name) pair
+
+    sql keeps the first statement text seen under that name as an example.
+    """
+
+    __slots__ = ('caller', 'name', 'sql', 'count', 'errors', 'rows', 'total_ms', 'max_ms', 'buckets',
+                 'slow', 'full_scan', 'lock')
+
+    def __init__(self, caller, name, sql):
+        self.caller = caller
+        self.name = name
+        self.sql = sql
+        self.count = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.slow = 0
+        self.full_scan = False
+        self.lock = threading.Lock()
+
+    def observe(self, elapsed_ms, rows, error=False):
+        index = 0
+        while index < len(BUCKETS_MS) and elapsed_ms > BUCKETS_MS[index]:
+            index += 1
+        with self.lock:
+            self.count += 1
+            self.rows += rows
+            self.total_ms += elapsed_ms
+            if elapsed_ms > self.max_ms:
+                self.max_ms = elapsed_ms
+            self.buckets[index] += 1
+            if error:
+                self.errors += 1
+
+    def as_dict(self):
+        with self.lock:
+            return {
+                'caller': self.caller,
+                'query': self.name,
+                'sql': self.sql,
+                'count': self.count,
+                'errors': self.errors,
+                'rows': self.rows,
+                'total_ms': round(self.total_ms, 3),
+                'mean_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+                'max_ms': round(self.max_ms, 3),
+                'p95_ms': _bucket_percentile(self.buckets, 0.95),
+                'buckets': list(self.buckets),
+                'slow': self.slow,
+                'full_scan': self.full_scan,
+            }
+
+_stats = {}
+_stats_lock = threading.Lock()
+_slow_log = collections.deque(maxlen=SLOW_LOG_SIZE)
+_plan_cache = {}
+_listeners = []
+
+def _bucket_percentile(buckets, q):
+    """Upper bound of the histogram bucket holding the q-th quantile"""
+    total = sum(buckets)
+    if not total:
+        return 0.0
+    running = 0
+    for index, count in enumerate(buckets):
+        running += count
+        if running >= q * total:
+            return BUCKETS_MS[index] if index < len(BUCKETS_MS) else float('inf')
+    return float('inf')
+
+@functools.lru_cache(maxsize=4096)
+def query_name(sql):
+    """Short name for a statement: verb plus first table, e.g. 'select courses'"""
+    verb = _STATEMENT.match(sql)
+    table = _TABLE.search(sql)
+    return ' '.join(part for part in ((verb.group(1).lower() if verb else 'sql'),
+                                      (table.group(1) if table else '')) if part)
+
+def _caller():
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if not module.startswith(_SKIP_MODULES):
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return '?'
+
+def _stats_for(caller, sql):
+    name = query_name(sql)
+    key = (caller, name)
+    stats = _stats.get(key)
+    if stats is None:
+        with _stats_lock:
+            stats = _stats.get(key)
+            if stats is None:
+                stats = _stats[key] = QueryStats(caller, name, ' '.join(sql.split())[:500])
+    return stats
+
+def explain(conn, sql, params=()):
+    """EXPLAIN QUERY PLAN detail lines and whether any step is a full table scan"""
+    cached = _plan_cache.get(sql)
+    if cached is not None:
+        return cached
+    try:
+        rows = sqlite3.Cursor(conn).execute('EXPLAIN QUERY PLAN ' + sql, params).fetchall()
+    except sqlite3.Error:
+        return [], False
+    plan = [row[3] for row in rows]
+    full_scan = any(step.startswith('SCAN ') and ' USING ' not in step for step in plan)
+    if len(_plan_cache) >= PLAN_CACHE_SIZE:
+        _plan_cache.clear()
+    _plan_cache[sql] = (plan, full_scan)
+    return plan, full_scan
+
+def _record_slow(conn, stats, sql, params, elapsed_ms, rows):
+    plan, full_scan = [], False
+    if params is not None and stats.name.split(' ')[0] in ('select', 'with', 'update', 'delete'):
+        plan, full_scan = explain(conn, sql, params)
+    with stats.lock:
+        stats.slow += 1
+        stats.full_scan = stats.full_scan or full_scan
+    text = ' '.join(sql.split())[:500]
+    entry = {
+        'time': time.time(),
+        'caller': stats.caller,
+        'query': stats.name,
+        'sql': text,
+        'elapsed_ms': round(elapsed_ms, 3),
+        'rows': rows,
+        'plan': plan,
+        'full_scan': full_scan,
+    }
+    _slow_log.append(entry)
+    logger.warning(f"Slow query {elapsed_ms:.1f} ms in {stats.caller} ({stats.name})"
+                   f"{' [FULL SCAN]' if full_scan else ''}: {text[:200]} | plan: {'; '.join(plan)}")
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that times execute plus fetch and records it on finish"""
+
+    _pending = None
+
+    def _start(self, sql, params, elapsed):
+        self._finish()
+        self._pending = [_stats_for(_caller(), sql), sql, params, elapsed, 0]
+
+    def _finish(self, error=False):
+        pending = self._pending
+        if pending is None:
+            return
+        self._pending = None
+        stats, sql, params, elapsed, rows = pending
+        elapsed_ms = elapsed * 1000.0
+        stats.observe(elapsed_ms, rows, error)
+        for listener in _listeners:
+            listener(stats, elapsed_ms, rows)
+        if elapsed_ms >= SLOW_QUERY_MS and not error:
+            _record_slow(self.connection, stats, sql, params, elapsed_ms, rows)
+
+    def _run(self, method, sql, params, plan_params):
+        started = time.perf_counter()
+        try:
+            method(sql, params)
+        except Exception:
+            self._start(sql, plan_params, time.perf_counter() - started)
+            self._finish(error=True)
+            raise
+        self._start(sql, plan_params, time.perf_counter() - started)
+        if self.description is None:
+            self._pending[4] = max(self.rowcount, 0)
+            self._finish()
+        return self
+
+    def execute(self, sql, params=()):
+        return self._run(super().execute, sql, params, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self._run(super().executemany, sql, seq_of_params, None)
+
+    def _timed_fetch(self, method, *args):
+        pending = self._pending
+        started = time.perf_counter()
+        result = method(*args)
+        if pending is not None:
+            pending[3] += time.perf_counter() - started
+        return result
+
+    def fetchone(self):
+        row = self._timed_fetch(super().fetchone)
+        if self._pending is not None:
+            if row is None:
+                self._finish()
+            else:
+                self._pending[4] += 1
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed_fetch(super().fetchmany, self.arraysize if size is None else size)
+        if self._pending is not None:
+            self._pending[4] += len(rows)
+            if len(rows) < (self.arraysize if size is None else size) or not rows:
+                self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed_fetch(super().fetchall)
+        if self._pending is not None:
+            self._pending[4] += len(rows)
+            self._finish()
+        return rows
+
+    def __next__(self):
+        try:
+            row = self._timed_fetch(super().__next__)
+        except StopIteration:
+            self._finish()
+            raise
+        if self._pending is not None:
+            self._pending[4] += 1
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors, execute and executemany are instrumented"""
+
+    _open = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._open = True
+        DB_CONNECTIONS.inc(('opened',))
+
+    def close(self):
+        if self._open:
+            self._open = False
+            DB_CONNECTIONS.inc(('closed',))
+        super().close()
+
+    def __del__(self):
+        if self._open:
+            self._open = False
+            DB_CONNECTIONS.inc(('closed',))
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, params=()):
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self.cursor().executemany(sql, seq_of_params)
+
+def instrumented_connect(database, **kwargs):
+    """sqlite3.connect() returning an instrumented connection when enabled"""
+    if ENABLED:
+        kwargs.setdefault('factory', InstrumentedConnection)
+    return sqlite3.connect(database, **kwargs)
+
+def add_listener(callback):
+    """Call callback(stats, elapsed_ms, rows) on the executing thread after every statement"""
+    _listeners.append(callback)
+
+def query_stats():
+    """Snapshot of every (caller, query) counter, slowest total time first"""
+    with _stats_lock:
+        stats = list(_stats.values())
+    return sorted((s.as_dict() for s in stats), key=lambda s: s['total_ms'], reverse=True)
+
+def slow_queries(limit=None):
+    """Most recent slow-query log entries, newest first"""
+    entries = list(_slow_log)[::-1]
+    return entries[:limit] if limit else entries
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+    _slow_log.clear()
+    _plan_cache.clear()
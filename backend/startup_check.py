@@ -0,0 +1,116 @@
+# =====================================================
+# AI COURSE RECOMMENDATION SYSTEM - STARTUP CHECK
+# =====================================================
+# Import-time budget for the app entry modules
+# Author: Student
+# Date: October 2025
+# Description: Imports an app module in a fresh interpreter with
+#              -X importtime, reports the slowest imports and fails
+#              when it exceeds its budget or pulls in a library
+#              that should only load lazily
+# =====================================================
+#
+# Usage (from backend/):
+#   python startup_check.py                      # streamlit_app, default budget
+#   python startup_check.py --module app_sqlite --budget-ms 800
+#   python startup_check.py --repeat 5 --top 15
+#
+# Exits 1 when the median import time is over budget or a lazy library
+# was imported, so it can gate CI.
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BACKEND_DIR)
+
+# Per-module budget (ms of cumulative import time) and libraries that must stay lazy
+BUDGETS = {
+    'streamlit_app': {'budget_ms': 2500, 'lazy': ['plotly']},
+    'app_sqlite': {'budget_ms': 1500, 'lazy': ['plotly', 'streamlit', 'pandas']},
+}
+
+def import_profile(module, db_path=None):
+    """Import module in a fresh interpreter: ({direct import: cumulative us}, total us, every package loaded)"""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([REPO_DIR, BACKEND_DIR, env.get('PYTHONPATH', '')])
+    if db_path:
+        env['COURSE_DB_PATH'] = db_path
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=REPO_DIR, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    # Lines look like "import time: self | cumulative |   nested.name"; children print before
+    # their parent, indented two more spaces per nesting level
+    children, siblings, loaded, total = {}, {}, set(), 0
+    for line in result.stderr.splitlines():
+        parts = line[len('import time:'):].split('|') if line.startswith('import time:') else []
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        cumulative, raw_name = int(parts[1]), parts[2]
+        name = raw_name.strip()
+        depth = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+        loaded.add(name.split('.')[0])
+        if depth == 1:
+            siblings[name] = siblings.get(name, 0) + cumulative
+        elif depth == 0:
+            if name == module:
+                children, total = siblings, cumulative
+            siblings = {}
+    return children, total, loaded
+
+def main():
+    parser = argparse.ArgumentParser(description='Import-time budget check for the app modules')
+    parser.add_argument('--module', default='streamlit_app', choices=sorted(BUDGETS))
+    parser.add_argument('--budget-ms', type=float, help='Override the module budget')
+    parser.add_argument('--repeat', type=int, default=3, help='Fresh interpreters to time (median is checked)')
+    parser.add_argument('--top', type=int, default=10, help='Slowest packages to list')
+    parser.add_argument('--db', help='COURSE_DB_PATH for the import (default: the app default, or a '
+                                     'migrated copy of course_recommendation.db for app_sqlite)')
+    args = parser.parse_args()
+
+    config = BUDGETS[args.module]
+    budget_ms = args.budget_ms or config['budget_ms']
+
+    totals, loaded = [], set()
+    packages = {}
+    with tempfile.TemporaryDirectory() as scratch:
+        db_path = args.db
+        if db_path is None and args.module == 'app_sqlite':
+            # The Flask app only starts on a migrated database
+            from migrations import migrate
+            db_path = os.path.join(scratch, 'startup.db')
+            shutil.copyfile(os.path.join(BACKEND_DIR, 'course_recommendation.db'), db_path)
+            migrate(db_path)
+        for _ in range(args.repeat):
+            packages, total, modules = import_profile(args.module, db_path)
+            totals.append(total / 1000.0)
+            loaded.update(modules)
+    median_ms = statistics.median(totals)
+
+    print(f"import {args.module}: median {median_ms:.0f} ms over {args.repeat} runs "
+          f"(min {min(totals):.0f}, max {max(totals):.0f}; budget {budget_ms:.0f} ms)")
+    print(f'Slowest imports made by {args.module} (last run):')
+    for name, us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {us / 1000.0:>9.1f} ms  {name}")
+
+    failures = []
+    if median_ms > budget_ms:
+        failures.append(f"median import time {median_ms:.0f} ms exceeds budget {budget_ms:.0f} ms")
+    for library in config['lazy']:
+        if library in loaded:
+            failures.append(f"{library} is imported at startup but should be imported lazily")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print('OK')
+
+if __name__ == '__main__':
+    main()
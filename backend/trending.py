@@ -0,0 +1,201 @@
+# =====================================================
+# AI COURSE RECOMMENDATION SYSTEM - TRENDING COURSES
+# =====================================================
+# Time-decayed enrollment and feedback counters
+# Author: Student
+# Date: October 2025
+# Description: Exponentially decayed counters per course,
+#              updated in O(1) on every write and read
+#              without touching the enrollments table
+# =====================================================
+#
+# Scores are stored relative to a shared epoch: an event at time t adds
+# 2 ** ((t - epoch) / half_life). Every course is decayed by the same factor
+# at read time, so ordering by the stored column is already ordering by the
+# current decayed value and the index on it can serve the top-N directly.
+# Compaction moves the epoch forward (rescaling every row) and drops courses
+# whose counters have decayed to nothing.
+
+import time
+
+import numpy as np
+
+from metrics import CACHE_LOOKUPS
+from cache_backend import MISSING, database_instance, shared_cache
+
+# Half-life of an enrollment or review, in days
+HALF_LIFE_DAYS = 7.0
+
+# Feedback counts for less than an enrollment when ranking
+FEEDBACK_WEIGHT = 0.5
+
+# Rebase the epoch once it is this old, and drop rows below MIN_SCORE
+COMPACT_AFTER_DAYS = 28.0
+MIN_SCORE = 1e-3
+
+SECONDS_PER_DAY = 86400.0
+
+def ensure_trending_tables(conn, now=None):
+    """Create the trending counter tables (backfilling from history the first time)"""
+    exists = conn.execute('''
+        SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'course_trending'
+    ''').fetchone()
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS course_trending (
+            course_id INTEGER PRIMARY KEY,
+            enrollment_score REAL DEFAULT 0,
+            feedback_score REAL DEFAULT 0,
+            rating_score REAL DEFAULT 0,
+            trend_score REAL DEFAULT 0,
+            FOREIGN KEY (course_id) REFERENCES courses(course_id)
+        )
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_course_trending_score ON course_trending(trend_score DESC)
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS trending_meta (
+            key TEXT PRIMARY KEY,
+            value REAL
+        )
+    ''')
+    conn.execute('INSERT OR IGNORE INTO trending_meta (key, value) VALUES (?, ?)', ('epoch', time.time()))
+    if not exists:
+        rebuild_trending(conn, now)
+
+def _epoch(conn):
+    row = conn.execute("SELECT value FROM trending_meta WHERE key = 'epoch'").fetchone()
+    return row[0] if row else time.time()
+
+def _weight(timestamp, epoch):
+    return 2.0 ** ((timestamp - epoch) / (HALF_LIFE_DAYS * SECONDS_PER_DAY))
+
+def record_enrollment(conn, course_id, timestamp=None):
+    """Count one enrollment (O(1): a single upsert)"""
+    weight = _weight(timestamp or time.time(), _epoch(conn))
+    conn.execute('''
+        INSERT INTO course_trending (course_id, enrollment_score, trend_score)
+        VALUES (?, ?, ?)
+        ON CONFLICT(course_id) DO UPDATE SET
+            enrollment_score = enrollment_score + excluded.enrollment_score,
+            trend_score = trend_score + excluded.trend_score
+    ''', (course_id, weight, weight))
+
+def record_feedback(conn, course_id, rating, timestamp=None):
+    """Count one review and its rating (O(1): a single upsert)"""
+    weight = _weight(timestamp or time.time(), _epoch(conn))
+    conn.execute('''
+        INSERT INTO course_trending (course_id, feedback_score, rating_score, trend_score)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(course_id) DO UPDATE SET
+            feedback_score = feedback_score + excluded.feedback_score,
+            rating_score = rating_score + excluded.rating_score,
+            trend_score = trend_score + excluded.trend_score
+    ''', (course_id, weight, weight * rating, weight * FEEDBACK_WEIGHT))
+
+def compact_trending(conn, now=None, force=False):
+    """Rebase scores onto a new epoch and drop decayed rows; returns True if it ran"""
+    now = now or time.time()
+    epoch = _epoch(conn)
+    if not force and now - epoch < COMPACT_AFTER_DAYS * SECONDS_PER_DAY:
+        return False
+
+    factor = _weight(epoch, now)
+    conn.execute('''
+        UPDATE course_trending SET
+            enrollment_score = enrollment_score * ?,
+            feedback_score = feedback_score * ?,
+            rating_score = rating_score * ?,
+            trend_score = trend_score * ?
+    ''', (factor, factor, factor, factor))
+    conn.execute('DELETE FROM course_trending WHERE trend_score < ?', (MIN_SCORE,))
+    conn.execute("UPDATE trending_meta SET value = ? WHERE key = 'epoch'", (now,))
+    return True
+
+def rebuild_trending(conn, now=None):
+    """Recompute every counter from enrollments and feedback history (maintenance only)"""
+    now = now or time.time()
+    conn.execute('DELETE FROM course_trending')
+    conn.execute("INSERT OR REPLACE INTO trending_meta (key, value) VALUES ('epoch', ?)", (now,))
+
+    enrollments = np.array(conn.execute('''
+        SELECT course_id, COALESCE(CAST(strftime('%s', enrollment_date) AS REAL), ?) FROM enrollments
+    ''', (now,)).fetchall(), dtype=np.float64).reshape(-1, 2)
+    feedback = np.array(conn.execute('''
+        SELECT course_id, rating, COALESCE(CAST(strftime('%s', feedback_date) AS REAL), ?) FROM feedback
+    ''', (now,)).fetchall(), dtype=np.float64).reshape(-1, 3)
+
+    # Sum each course's event weights in one pass instead of one upsert per event
+    course_ids = np.union1d(enrollments[:, 0], feedback[:, 0]).astype(np.int64)
+    size = len(course_ids)
+    enroll_pos = np.searchsorted(course_ids, enrollments[:, 0].astype(np.int64))
+    feedback_pos = np.searchsorted(course_ids, feedback[:, 0].astype(np.int64))
+    enroll_weight = _weight(enrollments[:, 1], now)
+    feedback_weight = _weight(feedback[:, 2], now)
+
+    enrollment_score = np.bincount(enroll_pos, weights=enroll_weight, minlength=size)
+    feedback_score = np.bincount(feedback_pos, weights=feedback_weight, minlength=size)
+    rating_score = np.bincount(feedback_pos, weights=feedback_weight * feedback[:, 1], minlength=size)
+    trend_score = enrollment_score + FEEDBACK_WEIGHT * feedback_score
+    conn.executemany('''
+        INSERT INTO course_trending (course_id, enrollment_score, feedback_score, rating_score, trend_score)
+        VALUES (?, ?, ?, ?, ?)
+    ''', zip(course_ids.tolist(), enrollment_score.tolist(), feedback_score.tolist(),
+             rating_score.tolist(), trend_score.tolist()))
+
+def trending_courses(conn, limit=10, now=None):
+    """Top courses by decayed activity, with per-day velocities and recent rating"""
+    now = now or time.time()
+    decay = _weight(_epoch(conn), now)
+    per_day = decay * 0.6931471805599453 / HALF_LIFE_DAYS
+
+    cursor = conn.execute('''
+        SELECT t.course_id, c.course_name, c.category, c.difficulty_level, c.average_rating,
+               t.enrollment_score, t.feedback_score, t.rating_score, t.trend_score
+        FROM course_trending t
+        JOIN courses c ON c.course_id = t.course_id
+        ORDER BY t.trend_score DESC
+        LIMIT ?
+    ''', (limit,))
+
+    results = []
+    for (course_id, name, category, difficulty, rating, enroll_score,
+         feedback_score, rating_score, trend_score) in cursor.fetchall():
+        results.append({
+            'course_id': course_id,
+            'course_name': name,
+            'category': category,
+            'difficulty_level': difficulty,
+            'average_rating': rating,
+            'trend_score': round(trend_score * decay, 3),
+            'enrollments_per_day': round(enroll_score * per_day, 3),
+            'feedback_per_day': round(feedback_score * per_day, 3),
+            'recent_rating': round(rating_score / feedback_score, 2) if feedback_score > 0 else None,
+        })
+    return results
+
+class TrendingCache:
+    """Top-N trending list shared by requests and workers, recomputed at most every max_age seconds
+
+    Requests for up to size courses are served by slicing one cached list.
+    """
+
+    def __init__(self, size=100, max_age=30.0):
+        self.size = size
+        self.max_age = max_age
+
+    def get(self, conn, limit=10):
+        if limit > self.size:
+            return trending_courses(conn, limit=limit)
+        key = f"trending:{database_instance(conn)}:{self.size}"
+        courses = shared_cache.get(key)
+        CACHE_LOOKUPS.inc(('trending', 'miss' if courses is MISSING else 'hit'))
+        if courses is MISSING:
+            courses = trending_courses(conn, limit=self.size)
+            shared_cache.set(key, courses, ttl=self.max_age)
+        return courses[:limit]
+
+    def invalidate(self):
+        shared_cache.invalidate('trending:')
+
+trending_cache = TrendingCache()
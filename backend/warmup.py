@@ -0,0 +1,212 @@
+# =====================================================
+# AI COURSE RECOMMENDATION SYSTEM - CACHE WARM-UP
+# =====================================================
+# Background preloading of the in-process caches
+# Author: Student
+# Date: October 2025
+# Description: Runs a list of warm-up steps (catalog, skill
+#              matrices, top-N lists, rollups) on a background
+#              thread after startup, reports progress for the
+#              readiness check and snapshots finished work so a
+#              restarted process can resume instead of starting over
+# =====================================================
+#
+# Settings (environment):
+#   WARMUP=0                        skip warm-up (ready immediately, caches fill on demand)
+#   WARMUP_SNAPSHOT=<db name>.warmup.pkl   snapshot file (default: next to the database)
+#   WARMUP_SNAPSHOT_MAX_AGE=900     seconds a snapshot may be reused after a restart
+#
+# A step's run(conn, cursor, data) is a generator yielding (cursor, data)
+# checkpoints. Each checkpoint is written to the snapshot; after a crash the
+# step's restore(data) reinstalls what was loaded and run() continues from
+# the saved cursor. Steps without restore() simply run again. Checkpoints
+# also record the step's data_versions rows (read before it started); a step
+# whose rows changed since, or whose database instance differs, runs again.
+
+import logging
+import os
+import pickle
+import threading
+import time
+
+from sql_metrics import instrumented_connect
+
+logger = logging.getLogger('warmup')
+
+ENABLED = os.environ.get('WARMUP', '1') != '0'
+SNAPSHOT_PATH = os.environ.get('WARMUP_SNAPSHOT')
+SNAPSHOT_MAX_AGE = float(os.environ.get('WARMUP_SNAPSHOT_MAX_AGE', '900'))
+
+# Attempts per step before warm-up gives up (the process stays not-ready)
+MAX_ATTEMPTS = 3
+RETRY_SECONDS = 5.0
+
+class WarmupStep:
+    """One cache to preload
+
+    versions names the data_versions rows the restored data depends on
+    ('instance' is always checked); None means every row.
+    """
+
+    def __init__(self, name, run, restore=None, versions=None):
+        self.name = name
+        self.run = run
+        self.restore = restore
+        self.versions = versions
+
+def simple_step(name, load):
+    """Step that calls load(conn) once and keeps nothing in the snapshot"""
+    def run(conn, cursor, data):
+        load(conn)
+        yield None, None
+    return WarmupStep(name, run)
+
+def default_snapshot_path(db_path):
+    """WARMUP_SNAPSHOT, or <db name>.warmup.pkl in the database's directory"""
+    return SNAPSHOT_PATH or os.path.splitext(os.path.abspath(db_path))[0] + '.warmup.pkl'
+
+def read_step_versions(conn, names=None):
+    """{name: version} of the given data_versions rows plus 'instance' (every row if names is None)"""
+    try:
+        if names is None:
+            rows = conn.execute('SELECT name, version FROM data_versions').fetchall()
+        else:
+            names = ('instance',) + tuple(name for name in names if name != 'instance')
+            rows = conn.execute(f'''
+                SELECT name, version FROM data_versions WHERE name IN ({','.join('?' * len(names))})
+            ''', names).fetchall()
+    except Exception:
+        return None
+    return dict(rows)
+
+class Warmup:
+    """Runs warm-up steps on a daemon thread and tracks their progress
+
+    snapshot_path=None keeps the snapshot next to the database; False disables it.
+    """
+
+    def __init__(self, db_path, steps, snapshot_path=None, max_snapshot_age=SNAPSHOT_MAX_AGE,
+                 snapshot_key=None):
+        self.db_path = db_path
+        self.steps = list(steps)
+        self.snapshot_path = default_snapshot_path(db_path) if snapshot_path is None else snapshot_path
+        self.max_snapshot_age = max_snapshot_age
+        self.snapshot_key = (os.path.abspath(db_path), snapshot_key)
+        self.ready = threading.Event()
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+        self._state = {step.name: {'status': 'pending', 'seconds': 0.0, 'checkpoints': 0,
+                                   'restored': False, 'error': None} for step in self.steps}
+        self._saved = {}
+        self.thread = threading.Thread(target=self.run, name='cache-warmup', daemon=True)
+
+    def start(self):
+        if not ENABLED:
+            self.ready.set()
+            return self
+        self.thread.start()
+        return self
+
+    def wait(self, timeout=None):
+        return self.ready.wait(timeout)
+
+    def status(self):
+        """Readiness plus per-step progress, for /api/ready and the admin console"""
+        with self._lock:
+            steps = [dict(self._state[step.name], name=step.name) for step in self.steps]
+        now = time.time()
+        return {
+            'ready': self.ready.is_set(),
+            'enabled': ENABLED,
+            'elapsed_s': round(((self.finished_at or now) - self.started_at), 3) if self.started_at else 0.0,
+            'steps_done': sum(1 for s in steps if s['status'] == 'done'),
+            'steps': steps,
+        }
+
+    def _update(self, name, **changes):
+        with self._lock:
+            self._state[name].update(changes)
+
+    # ---- snapshots ----
+
+    def _load_snapshot(self):
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return {}
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                snapshot = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable warm-up snapshot {self.snapshot_path}: {e}")
+            return {}
+        if snapshot.get('key') != self.snapshot_key:
+            return {}
+        if time.time() - snapshot.get('written_at', 0) > self.max_snapshot_age:
+            logger.info('Warm-up snapshot is too old, starting over')
+            return {}
+        return snapshot.get('steps', {})
+
+    def _checkpoint(self, name, cursor, data, done, versions):
+        self._saved[name] = {'cursor': cursor, 'data': data, 'done': done, 'versions': versions}
+        if not self.snapshot_path:
+            return
+        snapshot = {'key': self.snapshot_key, 'written_at': time.time(), 'steps': self._saved}
+        partial = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        try:
+            with open(partial, 'wb') as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(partial, self.snapshot_path)
+        except OSError as e:
+            logger.warning(f"Could not write warm-up snapshot: {e}")
+
+    # ---- running ----
+
+    def run(self):
+        self.started_at = time.time()
+        saved = self._load_snapshot()
+        conn = instrumented_connect(self.db_path, check_same_thread=False)
+        try:
+            results = [self._run_step(conn, step, saved.get(step.name)) for step in self.steps]
+            ok = all(results)
+        finally:
+            conn.close()
+        self.finished_at = time.time()
+        if ok:
+            self.ready.set()
+            logger.info(f"Cache warm-up finished in {self.finished_at - self.started_at:.2f}s")
+        else:
+            logger.error('Cache warm-up failed; the process stays not ready')
+
+    def _run_step(self, conn, step, saved):
+        cursor, data = None, None
+        started = time.perf_counter()
+        # Read before the step loads anything, so a write during the step makes the snapshot stale
+        versions = read_step_versions(conn, step.versions)
+        if saved is not None and step.restore is not None and (versions is None or saved.get('versions') != versions):
+            logger.info(f"Warm-up snapshot of {step.name} is out of date, running it again")
+            saved = None
+        if saved is not None and step.restore is not None:
+            step.restore(saved['data'])
+            cursor, data = saved['cursor'], saved['data']
+            self._update(step.name, restored=True)
+            if saved['done']:
+                self._checkpoint(step.name, cursor, data, done=True, versions=versions)
+                self._update(step.name, status='done', seconds=time.perf_counter() - started)
+                return True
+
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            self._update(step.name, status='running')
+            try:
+                for cursor, data in step.run(conn, cursor, data):
+                    self._checkpoint(step.name, cursor, data, done=False, versions=versions)
+                    with self._lock:
+                        self._state[step.name]['checkpoints'] += 1
+                self._checkpoint(step.name, cursor, data, done=True, versions=versions)
+                self._update(step.name, status='done', seconds=time.perf_counter() - started, error=None)
+                return True
+            except Exception as e:
+                logger.warning(f"Warm-up step {step.name} failed (attempt {attempt}): {e}")
+                self._update(step.name, status='failed', error=str(e))
+                if attempt < MAX_ATTEMPTS:
+                    time.sleep(RETRY_SECONDS * attempt)
+        return False
@@ -11,129 +11,38 @@
 import streamlit as st
 import sqlite3
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+from collections import deque
 from datetime import datetime
 import hashlib
 import json
 import io
 import logging
+import os
+import sys
+import time
+
+# Shared engine modules live alongside the Flask backend
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+from catalog import catalog_store
+from co_enrollment import co_enrollment_store
+from ranking import candidate_cache, rank_courses, recommend_for_student, student_profile
+from prerequisites import PrerequisiteGraph
+from planner import WEEKLY_HOURS, plan_cache, plan_for_student
+from trending import compact_trending, ensure_trending_tables, record_enrollment, trending_cache, trending_courses
+from cohort import ensure_cohort_tables, popular_with_cohort, record_cohort_enrollment
+from sql_metrics import instrumented_connect, query_stats, slow_queries
+from metrics import CACHE_LOOKUPS, DB_CONNECTIONS
+from rerun_profiler import ProfileStore, profile_rerun, span
+from warmup import Warmup, simple_step
+from cache_backend import shared_cache, shared_tier_from_env
+from ui_assets import COURSE_PLATFORMS, QUESTIONNAIRE, app_css
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Database configuration
-DB_PATH = 'backend/course_recommendation.db'
-
-# AI Course platforms with real course links
-COURSE_PLATFORMS = {
-    'Machine Learning': [
-        {'platform': 'Coursera', 'name': 'Machine Learning by Andrew Ng', 'url': 'https://www.coursera.org/learn/machine-learning', 'badge': 'badge-coursera'},
-        {'platform': 'Udacity', 'name': 'Machine Learning Engineer', 'url': 'https://www.udacity.com/course/machine-learning-engineer-nanodegree--nd009t', 'badge': 'badge-udacity'},
-        {'platform': 'edX', 'name': 'Deep Learning Fundamentals', 'url': 'https://www.edx.org/learn/deep-learning', 'badge': 'badge-edx'},
-        {'platform': 'Udemy', 'name': 'Complete Machine Learning Bootcamp', 'url': 'https://www.udemy.com/course/complete-machine-learning-and-data-science-zero-to-mastery/', 'badge': 'badge-udemy'},
-    ],
-    'Deep Learning': [
-        {'platform': 'Coursera', 'name': 'Deep Learning Specialization', 'url': 'https://www.coursera.org/specializations/deep-learning', 'badge': 'badge-coursera'},
-        {'platform': 'Udacity', 'name': 'Deep Learning Nanodegree', 'url': 'https://www.udacity.com/course/deep-learning-nanodegree--nd101', 'badge': 'badge-udacity'},
-        {'platform': 'Fast.ai', 'name': 'Practical Deep Learning', 'url': 'https://course.fast.ai/', 'badge': 'badge-edx'},
-        {'platform': 'Udemy', 'name': 'Deep Learning A-Z', 'url': 'https://www.udemy.com/course/deeplearning/', 'badge': 'badge-udemy'},
-    ],
-    'Natural Language Processing': [
-        {'platform': 'Coursera', 'name': 'Natural Language Processing', 'url': 'https://www.coursera.org/specializations/natural-language-processing', 'badge': 'badge-coursera'},
-        {'platform': 'Udacity', 'name': 'Natural Language Processing', 'url': 'https://www.udacity.com/course/natural-language-processing-nanodegree--nd892', 'badge': 'badge-udacity'},
-        {'platform': 'edX', 'name': 'NLP with Python', 'url': 'https://www.edx.org/learn/natural-language-processing', 'badge': 'badge-edx'},
-        {'platform': 'Udemy', 'name': 'NLP with Deep Learning', 'url': 'https://www.udemy.com/course/natural-language-processing-with-deep-learning-in-python/', 'badge': 'badge-udemy'},
-    ],
-    'Computer Vision': [
-        {'platform': 'Coursera', 'name': 'Computer Vision Basics', 'url': 'https://www.coursera.org/learn/computer-vision-basics', 'badge': 'badge-coursera'},
-        {'platform': 'Udacity', 'name': 'Computer Vision Nanodegree', 'url': 'https://www.udacity.com/course/computer-vision-nanodegree--nd891', 'badge': 'badge-udacity'},
-        {'platform': 'edX', 'name': 'Computer Vision Fundamentals', 'url': 'https://www.edx.org/learn/computer-vision', 'badge': 'badge-edx'},
-        {'platform': 'Udemy', 'name': 'Computer Vision with OpenCV', 'url': 'https://www.udemy.com/course/python-for-computer-vision-with-opencv-and-deep-learning/', 'badge': 'badge-udemy'},
-    ],
-    'AI for Business': [
-        {'platform': 'Coursera', 'name': 'AI for Business', 'url': 'https://www.coursera.org/specializations/ai-for-business', 'badge': 'badge-coursera'},
-        {'platform': 'LinkedIn Learning', 'name': 'AI for Business Leaders', 'url': 'https://www.linkedin.com/learning/paths/ai-for-business-leaders', 'badge': 'badge-linkedin'},
-        {'platform': 'edX', 'name': 'AI Strategy', 'url': 'https://www.edx.org/learn/artificial-intelligence', 'badge': 'badge-edx'},
-        {'platform': 'Udemy', 'name': 'AI for Business Strategy', 'url': 'https://www.udemy.com/course/artificial-intelligence-for-business/', 'badge': 'badge-udemy'},
-    ],
-    'Robotics & AI': [
-        {'platform': 'Coursera', 'name': 'Robotics Specialization', 'url': 'https://www.coursera.org/specializations/robotics', 'badge': 'badge-coursera'},
-        {'platform': 'Udacity', 'name': 'Robotics Software Engineer', 'url': 'https://www.udacity.com/course/robotics-software-engineer--nd209', 'badge': 'badge-udacity'},
-        {'platform': 'edX', 'name': 'Autonomous Systems', 'url': 'https://www.edx.org/learn/robotics', 'badge': 'badge-edx'},
-        {'platform': 'Udemy', 'name': 'AI & Robotics with Python', 'url': 'https://www.udemy.com/course/artificial-intelligence-robotics-with-python/', 'badge': 'badge-udemy'},
-    ],
-    'AI Ethics & Governance': [
-        {'platform': 'Coursera', 'name': 'AI Ethics', 'url': 'https://www.coursera.org/learn/ai-ethics', 'badge': 'badge-coursera'},
-        {'platform': 'edX', 'name': 'Ethics of AI', 'url': 'https://www.edx.org/learn/artificial-intelligence-ethics', 'badge': 'badge-edx'},
-        {'platform': 'LinkedIn Learning', 'name': 'AI Ethics for Business', 'url': 'https://www.linkedin.com/learning/ai-ethics-for-business', 'badge': 'badge-linkedin'},
-        {'platform': 'Udemy', 'name': 'AI Ethics & Bias', 'url': 'https://www.udemy.com/course/ai-ethics-and-bias/', 'badge': 'badge-udemy'},
-    ],
-    'AI Programming': [
-        {'platform': 'Coursera', 'name': 'Python for AI & ML', 'url': 'https://www.coursera.org/specializations/python-3-programming', 'badge': 'badge-coursera'},
-        {'platform': 'Udacity', 'name': 'AI Programming with Python', 'url': 'https://www.udacity.com/course/ai-programming-python-nanodegree--nd089', 'badge': 'badge-udacity'},
-        {'platform': 'edX', 'name': 'Python for Data Science', 'url': 'https://www.edx.org/learn/python', 'badge': 'badge-edx'},
-        {'platform': 'Udemy', 'name': 'Python for AI & Machine Learning', 'url': 'https://www.udemy.com/course/python-for-machine-learning-data-science-masterclass/', 'badge': 'badge-udemy'},
-    ],
-}
-
-# AI-focused questionnaire for course recommendations
-QUESTIONNAIRE = {
-    'ai_interest': {
-        'question': '🤖 Which AI domain interests you most?',
-        'options': {
-            'Machine Learning': ['Machine Learning', 'AI Programming'],
-            'Deep Learning': ['Deep Learning', 'Machine Learning'],
-            'Natural Language Processing': ['Natural Language Processing', 'AI Programming'],
-            'Computer Vision': ['Computer Vision', 'Deep Learning'],
-            'AI for Business': ['AI for Business', 'AI Ethics & Governance'],
-            'Robotics & AI': ['Robotics & AI', 'Machine Learning'],
-            'AI Ethics & Governance': ['AI Ethics & Governance', 'AI for Business'],
-            'General AI Programming': ['AI Programming', 'Machine Learning'],
-        }
-    },
-    'experience_level': {
-        'question': '📊 What is your AI/Programming experience?',
-        'options': {
-            'Complete Beginner': 'Beginner',
-            'Some Python Knowledge': 'Beginner',
-            'Intermediate Programmer': 'Intermediate',
-            'Advanced/AI Professional': 'Advanced',
-        }
-    },
-    'career_goal': {
-        'question': '🎯 What is your AI career goal?',
-        'options': {
-            'AI Research Scientist': ['Deep Learning', 'Machine Learning', 'AI Ethics & Governance'],
-            'Machine Learning Engineer': ['Machine Learning', 'Deep Learning', 'AI Programming'],
-            'Data Scientist': ['Machine Learning', 'Natural Language Processing', 'AI Programming'],
-            'AI Product Manager': ['AI for Business', 'AI Ethics & Governance', 'Machine Learning'],
-            'Computer Vision Engineer': ['Computer Vision', 'Deep Learning', 'AI Programming'],
-            'NLP Engineer': ['Natural Language Processing', 'Machine Learning', 'AI Programming'],
-            'Robotics Engineer': ['Robotics & AI', 'Machine Learning', 'Computer Vision'],
-            'AI Consultant': ['AI for Business', 'AI Ethics & Governance', 'Machine Learning'],
-        }
-    },
-    'time_commitment': {
-        'question': '⏰ How much time can you dedicate weekly?',
-        'options': {
-            '1-3 hours': 'short',
-            '4-7 hours': 'medium',
-            '8-15 hours': 'long',
-            '15+ hours (Full-time)': 'intensive',
-        }
-    },
-    'learning_style': {
-        'question': '🎓 What is your preferred learning approach?',
-        'options': {
-            'Hands-on Projects & Coding': 'practical',
-            'Theoretical Foundations': 'theoretical',
-            'Video Lectures with Exercises': 'structured',
-            'Interactive AI Labs': 'interactive',
-        }
-    },
-}
+# Database configuration (COURSE_DB_PATH points tools and benchmarks at another file)
+DB_PATH = os.environ.get('COURSE_DB_PATH', 'backend/course_recommendation.db')
 
 # Page configuration
 st.set_page_config(
@@ -143,301 +52,14 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for compact design - ORIGINAL THEME
-st.markdown("""
-<style>
-    /* Compact content padding with cleaner design */
-    .main .block-container {
-        padding-top: 1rem !important;
-        padding-bottom: 2rem !important;
-        padding-left: 1.5rem !important;
-        padding-right: 1.5rem !important;
-        max-width: 1200px !important;
-    }
-    
-    /* Target specific Streamlit container class */
-    .st-emotion-cache-zy6yx3 {
-        width: 100% !important;
-        padding: 1rem 1.5rem 2rem !important;
-        max-width: 1200px !important;
-        min-width: auto !important;
-    }
-    
-    /* Clean up element container spacing */
-    .st-emotion-cache-10p9htt {
-        display: flex !important;
-        justify-content: space-between !important;
-        align-items: center !important;
-        margin-bottom: 0.5rem !important;
-        height: auto !important;
-    }
-    
-    /* Better header spacing */
-    .main h1, .main h2, .main h3 {
-        margin-top: 0.5rem !important;
-        margin-bottom: 1rem !important;
-        text-align: center !important;
-    }
-    
-    /* Center all Streamlit headers */
-    [data-testid="stHeadingWithActionElements"] {
-        text-align: center !important;
-    }
-    
-    [data-testid="stHeadingWithActionElements"] h1,
-    [data-testid="stHeadingWithActionElements"] h2,
-    [data-testid="stHeadingWithActionElements"] h3 {
-        text-align: center !important;
-    }
-    
-    /* Improved sidebar styling */
-    .css-1d391kg {
-        background: linear-gradient(180deg, #667eea 0%, #764ba2 100%) !important;
-        border-right: none !important;
-        padding-top: 1rem !important;
-        color: white !important;
-    }
-    
-    /* Clean main header */
-    .main-header {
-        font-size: 2rem;
-        color: #1f77b4;
-        text-align: center;
-        margin-bottom: 1rem;
-        font-weight: bold;
-    }
-    
-    /* Improved button styling */
-    .stButton > button {
-        background: linear-gradient(90deg, #667eea, #764ba2) !important;
-        color: white !important;
-        border: none !important;
-        border-radius: 10px !important;
-        padding: 0.6rem 1.2rem !important;
-        font-weight: 600 !important;
-        transition: all 0.3s ease !important;
-        width: 100% !important;
-        margin: 0.3rem 0 !important;
-        box-shadow: 0 2px 8px rgba(102, 126, 234, 0.3) !important;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-2px) !important;
-        box-shadow: 0 4px 15px rgba(102, 126, 234, 0.4) !important;
-        background: linear-gradient(90deg, #764ba2, #667eea) !important;
-    }
-    
-    /* Sidebar button styling */
-    .css-1d391kg .stButton > button {
-        margin: 0.2rem 0 !important;
-        background: rgba(255, 255, 255, 0.2) !important;
-        color: white !important;
-        border: 2px solid rgba(255, 255, 255, 0.3) !important;
-        padding: 0.5rem 1rem !important;
-        width: 100% !important;
-        backdrop-filter: blur(10px) !important;
-    }
-    
-    .css-1d391kg .stButton > button:hover {
-        background: rgba(255, 255, 255, 0.3) !important;
-        color: white !important;
-        border-color: rgba(255, 255, 255, 0.6) !important;
-    }
-    
-    /* Clean metric display */
-    [data-testid="metric-container"] {
-        background: linear-gradient(135deg, #f8f9fa, #e9ecef) !important;
-        border: 1px solid #dee2e6 !important;
-        padding: 1rem !important;
-        border-radius: 12px !important;
-        margin: 0.3rem 0 !important;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.1) !important;
-    }
-    
-    /* Dark, attractive card design - ORIGINAL */
-    .card {
-        background: linear-gradient(135deg, #2c3e50, #34495e);
-        border: 3px solid #3498db;
-        border-radius: 15px;
-        padding: 20px;
-        margin: 15px 0;
-        box-shadow: 0 4px 8px rgba(0,0,0,0.3);
-        color: white;
-    }
-    
-    .card-header {
-        font-size: 1.4rem;
-        font-weight: bold;
-        color: #3498db;
-        margin-bottom: 15px;
-        padding-bottom: 10px;
-        border-bottom: 3px solid #3498db;
-        text-align: center;
-    }
-    
-    .course-card {
-        background: linear-gradient(135deg, #1a1a1a, #2d2d2d);
-        border: 2px solid #e74c3c;
-        border-radius: 12px;
-        padding: 15px;
-        margin: 10px 0;
-        box-shadow: 0 2px 6px rgba(0,0,0,0.3);
-        color: white;
-    }
-    
-    .course-card:hover {
-        border-color: #3498db;
-        box-shadow: 0 4px 12px rgba(52,152,219,0.4);
-        background: linear-gradient(135deg, #2d2d2d, #3a3a3a);
-    }
-    
-    .stat-card {
-        background: linear-gradient(135deg, #8e44ad, #9b59b6);
-        color: white;
-        border-radius: 12px;
-        padding: 20px;
-        text-align: center;
-        margin: 5px;
-        border: none;
-        box-shadow: 0 4px 8px rgba(142,68,173,0.4);
-    }
-    
-    .stat-number {
-        font-size: 2.5rem;
-        font-weight: bold;
-        margin-bottom: 10px;
-        color: white;
-    }
-    
-    .stat-label {
-        font-size: 1rem;
-        color: white;
-        font-weight: 500;
-    }
-    
-    /* Force text colors for dark theme */
-    .course-card h3 {
-        color: #3498db !important;
-        font-size: 1.3rem !important;
-        font-weight: bold !important;
-        margin-bottom: 8px !important;
-    }
-    
-    .course-card h4 {
-        color: #3498db !important;
-        font-size: 1.2rem !important;
-        font-weight: bold !important;
-        margin-bottom: 8px !important;
-    }
-    
-    .course-card p {
-        color: #ecf0f1 !important;
-        font-size: 1rem !important;
-        line-height: 1.5 !important;
-    }
-    
-    /* Interactive Quiz Styling */
-    .quiz-container {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        border-radius: 20px;
-        padding: 30px;
-        margin: 20px 0;
-        box-shadow: 0 10px 30px rgba(102, 126, 234, 0.3);
-        color: white;
-    }
-    
-    .quiz-step {
-        background: rgba(255, 255, 255, 0.1);
-        border: 2px solid rgba(255, 255, 255, 0.2);
-        border-radius: 15px;
-        padding: 25px;
-        margin: 15px 0;
-        backdrop-filter: blur(10px);
-        transition: all 0.3s ease;
-    }
-    
-    .quiz-step:hover {
-        background: rgba(255, 255, 255, 0.15);
-        border-color: rgba(255, 255, 255, 0.4);
-        transform: translateY(-2px);
-    }
-    
-    .quiz-option {
-        background: rgba(255, 255, 255, 0.1);
-        border: 2px solid rgba(255, 255, 255, 0.3);
-        border-radius: 10px;
-        padding: 15px;
-        margin: 10px 0;
-        cursor: pointer;
-        transition: all 0.3s ease;
-        color: white;
-    }
-    
-    .quiz-option:hover {
-        background: rgba(255, 255, 255, 0.2);
-        border-color: #fff;
-        transform: scale(1.02);
-    }
-    
-    .quiz-option.selected {
-        background: rgba(255, 255, 255, 0.3);
-        border-color: #fff;
-        box-shadow: 0 0 20px rgba(255, 255, 255, 0.3);
-    }
-    
-    /* Platform badges */
-    .platform-badge {
-        display: inline-block;
-        padding: 5px 12px;
-        border-radius: 20px;
-        font-size: 0.85rem;
-        font-weight: 600;
-        margin: 5px 3px;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-    }
-    
-    .badge-udemy {
-        background: linear-gradient(135deg, #ec5252 0%, #a33e3e 100%);
-        color: white;
-    }
-    
-    .badge-coursera {
-        background: linear-gradient(135deg, #0056d2 0%, #003d99 100%);
-        color: white;
-    }
-    
-    .badge-edx {
-        background: linear-gradient(135deg, #02262b 0%, #064f5e 100%);
-        color: white;
-    }
-    
-    .badge-udacity {
-        background: linear-gradient(135deg, #02b3e4 0%, #0189b3 100%);
-        color: white;
-    }
-    
-    .badge-linkedin {
-        background: linear-gradient(135deg, #0077b5 0%, #005885 100%);
-        color: white;
-    }
-    
-    .badge-pluralsight {
-        background: linear-gradient(135deg, #f15b2a 0%, #c1451f 100%);
-        color: white;
-    }
-    
-    .badge-fastai {
-        background: linear-gradient(135deg, #00a86b 0%, #007a4d 100%);
-        color: white;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Custom CSS for compact design - ORIGINAL THEME (read once per process)
+st.markdown(app_css(), unsafe_allow_html=True)
 
 # Database query functions
 def execute_query(query, params=None):
     """Execute a database query and return results"""
     try:
-        conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+        conn = instrumented_connect(DB_PATH, check_same_thread=False)
         if params:
             df = pd.read_sql_query(query, conn, params=params)
         else:
@@ -451,7 +73,7 @@ def execute_query(query, params=None):
 def execute_insert(query, params=None):
     """Execute INSERT/UPDATE/DELETE query"""
     try:
-        conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+        conn = instrumented_connect(DB_PATH, check_same_thread=False)
         cursor = conn.cursor()
         cursor.execute(query, params)
         conn.commit()
@@ -461,6 +83,7 @@ def execute_insert(query, params=None):
         st.error(f"Database error: {str(e)}")
         return False
 
+@st.cache_data(ttl=60, show_spinner=False)
 def get_dashboard_stats():
     """Get dashboard statistics - SAME SQL as original"""
     stats = {}
@@ -500,40 +123,355 @@ def get_courses_data():
     """
     return execute_query(query)
 
-def get_course_recommendations(student_id=1):
-    """Get course recommendations - SAME ALGORITHM as original"""
+def get_course_catalog():
+    """Shared read-only catalog snapshot plus filter options (no per-session copy)"""
+    conn = instrumented_connect(DB_PATH, check_same_thread=False)
+    catalog = catalog_store.get(conn)
+    conn.close()
+    categories = ['All'] + sorted(name for name in catalog.categories_in() if name)
+    difficulties = ['All'] + sorted(catalog.difficulties_in())
+    return catalog, categories, difficulties
+
+@st.cache_resource(ttl=300)
+def get_prerequisite_graph():
+    """Prerequisite graph shared across sessions, reloaded every few minutes or when changed"""
+    graph = PrerequisiteGraph()
+    conn = instrumented_connect(DB_PATH, check_same_thread=False)
+    try:
+        graph.load(conn)
+    except sqlite3.OperationalError:
+        # Prerequisite tables are created by the Flask backend
+        graph.loaded = True
+    conn.close()
+    return graph
+
+@st.cache_resource
+def init_activity_tables():
+    """Create the trending and cohort aggregate tables once per process"""
+    conn = instrumented_connect(DB_PATH, check_same_thread=False)
+    ensure_trending_tables(conn)
+    ensure_cohort_tables(conn)
+    conn.commit()
+    conn.close()
+    return True
+
+def get_trending_courses(limit=5):
+    """Get courses with the most recent activity from the decayed counters"""
+    try:
+        init_activity_tables()
+        conn = instrumented_connect(DB_PATH, check_same_thread=False)
+        courses = trending_courses(conn, limit=limit)
+        conn.close()
+        return pd.DataFrame(courses)
+    except Exception as e:
+        st.error(f"Database error: {str(e)}")
+        return pd.DataFrame()
+
+def record_enrollment_activity(student_id, course_id):
+    """Count a new enrollment towards the trending and cohort aggregates"""
+    try:
+        init_activity_tables()
+        conn = instrumented_connect(DB_PATH, check_same_thread=False)
+        record_enrollment(conn, course_id)
+        compact_trending(conn)
+        record_cohort_enrollment(conn, student_id, course_id)
+        conn.commit()
+        conn.close()
+    except Exception as e:
+        logger.error(f"Enrollment activity error: {str(e)}")
+
+def get_course_recommendations(student_id=1, limit=6):
+    """Get course recommendations from the shared ranking engine"""
+    try:
+        conn = instrumented_connect(DB_PATH, check_same_thread=False)
+        recommendations = recommend_for_student(
+            conn, student_id, k=limit, prerequisites=get_prerequisite_graph(),
+            candidates=candidate_cache.get(conn)
+        )
+        conn.close()
+        return pd.DataFrame(recommendations)
+    except Exception as e:
+        st.error(f"Database error: {str(e)}")
+        return pd.DataFrame()
+
+def get_cohort_recommendations(student_id, limit=5):
+    """Get courses popular with students in the same department and year"""
+    try:
+        init_activity_tables()
+        conn = instrumented_connect(DB_PATH, check_same_thread=False)
+        candidates = candidate_cache.get(conn)
+        _, enrolled = student_profile(conn, student_id)
+        courses = popular_with_cohort(conn, student_id, candidates, k=limit, exclude_ids=enrolled)
+        conn.close()
+        return pd.DataFrame(courses)
+    except Exception as e:
+        st.error(f"Database error: {str(e)}")
+        return pd.DataFrame()
+
+def get_quiz_recommendations(categories, experience_level, student_id=None, limit=5):
+    """Rank courses in the quiz categories by skills, rating, popularity and difficulty fit"""
+    try:
+        conn = instrumented_connect(DB_PATH, check_same_thread=False)
+        candidates = candidate_cache.get(conn)
+        skills, enrolled = student_profile(conn, student_id) if student_id else ({}, [])
+        conn.close()
+
+        best, scores, _ = rank_courses(
+            candidates, k=limit, student_skills=skills, target_level=experience_level,
+            exclude_ids=enrolled, mask=candidates.category_mask(categories)
+        )
+        rows = [dict(candidates.row(pos), match_score=round(score, 2))
+                for pos, score in zip(best.tolist(), scores.tolist())]
+        return pd.DataFrame(rows)
+    except Exception as e:
+        st.error(f"Database error: {str(e)}")
+        return pd.DataFrame()
+
+def get_learning_plan(student_id, time_commitment, experience_level, categories, weeks=12):
+    """Plan courses that fit the student's weekly time budget"""
+    try:
+        conn = instrumented_connect(DB_PATH, check_same_thread=False)
+        plan = plan_for_student(
+            conn, student_id, WEEKLY_HOURS.get(time_commitment, WEEKLY_HOURS['medium']), weeks,
+            experience_level=experience_level, categories=categories,
+            prerequisites=get_prerequisite_graph(), candidates=candidate_cache.get(conn)
+        )
+        conn.close()
+        return plan
+    except Exception as e:
+        st.error(f"Database error: {str(e)}")
+        return None
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_enrollment_data():
+    """Get enrollment analytics - SAME SQL as original"""
+    query = """
+    SELECT 
+        c.category,
+        COUNT(e.enrollment_id) as enrollment_count,
+        AVG(c.average_rating) as avg_rating
+    FROM courses c
+    LEFT JOIN enrollments e ON c.course_id = e.course_id
+    GROUP BY c.category
+    ORDER BY COALESCE(enrollment_count, 0) DESC
+    """
+    return execute_query(query)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_admin_stats():
+    """Get system totals for the admin dashboard - SAME SQL as original"""
+    query = """
+    SELECT 
+        (SELECT COUNT(*) FROM students) as total_students,
+        (SELECT COUNT(*) FROM courses) as total_courses,
+        (SELECT COUNT(*) FROM enrollments) as total_enrollments,
+        (SELECT COUNT(*) FROM skills) as total_skills
+    """
+    return execute_query(query)
+
+def get_all_students_data():
+    """Get all students for admin management - SAME SQL as original"""
+    query = """
+    SELECT 
+        student_id,
+        name,
+        email,
+        phone,
+        department,
+        year,
+        registration_date
+    FROM students 
+    ORDER BY registration_date DESC
+    """
+    return execute_query(query)
+
+def get_all_courses_admin_data():
+    """Get all courses with rating and enrollment statistics - SAME SQL as original"""
     query = """
     SELECT 
         c.course_id,
         c.course_name,
-        c.description,
         c.category,
         c.difficulty_level,
-        c.average_rating,
-        c.total_enrollments,
-        c.duration_hours
+        c.duration_hours,
+        c.description,
+        COALESCE(AVG(f.rating), 0) as average_rating,
+        COUNT(e.enrollment_id) as total_enrollments
     FROM courses c
-    LEFT JOIN enrollments e ON c.course_id = e.course_id AND e.student_id = ?
-    WHERE e.enrollment_id IS NULL
-    ORDER BY COALESCE(c.average_rating, 0) DESC, COALESCE(c.total_enrollments, 0) DESC
-    LIMIT 6
+    LEFT JOIN enrollments e ON c.course_id = e.course_id
+    LEFT JOIN feedback f ON c.course_id = f.course_id
+    GROUP BY c.course_id, c.course_name, c.category, c.difficulty_level, c.duration_hours, c.description
+    ORDER BY c.course_name
     """
-    return execute_query(query, params=[student_id])
+    return execute_query(query)
 
-def get_enrollment_data():
-    """Get enrollment analytics - SAME SQL as original"""
+def get_all_enrollments_data():
+    """Get all enrollments with student and course details - SAME SQL as original"""
+    query = """
+    SELECT 
+        e.enrollment_id,
+        s.name as student_name,
+        s.email as student_email,
+        c.course_name,
+        c.category,
+        e.enrollment_date,
+        e.completion_status
+    FROM enrollments e
+    JOIN students s ON e.student_id = s.student_id
+    JOIN courses c ON e.course_id = c.course_id
+    ORDER BY e.enrollment_date DESC
+    """
+    return execute_query(query)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_system_analytics_data():
+    """Get enrollment and rating analytics by category - SAME SQL as original"""
     query = """
     SELECT 
         c.category,
         COUNT(e.enrollment_id) as enrollment_count,
-        AVG(c.average_rating) as avg_rating
+        AVG(COALESCE(f.rating, 0)) as avg_rating
     FROM courses c
     LEFT JOIN enrollments e ON c.course_id = e.course_id
+    LEFT JOIN feedback f ON c.course_id = f.course_id
     GROUP BY c.category
-    ORDER BY COALESCE(enrollment_count, 0) DESC
+    ORDER BY enrollment_count DESC
     """
     return execute_query(query)
 
+def clear_analytics_cache(prefix=None):
+    """Drop the cached totals and rollups after a write (here or in another worker)"""
+    get_dashboard_stats.clear()
+    get_enrollment_data.clear()
+    get_admin_stats.clear()
+    get_system_analytics_data.clear()
+
+@st.cache_resource
+def get_shared_cache():
+    """Connect the shared cache tier once per process and follow other workers' invalidations"""
+    shared_cache.configure(shared_tier_from_env(DB_PATH))
+    shared_cache.subscribe('analytics', clear_analytics_cache)
+    shared_cache.subscribe('prerequisites', lambda prefix: get_prerequisite_graph.clear())
+    return shared_cache
+
+def warm_analytics_rollups(conn):
+    """Fill the dashboard totals and category rollups"""
+    get_dashboard_stats()
+    get_enrollment_data()
+    get_admin_stats()
+    get_system_analytics_data()
+
+@st.cache_resource
+def get_warmup():
+    """Background warm-up of this process's caches, started by the first rerun"""
+    # Streamlit's caches live in this process only, so there is nothing to snapshot
+    return Warmup(DB_PATH, [
+        simple_step('course_catalog', lambda conn: get_course_catalog()),
+        simple_step('course_candidates', candidate_cache.get),
+        simple_step('co_enrollment', co_enrollment_store.ensure_loaded),
+        simple_step('prerequisite_graph', lambda conn: get_prerequisite_graph()),
+        simple_step('activity_tables', lambda conn: init_activity_tables()),
+        simple_step('analytics_rollups', warm_analytics_rollups),
+    ], snapshot_path=False).start()
+
+# Performance console data (instrumentation of this Streamlit process)
+@st.cache_resource
+def get_render_log():
+    """Recent (time, page, seconds) page renders shared by every session"""
+    return deque(maxlen=500)
+
+@st.cache_resource
+def get_profile_store():
+    """Background writer for per-rerun profiles (see backend/rerun_profiler.py)"""
+    return ProfileStore()
+
+def get_session_id():
+    """Streamlit session id for attributing rerun profiles"""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        return get_script_run_ctx().session_id
+    except Exception:
+        return None
+
+def record_page_render(page, seconds):
+    get_render_log().append((datetime.now(), page, seconds))
+
+def get_render_times_data():
+    """Render count and latency percentiles per page from the recent renders"""
+    renders = pd.DataFrame(list(get_render_log()), columns=['time', 'page', 'seconds'])
+    if renders.empty:
+        return renders
+    summary = renders.groupby('page')['seconds'].agg(
+        renders='count', mean='mean', p95=lambda v: v.quantile(0.95), max='max', last='last'
+    ).reset_index()
+    for column in ['mean', 'p95', 'max', 'last']:
+        summary[column] = (summary[column] * 1000).round(1)
+    return summary.rename(columns={'mean': 'mean_ms', 'p95': 'p95_ms', 'max': 'max_ms', 'last': 'last_ms'}) \
+        .sort_values('p95_ms', ascending=False)
+
+def get_slow_queries_data(limit=20):
+    """Most recent slow statements with their query plans"""
+    entries = slow_queries(limit)
+    if not entries:
+        return pd.DataFrame()
+    df = pd.DataFrame(entries)
+    df['time'] = pd.to_datetime(df['time'], unit='s')
+    df['plan'] = df['plan'].apply(lambda steps: ' → '.join(steps))
+    return df[['time', 'elapsed_ms', 'full_scan', 'caller', 'query', 'rows', 'plan', 'sql']]
+
+def get_query_stats_data(limit=25):
+    """Statements with the most total time"""
+    stats = query_stats()[:limit]
+    if not stats:
+        return pd.DataFrame()
+    df = pd.DataFrame(stats)
+    return df[['caller', 'query', 'count', 'total_ms', 'mean_ms', 'p95_ms', 'max_ms', 'rows', 'slow',
+               'full_scan', 'errors']]
+
+def get_cache_stats_data():
+    """Hits, misses and hit rate for each in-process cache"""
+    lookups = CACHE_LOOKUPS.values()
+    rows = []
+    for cache in sorted({labels[0] for labels in lookups}):
+        hits, misses = lookups.get((cache, 'hit'), 0), lookups.get((cache, 'miss'), 0)
+        rows.append({'cache': cache, 'hits': hits, 'misses': misses,
+                     'hit_rate': round(hits / (hits + misses), 3) if hits + misses else 0.0})
+    return pd.DataFrame(rows)
+
+def get_connection_stats():
+    """SQLite connections opened, closed and still open in this process"""
+    counts = DB_CONNECTIONS.values()
+    opened, closed = counts.get(('opened',), 0), counts.get(('closed',), 0)
+    return {'opened': opened, 'closed': closed, 'open': opened - closed}
+
+def get_storage_stats():
+    """Database, WAL and per-table/index sizes (dbstat when SQLite has it, row counts otherwise)"""
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+    info = {
+        'journal_mode': conn.execute('PRAGMA journal_mode').fetchone()[0],
+        'page_size': page_size,
+        'db_bytes': conn.execute('PRAGMA page_count').fetchone()[0] * page_size,
+        'free_bytes': conn.execute('PRAGMA freelist_count').fetchone()[0] * page_size,
+        'wal_bytes': os.path.getsize(DB_PATH + '-wal') if os.path.exists(DB_PATH + '-wal') else 0,
+    }
+    try:
+        sizes = pd.read_sql_query("""
+            SELECT d.name, COALESCE(m.type, 'internal') as type, m.tbl_name as table_name,
+                   SUM(d.pgsize) as bytes, COUNT(*) as pages
+            FROM dbstat d
+            LEFT JOIN sqlite_master m ON m.name = d.name
+            GROUP BY d.name
+            ORDER BY bytes DESC
+        """, conn)
+    except Exception:
+        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        sizes = pd.DataFrame([{'name': t, 'type': 'table', 'table_name': t,
+                               'rows': conn.execute(f'SELECT COUNT(*) FROM "{t}"').fetchone()[0]}
+                              for t in tables])
+    conn.close()
+    return info, sizes
+
 # Authentication functions
 def hash_password(password):
     """Hash password for storage"""
@@ -585,6 +523,7 @@ def register_user(name, email, password, phone, department, year):
         
         success = execute_insert(insert_query, (name, email, hashed_pw, phone, department, year))
         if success:
+            shared_cache.invalidate('analytics')
             # Get the new user's ID
             user_query = "SELECT student_id, name, email FROM students WHERE email = ?"
             user_result = execute_query(user_query, params=[email])
@@ -616,6 +555,12 @@ def enroll_in_course(student_id, course_id):
         
         success = execute_insert(insert_query, (student_id, course_id))
         if success:
+            record_enrollment_activity(student_id, course_id)
+            # Stale in every worker: enrollment counts, this student's plans, trending and rollups
+            candidate_cache.invalidate()
+            plan_cache.invalidate_student(student_id)
+            trending_cache.invalidate()
+            shared_cache.invalidate('analytics')
             return True, "Enrolled successfully!"
         else:
             return False, "Enrollment failed!"
@@ -649,7 +594,8 @@ def show_sidebar():
                 ("👥", "All Students"),
                 ("📚", "All Courses"),
                 ("📝", "All Enrollments"),
-                ("📈", "System Analytics")
+                ("📈", "System Analytics"),
+                ("⏱️", "Performance")
             ]
         else:
             pages = [
@@ -880,7 +826,7 @@ def show_dashboard():
     enrolled = execute_query(enrolled_query, params=[student_id])
     enrolled_count = enrolled['count'].iloc[0] if not enrolled.empty else 0
     
-    completed_query = "SELECT COUNT(*) as count FROM enrollments WHERE student_id = ? AND completion_status = 'Completed'"
+    completed_query = "SELECT COUNT(*) as count FROM enrollments WHERE student_id = ? AND +completion_status = 'Completed'"
     completed = execute_query(completed_query, params=[student_id])
     completed_count = completed['count'].iloc[0] if not completed.empty else 0
     
@@ -1012,6 +958,20 @@ def show_dashboard():
             st.session_state.current_page = "My Enrollments"
             st.rerun()
     
+    # Trending courses from the decayed enrollment/feedback counters
+    trending = get_trending_courses(limit=5)
+    if not trending.empty:
+        st.markdown("### 🔥 Trending Now")
+        for _, row in trending.iterrows():
+            col1, col2, col3 = st.columns([3, 1, 1])
+            with col1:
+                st.markdown(f"**{row['course_name']}**  \n{row['category']} • {row['difficulty_level']}")
+            with col2:
+                st.metric("Enrollments/day", f"{row['enrollments_per_day']:.2f}")
+            with col3:
+                recent = row['recent_rating']
+                st.metric("Recent rating", f"{recent:.1f} ⭐" if pd.notna(recent) else "—")
+    
     # Recent Activity - Only if user has enrollments
     if enrolled_count > 0:
         st.markdown("""
@@ -1110,34 +1070,30 @@ def show_courses_page():
     # Filter Section
     st.markdown('<div class="card-header" style="margin-top: 20px;">🔍 Filter Courses</div>', unsafe_allow_html=True)
     
+    show_course_grid()
+
+@st.fragment
+def show_course_grid():
+    """Course filters and cards; a filter change or enrollment reruns only this fragment"""
     col1, col2, col3 = st.columns(3)
-    courses_df = get_courses_data()
+    catalog, categories, difficulties = get_course_catalog()
     
-    if not courses_df.empty:
+    if catalog.size:
         with col1:
-            categories = ['All'] + sorted(courses_df['category'].unique().tolist())
             selected_category = st.selectbox("📚 Category", categories)
         
         with col2:
-            difficulties = ['All'] + sorted(courses_df['difficulty_level'].unique().tolist())
             selected_difficulty = st.selectbox("📊 Difficulty", difficulties)
         
         with col3:
             min_rating = st.slider("⭐ Minimum Rating", 0.0, 5.0, 0.0, 0.1)
         
-        # Filter courses
-        filtered_courses = courses_df.copy()
-        
-        if selected_category != 'All':
-            filtered_courses = filtered_courses[filtered_courses['category'] == selected_category]
-        
-        if selected_difficulty != 'All':
-            filtered_courses = filtered_courses[filtered_courses['difficulty_level'] == selected_difficulty]
-        
-        # Handle None values for rating filter
-        filtered_courses = filtered_courses[
-            filtered_courses['average_rating'].fillna(0.0) >= min_rating
-        ]
+        # Filter courses (vectorized over the shared snapshot; only shown rows are materialized)
+        filtered_courses = catalog.select(
+            category=None if selected_category == 'All' else selected_category,
+            difficulty=None if selected_difficulty == 'All' else selected_difficulty,
+            min_rating=min_rating
+        )
         
         # Display courses in cards - SIDE BY SIDE
         st.markdown(f'<div class="card-header">📚 Available Courses ({len(filtered_courses)} found)</div>', unsafe_allow_html=True)
@@ -1146,7 +1102,7 @@ def show_courses_page():
         for i in range(0, len(filtered_courses), 2):
             cols = st.columns(2)
             
-            for col_idx, (_, course) in enumerate(filtered_courses.iloc[i:i+2].iterrows()):
+            for col_idx, course in enumerate(catalog.rows(filtered_courses[i:i+2])):
                 with cols[col_idx]:
                     rating = course['average_rating'] if course['average_rating'] is not None else 0.0
                     enrollments = course['total_enrollments'] if course['total_enrollments'] is not None else 0
@@ -1168,7 +1124,7 @@ def show_courses_page():
                         success, message = enroll_in_course(st.session_state.user_data['student_id'], course['course_id'])
                         if success:
                             st.success(message)
-                            st.rerun()
+                            st.rerun(scope="fragment")
                         else:
                             st.error(message)
     else:
@@ -1227,8 +1183,29 @@ def show_smart_quiz():
             del st.session_state['show_welcome_quiz']
         show_quiz_recommendations()
 
+def select_quiz_answer(key, option, value, total_steps):
+    """Answer button callback: store the answer and advance the quiz"""
+    st.session_state.quiz_answers[key] = {
+        'answer': option,
+        'value': value
+    }
+    advance_quiz_step(1, total_steps)
+
+def advance_quiz_step(delta, total_steps):
+    """Previous/Next callback; moving past the last question completes the quiz"""
+    next_step = st.session_state.quiz_step + delta
+    if next_step >= total_steps:
+        st.session_state.quiz_completed = True
+    else:
+        st.session_state.quiz_step = max(0, next_step)
+
+@st.fragment
 def show_interactive_quiz_step():
-    """Show one question at a time with interactive UI"""
+    """Show one question at a time; answering reruns only this fragment"""
+    # Completing the quiz swaps in the recommendations, which needs a full rerun
+    if st.session_state.quiz_completed:
+        st.rerun()
+    
     questions = list(QUESTIONNAIRE.items())
     current_step = st.session_state.quiz_step
     total_steps = len(questions)
@@ -1264,26 +1241,14 @@ def show_interactive_quiz_step():
                 # Create a unique key for each option button
                 button_key = f"option_{current_step}_{i}"
                 
-                if st.button(
+                st.button(
                     option, 
                     key=button_key,
                     use_container_width=True,
-                    help=f"Click to select: {option}"
-                ):
-                    # Store the answer
-                    st.session_state.quiz_answers[key] = {
-                        'answer': option,
-                        'value': data['options'][option]
-                    }
-                    
-                    # Move to next question
-                    if current_step < total_steps - 1:
-                        st.session_state.quiz_step += 1
-                        st.rerun()
-                    else:
-                        # Quiz completed
-                        st.session_state.quiz_completed = True
-                        st.rerun()
+                    help=f"Click to select: {option}",
+                    on_click=select_quiz_answer,
+                    args=(key, option, data['options'][option], total_steps)
+                )
         
         # Navigation buttons
         st.markdown("<br><br>", unsafe_allow_html=True)
@@ -1291,9 +1256,8 @@ def show_interactive_quiz_step():
         
         with col1:
             if current_step > 0:
-                if st.button("⬅️ Previous", use_container_width=True):
-                    st.session_state.quiz_step -= 1
-                    st.rerun()
+                st.button("⬅️ Previous", use_container_width=True,
+                          on_click=advance_quiz_step, args=(-1, total_steps))
         
         with col3:
             # Show current answer if exists
@@ -1301,13 +1265,8 @@ def show_interactive_quiz_step():
                 current_answer = st.session_state.quiz_answers[key]['answer']
                 st.success(f"✅ Selected: {current_answer}")
                 
-                if st.button("Next ➡️", use_container_width=True):
-                    if current_step < total_steps - 1:
-                        st.session_state.quiz_step += 1
-                        st.rerun()
-                    else:
-                        st.session_state.quiz_completed = True
-                        st.rerun()
+                st.button("Next ➡️", use_container_width=True,
+                          on_click=advance_quiz_step, args=(1, total_steps))
     
     # Show summary of answers so far
     if st.session_state.quiz_answers:
@@ -1413,25 +1372,9 @@ def show_quiz_recommendations():
     st.markdown('<h3 style="margin-top: 30px;">💎 Featured Courses from Our Database</h3>', unsafe_allow_html=True)
     
     # Get matching courses from database
-    category_list = "','".join(recommended_categories)
-    query = f"""
-    SELECT 
-        course_id,
-        course_name,
-        description,
-        category,
-        difficulty_level,
-        duration_hours,
-        average_rating,
-        total_enrollments
-    FROM courses
-    WHERE category IN ('{category_list}')
-    AND difficulty_level = '{experience_level}'
-    ORDER BY COALESCE(average_rating, 0) DESC, COALESCE(total_enrollments, 0) DESC
-    LIMIT 5
-    """
-    
-    matching_courses = execute_query(query)
+    matching_courses = get_quiz_recommendations(
+        recommended_categories, experience_level, st.session_state.user_data['student_id']
+    )
     
     if not matching_courses.empty:
         for _, course in matching_courses.iterrows():
@@ -1461,6 +1404,27 @@ def show_quiz_recommendations():
                         st.error(message)
     else:
         st.info("No matching courses found in our database. Check out the platform recommendations above!")
+    
+    # Time-budgeted learning plan
+    st.markdown('<h3 style="margin-top: 30px;">📅 Your Learning Plan</h3>', unsafe_allow_html=True)
+    
+    plan = get_learning_plan(
+        st.session_state.user_data['student_id'],
+        answers.get('time_commitment', {}).get('value', 'medium'),
+        experience_level,
+        recommended_categories
+    )
+    
+    if plan and plan['courses']:
+        st.write(f"⏰ {plan['weekly_hours']:g} hours/week for {plan['weeks']} weeks • "
+                 f"📚 {len(plan['courses'])} courses • {plan['total_hours']} hours total")
+        for item in plan['courses']:
+            weeks_text = (f"Week {item['start_week']}" if item['start_week'] == item['end_week']
+                          else f"Weeks {item['start_week']}-{item['end_week']}")
+            st.write(f"**{weeks_text}:** {item['course_name']} "
+                     f"(📊 {item['difficulty_level']} • ⏱️ {item['duration_hours']}h)")
+    else:
+        st.info("No courses fit your weekly time budget yet. Try a longer time commitment!")
 
 def show_recommendations_page():
     """Show recommendations page - SAME ALGORITHM as original"""
@@ -1503,6 +1467,24 @@ def show_recommendations_page():
                 st.divider()
     else:
         st.info("No recommendations available at the moment.")
+    
+    # Cohort popularity works even without skills or enrollments
+    cohort = get_cohort_recommendations(st.session_state.user_data['student_id'])
+    if not cohort.empty:
+        st.subheader("👥 Popular with Students Like You")
+        st.caption(f"Most taken in {st.session_state.user_data.get('department') or 'your department'}")
+        for _, course in cohort.iterrows():
+            col1, col2 = st.columns([4, 1])
+            with col1:
+                st.write(f"**{course['course_name']}** — {course['category']} • {course['difficulty_level']}")
+            with col2:
+                if st.button("Enroll", key=f"cohort_enroll_{course['course_id']}"):
+                    success, message = enroll_in_course(st.session_state.user_data['student_id'], course['course_id'])
+                    if success:
+                        st.success(message)
+                        st.rerun()
+                    else:
+                        st.error(message)
 
 def show_my_enrollments():
     """Show user's enrollments with Excel export"""
@@ -1589,10 +1571,25 @@ def show_my_enrollments():
 def main():
     """Main application function"""
     
-    # Show sidebar and get selected page/mode
-    selected_page = show_sidebar()
+    get_shared_cache().sync()
+    get_warmup()
     
-    # Route to appropriate page
+    with profile_rerun(get_session_id(), get_profile_store()) as profile:
+        profile.page = st.session_state.get('current_page')
+        
+        # Show sidebar and get selected page/mode
+        selected_page = show_sidebar()
+        profile.page = selected_page
+        
+        started = time.perf_counter()
+        try:
+            with span('page', selected_page):
+                show_page(selected_page)
+        finally:
+            record_page_render(selected_page, time.perf_counter() - started)
+
+def show_page(selected_page):
+    """Route to the selected page"""
     if not st.session_state.logged_in:
         show_login_page(selected_page)  # selected_page will be "Login" or "Register"
     else:
@@ -1607,6 +1604,8 @@ def main():
             show_all_enrollments()
         elif selected_page == "System Analytics":
             show_system_analytics()
+        elif selected_page == "Performance":
+            show_performance_console()
         # Student pages
         elif selected_page == "Dashboard":
             show_dashboard()
@@ -1644,14 +1643,7 @@ def show_admin_dashboard():
     st.markdown('<div class="card-header">📈 System Overview</div>', unsafe_allow_html=True)
     
     # Get system statistics
-    stats_query = """
-    SELECT 
-        (SELECT COUNT(*) FROM students) as total_students,
-        (SELECT COUNT(*) FROM courses) as total_courses,
-        (SELECT COUNT(*) FROM enrollments) as total_enrollments,
-        (SELECT COUNT(*) FROM skills) as total_skills
-    """
-    stats = execute_query(stats_query)
+    stats = get_admin_stats()
     
     if not stats.empty:
         stat = stats.iloc[0]
@@ -1780,8 +1772,12 @@ def show_admin_dashboard():
         st.success("✅ System: Online")
     
     with col3:
-        # Performance
-        st.success("✅ Performance: Good")
+        # Performance: slow statements logged in the last five minutes
+        recent_slow = [q for q in slow_queries() if time.time() - q['time'] < 300]
+        if recent_slow:
+            st.warning(f"⚠️ Performance: {len(recent_slow)} slow queries (5 min)")
+        else:
+            st.success("✅ Performance: Good")
 
 def show_all_students():
     """Show all students for admin management"""
@@ -1789,19 +1785,7 @@ def show_all_students():
     st.markdown('<h2 style="color: #1f77b4; margin-bottom: 1rem; text-align: center;">👥 All Students</h2>', unsafe_allow_html=True)
     
     # Get all students
-    students_query = """
-    SELECT 
-        student_id,
-        name,
-        email,
-        phone,
-        department,
-        year,
-        registration_date
-    FROM students 
-    ORDER BY registration_date DESC
-    """
-    students_df = execute_query(students_query)
+    students_df = get_all_students_data()
     
     if not students_df.empty:
         st.markdown('<div class="card-header">📋 Student Records</div>', unsafe_allow_html=True)
@@ -1828,23 +1812,7 @@ def show_all_courses():
     st.markdown('<h2 style="color: #1f77b4; margin-bottom: 1rem; text-align: center;">📚 All Courses</h2>', unsafe_allow_html=True)
     
     # Get all courses with statistics
-    courses_query = """
-    SELECT 
-        c.course_id,
-        c.course_name,
-        c.category,
-        c.difficulty_level,
-        c.duration_hours,
-        c.description,
-        COALESCE(AVG(f.rating), 0) as average_rating,
-        COUNT(e.enrollment_id) as total_enrollments
-    FROM courses c
-    LEFT JOIN enrollments e ON c.course_id = e.course_id
-    LEFT JOIN feedback f ON c.course_id = f.course_id
-    GROUP BY c.course_id, c.course_name, c.category, c.difficulty_level, c.duration_hours, c.description
-    ORDER BY c.course_name
-    """
-    courses_df = execute_query(courses_query)
+    courses_df = get_all_courses_admin_data()
     
     if not courses_df.empty:
         st.markdown('<div class="card-header">📋 Course Management</div>', unsafe_allow_html=True)
@@ -1871,21 +1839,7 @@ def show_all_enrollments():
     st.markdown('<h2 style="color: #1f77b4; margin-bottom: 1rem; text-align: center;">📝 All Enrollments</h2>', unsafe_allow_html=True)
     
     # Get all enrollments with student and course details
-    enrollments_query = """
-    SELECT 
-        e.enrollment_id,
-        s.name as student_name,
-        s.email as student_email,
-        c.course_name,
-        c.category,
-        e.enrollment_date,
-        e.completion_status
-    FROM enrollments e
-    JOIN students s ON e.student_id = s.student_id
-    JOIN courses c ON e.course_id = c.course_id
-    ORDER BY e.enrollment_date DESC
-    """
-    enrollments_df = execute_query(enrollments_query)
+    enrollments_df = get_all_enrollments_data()
     
     if not enrollments_df.empty:
         st.markdown('<div class="card-header">📋 Enrollment Records</div>', unsafe_allow_html=True)
@@ -1914,57 +1868,51 @@ def show_system_analytics():
     # Enrollment trends by category
     st.markdown('<div class="card-header">📊 Enrollment Analytics</div>', unsafe_allow_html=True)
     
-    analytics_query = """
-    SELECT 
-        c.category,
-        COUNT(e.enrollment_id) as enrollment_count,
-        AVG(COALESCE(f.rating, 0)) as avg_rating
-    FROM courses c
-    LEFT JOIN enrollments e ON c.course_id = e.course_id
-    LEFT JOIN feedback f ON c.course_id = f.course_id
-    GROUP BY c.category
-    ORDER BY enrollment_count DESC
-    """
-    analytics_df = execute_query(analytics_query)
+    analytics_df = get_system_analytics_data()
     
     if not analytics_df.empty:
+        # plotly is only needed here, so it is not imported at startup
+        import plotly.express as px
+        
         col1, col2 = st.columns([3, 2])
         
         with col1:
             # Bar chart for enrollments by category
-            fig_bar = px.bar(
-                analytics_df, 
-                x='category', 
-                y='enrollment_count',
-                title="Enrollments by Category",
-                color='enrollment_count',
-                color_continuous_scale='viridis',
-                width=600,
-                height=400
-            )
-            fig_bar.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font_color='white'
-            )
-            st.plotly_chart(fig_bar)
+            with span('chart', 'Enrollments by Category'):
+                fig_bar = px.bar(
+                    analytics_df, 
+                    x='category', 
+                    y='enrollment_count',
+                    title="Enrollments by Category",
+                    color='enrollment_count',
+                    color_continuous_scale='viridis',
+                    width=600,
+                    height=400
+                )
+                fig_bar.update_layout(
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    font_color='white'
+                )
+                st.plotly_chart(fig_bar)
         
         with col2:
             # Pie chart for category distribution
-            fig_pie = px.pie(
-                analytics_df, 
-                values='enrollment_count', 
-                names='category',
-                title="Category Distribution",
-                width=400,
-                height=400
-            )
-            fig_pie.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font_color='white'
-            )
-            st.plotly_chart(fig_pie)
+            with span('chart', 'Category Distribution'):
+                fig_pie = px.pie(
+                    analytics_df, 
+                    values='enrollment_count', 
+                    names='category',
+                    title="Category Distribution",
+                    width=400,
+                    height=400
+                )
+                fig_pie.update_layout(
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    font_color='white'
+                )
+                st.plotly_chart(fig_pie)
         
         # Display analytics table
         st.markdown('<div class="card-header">📋 Analytics Summary</div>', unsafe_allow_html=True)
@@ -1972,5 +1920,68 @@ def show_system_analytics():
     else:
         st.info("No analytics data available!")
 
+def show_performance_console():
+    """Show live query, cache, connection, storage and render-time data for admin"""
+    st.markdown('<div style="margin-top: 30px;"></div>', unsafe_allow_html=True)
+    st.markdown('<h2 style="color: #1f77b4; margin-bottom: 1rem; text-align: center;">⏱️ Performance Console</h2>', unsafe_allow_html=True)
+    st.caption("Instrumentation of this Streamlit process (the Flask API exposes its own at /api/metrics). "
+               "Panels refresh every 10 seconds without rerunning the page.")
+    
+    show_performance_panels()
+
+@st.fragment(run_every=10)
+def show_performance_panels():
+    """Performance panels, rerun on their own timer or refresh button"""
+    st.button("🔄 Refresh now", key="perf_refresh")
+    
+    connections = get_connection_stats()
+    info, sizes = get_storage_stats()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Open connections", connections['open'], help=f"{connections['opened']} opened since start")
+    col2.metric("Database size", f"{info['db_bytes'] / 1048576:.1f} MB",
+                help=f"{info['free_bytes'] / 1048576:.1f} MB on the freelist")
+    col3.metric("WAL size", f"{info['wal_bytes'] / 1048576:.1f} MB", help=f"journal_mode={info['journal_mode']}")
+    col4.metric("Slow queries logged", len(slow_queries()))
+    
+    warmup = get_warmup().status()
+    if warmup['ready']:
+        st.caption(f"Cache warm-up finished in {warmup['elapsed_s']:.1f}s ({warmup['steps_done']} steps).")
+    else:
+        pending = ', '.join(f"{s['name']} ({s['status']})" for s in warmup['steps'] if s['status'] != 'done')
+        st.caption(f"Cache warm-up running for {warmup['elapsed_s']:.1f}s: {pending}")
+    
+    st.markdown('<div class="card-header">🐢 Slowest Recent Queries</div>', unsafe_allow_html=True)
+    slow_df = get_slow_queries_data()
+    if not slow_df.empty:
+        st.dataframe(slow_df.sort_values('elapsed_ms', ascending=False), width='stretch')
+    else:
+        st.info("No slow queries logged yet.")
+    
+    st.markdown('<div class="card-header">🧮 Query Time by Caller</div>', unsafe_allow_html=True)
+    stats_df = get_query_stats_data()
+    if not stats_df.empty:
+        st.dataframe(stats_df, width='stretch')
+    else:
+        st.info("No queries recorded yet.")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown('<div class="card-header">🎯 Cache Hit Rates</div>', unsafe_allow_html=True)
+        cache_df = get_cache_stats_data()
+        if not cache_df.empty:
+            st.dataframe(cache_df, width='stretch')
+        else:
+            st.info("No cache lookups yet.")
+    with col2:
+        st.markdown('<div class="card-header">🖥️ Page Render Times</div>', unsafe_allow_html=True)
+        render_df = get_render_times_data()
+        if not render_df.empty:
+            st.dataframe(render_df, width='stretch')
+        else:
+            st.info("No page renders recorded yet.")
+    
+    st.markdown('<div class="card-header">💾 Table and Index Sizes</div>', unsafe_allow_html=True)
+    st.dataframe(sizes, width='stretch')
+
 if __name__ == "__main__":
     main()
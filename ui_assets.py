@@ -0,0 +1,130 @@
+# =====================================================
+# AI COURSE RECOMMENDATION SYSTEM - UI ASSETS
+# =====================================================
+# Static content for the Streamlit frontend
+# Author: Student
+# Date: October 2025
+# Description: Course platform links, the questionnaire and the
+#              theme CSS; imported once per process so Streamlit
+#              reruns reuse them instead of rebuilding them
+# =====================================================
+
+import functools
+import os
+
+STYLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'styles.css')
+
+# AI Course platforms with real course links
+COURSE_PLATFORMS = {
+    'Machine Learning': [
+        {'platform': 'Coursera', 'name': 'Machine Learning by Andrew Ng', 'url': 'https://www.coursera.org/learn/machine-learning', 'badge': 'badge-coursera'},
+        {'platform': 'Udacity', 'name': 'Machine Learning Engineer', 'url': 'https://www.udacity.com/course/machine-learning-engineer-nanodegree--nd009t', 'badge': 'badge-udacity'},
+        {'platform': 'edX', 'name': 'Deep Learning Fundamentals', 'url': 'https://www.edx.org/learn/deep-learning', 'badge': 'badge-edx'},
+        {'platform': 'Udemy', 'name': 'Complete Machine Learning Bootcamp', 'url': 'https://www.udemy.com/course/complete-machine-learning-and-data-science-zero-to-mastery/', 'badge': 'badge-udemy'},
+    ],
+    'Deep Learning': [
+        {'platform': 'Coursera', 'name': 'Deep Learning Specialization', 'url': 'https://www.coursera.org/specializations/deep-learning', 'badge': 'badge-coursera'},
+        {'platform': 'Udacity', 'name': 'Deep Learning Nanodegree', 'url': 'https://www.udacity.com/course/deep-learning-nanodegree--nd101', 'badge': 'badge-udacity'},
+        {'platform': 'Fast.ai', 'name': 'Practical Deep Learning', 'url': 'https://course.fast.ai/', 'badge': 'badge-edx'},
+        {'platform': 'Udemy', 'name': 'Deep Learning A-Z', 'url': 'https://www.udemy.com/course/deeplearning/', 'badge': 'badge-udemy'},
+    ],
+    'Natural Language Processing': [
+        {'platform': 'Coursera', 'name': 'Natural Language Processing', 'url': 'https://www.coursera.org/specializations/natural-language-processing', 'badge': 'badge-coursera'},
+        {'platform': 'Udacity', 'name': 'Natural Language Processing', 'url': 'https://www.udacity.com/course/natural-language-processing-nanodegree--nd892', 'badge': 'badge-udacity'},
+        {'platform': 'edX', 'name': 'NLP with Python', 'url': 'https://www.edx.org/learn/natural-language-processing', 'badge': 'badge-edx'},
+        {'platform': 'Udemy', 'name': 'NLP with Deep Learning', 'url': 'https://www.udemy.com/course/natural-language-processing-with-deep-learning-in-python/', 'badge': 'badge-udemy'},
+    ],
+    'Computer Vision': [
+        {'platform': 'Coursera', 'name': 'Computer Vision Basics', 'url': 'https://www.coursera.org/learn/computer-vision-basics', 'badge': 'badge-coursera'},
+        {'platform': 'Udacity', 'name': 'Computer Vision Nanodegree', 'url': 'https://www.udacity.com/course/computer-vision-nanodegree--nd891', 'badge': 'badge-udacity'},
+        {'platform': 'edX', 'name': 'Computer Vision Fundamentals', 'url': 'https://www.edx.org/learn/computer-vision', 'badge': 'badge-edx'},
+        {'platform': 'Udemy', 'name': 'Computer Vision with OpenCV', 'url': 'https://www.udemy.com/course/python-for-computer-vision-with-opencv-and-deep-learning/', 'badge': 'badge-udemy'},
+    ],
+    'AI for Business': [
+        {'platform': 'Coursera', 'name': 'AI for Business', 'url': 'https://www.coursera.org/specializations/ai-for-business', 'badge': 'badge-coursera'},
+        {'platform': 'LinkedIn Learning', 'name': 'AI for Business Leaders', 'url': 'https://www.linkedin.com/learning/paths/ai-for-business-leaders', 'badge': 'badge-linkedin'},
+        {'platform': 'edX', 'name': 'AI Strategy', 'url': 'https://www.edx.org/learn/artificial-intelligence', 'badge': 'badge-edx'},
+        {'platform': 'Udemy', 'name': 'AI for Business Strategy', 'url': 'https://www.udemy.com/course/artificial-intelligence-for-business/', 'badge': 'badge-udemy'},
+    ],
+    'Robotics & AI': [
+        {'platform': 'Coursera', 'name': 'Robotics Specialization', 'url': 'https://www.coursera.org/specializations/robotics', 'badge': 'badge-coursera'},
+        {'platform': 'Udacity', 'name': 'Robotics Software Engineer', 'url': 'https://www.udacity.com/course/robotics-software-engineer--nd209', 'badge': 'badge-udacity'},
+        {'platform': 'edX', 'name': 'Autonomous Systems', 'url': 'https://www.edx.org/learn/robotics', 'badge': 'badge-edx'},
+        {'platform': 'Udemy', 'name': 'AI & Robotics with Python', 'url': 'https://www.udemy.com/course/artificial-intelligence-robotics-with-python/', 'badge': 'badge-udemy'},
+    ],
+    'AI Ethics & Governance': [
+        {'platform': 'Coursera', 'name': 'AI Ethics', 'url': 'https://www.coursera.org/learn/ai-ethics', 'badge': 'badge-coursera'},
+        {'platform': 'edX', 'name': 'Ethics of AI', 'url': 'https://www.edx.org/learn/artificial-intelligence-ethics', 'badge': 'badge-edx'},
+        {'platform': 'LinkedIn Learning', 'name': 'AI Ethics for Business', 'url': 'https://www.linkedin.com/learning/ai-ethics-for-business', 'badge': 'badge-linkedin'},
+        {'platform': 'Udemy', 'name': 'AI Ethics & Bias', 'url': 'https://www.udemy.com/course/ai-ethics-and-bias/', 'badge': 'badge-udemy'},
+    ],
+    'AI Programming': [
+        {'platform': 'Coursera', 'name': 'Python for AI & ML', 'url': 'https://www.coursera.org/specializations/python-3-programming', 'badge': 'badge-coursera'},
+        {'platform': 'Udacity', 'name': 'AI Programming with Python', 'url': 'https://www.udacity.com/course/ai-programming-python-nanodegree--nd089', 'badge': 'badge-udacity'},
+        {'platform': 'edX', 'name': 'Python for Data Science', 'url': 'https://www.edx.org/learn/python', 'badge': 'badge-edx'},
+        {'platform': 'Udemy', 'name': 'Python for AI & Machine Learning', 'url': 'https://www.udemy.com/course/python-for-machine-learning-data-science-masterclass/', 'badge': 'badge-udemy'},
+    ],
+}
+
+# AI-focused questionnaire for course recommendations
+QUESTIONNAIRE = {
+    'ai_interest': {
+        'question': '🤖 Which AI domain interests you most?',
+        'options': {
+            'Machine Learning': ['Machine Learning', 'AI Programming'],
+            'Deep Learning': ['Deep Learning', 'Machine Learning'],
+            'Natural Language Processing': ['Natural Language Processing', 'AI Programming'],
+            'Computer Vision': ['Computer Vision', 'Deep Learning'],
+            'AI for Business': ['AI for Business', 'AI Ethics & Governance'],
+            'Robotics & AI': ['Robotics & AI', 'Machine Learning'],
+            'AI Ethics & Governance': ['AI Ethics & Governance', 'AI for Business'],
+            'General AI Programming': ['AI Programming', 'Machine Learning'],
+        }
+    },
+    'experience_level': {
+        'question': '📊 What is your AI/Programming experience?',
+        'options': {
+            'Complete Beginner': 'Beginner',
+            'Some Python Knowledge': 'Beginner',
+            'Intermediate Programmer': 'Intermediate',
+            'Advanced/AI Professional': 'Advanced',
+        }
+    },
+    'career_goal': {
+        'question': '🎯 What is your AI career goal?',
+        'options': {
+            'AI Research Scientist': ['Deep Learning', 'Machine Learning', 'AI Ethics & Governance'],
+            'Machine Learning Engineer': ['Machine Learning', 'Deep Learning', 'AI Programming'],
+            'Data Scientist': ['Machine Learning', 'Natural Language Processing', 'AI Programming'],
+            'AI Product Manager': ['AI for Business', 'AI Ethics & Governance', 'Machine Learning'],
+            'Computer Vision Engineer': ['Computer Vision', 'Deep Learning', 'AI Programming'],
+            'NLP Engineer': ['Natural Language Processing', 'Machine Learning', 'AI Programming'],
+            'Robotics Engineer': ['Robotics & AI', 'Machine Learning', 'Computer Vision'],
+            'AI Consultant': ['AI for Business', 'AI Ethics & Governance', 'Machine Learning'],
+        }
+    },
+    'time_commitment': {
+        'question': '⏰ How much time can you dedicate weekly?',
+        'options': {
+            '1-3 hours': 'short',
+            '4-7 hours': 'medium',
+            '8-15 hours': 'long',
+            '15+ hours (Full-time)': 'intensive',
+        }
+    },
+    'learning_style': {
+        'question': '🎓 What is your preferred learning approach?',
+        'options': {
+            'Hands-on Projects & Coding': 'practical',
+            'Theoretical Foundations': 'theoretical',
+            'Video Lectures with Exercises': 'structured',
+            'Interactive AI Labs': 'interactive',
+        }
+    },
+}
+
+@functools.lru_cache(maxsize=None)
+def app_css():
+    """Theme stylesheet wrapped for st.markdown, read from disk on first use"""
+    with open(STYLES_PATH, encoding='utf-8') as f:
+        return f"<style>\n{f.read()}</style>"